@@ -3,6 +3,8 @@ import aioble
 import bluetooth
 import struct
 import gc
+import sys
+import binascii
 import utime
 from machine import ADC, Pin
 
@@ -40,8 +42,25 @@ CHAR_UUIDS = {
     "SENSOR_5": bluetooth.UUID("6E400003-B5A3-F393-E0A9-E50E24DCCA9E"),
     "SENSOR_7": bluetooth.UUID("6E400004-B5A3-F393-E0A9-E50E24DCCA9E"),
     "SENSOR_EXTRA": bluetooth.UUID("6E400005-B5A3-F393-E0A9-E50E24DCCA9E"),
+    "FRAME": bluetooth.UUID("6E400006-B5A3-F393-E0A9-E50E24DCCA9E"),
 }
 
+# Binary frame protocol (v1): one notification carries N full LED cycles
+# header: version(u8), cycles(u8), sequence(u16), tick_ms(u32), period_ms(u16)
+# body:   cycles x [SENSOR_2, SENSOR_EXTRA, SENSOR_5, SENSOR_7] as uint16 mV
+FRAME_MODE = True      # False -> legacy 2-byte notification per characteristic
+FRAME_VERSION = 1
+FRAME_CYCLES = 4       # cycles per notification (needs MTU >= 13 + 8 * cycles)
+FRAME_HEADER = "<BBHIH"
+FRAME_MTU = 247
+
+# USB-CDC stream: frames are written to stdout as
+# SYNC(2) | length(u16) | frame | crc32(u32 over frame)
+# stdout carries binary data in this mode, so nothing may print
+USB_STREAM = False     # True -> stream over USB serial instead of advertising BLE
+USB_FRAME_CYCLES = 16  # cycles per USB packet (no MTU limit, max 255)
+USB_SYNC = b"\xAA\x55"
+
 
 def measure_average(gpio: Pin, adc: ADC, delay_ms: int, sample_ms: int):
     gpio.value(1)
@@ -127,6 +146,98 @@ async def notify_if_conn(conn, char, mv_value):
         print("Notify/write failed:", e)
 
 
+def frame_capacity(mtu):
+    # ATT notification payload = MTU - 3
+    fit = (mtu - 3 - struct.calcsize(FRAME_HEADER)) // 8
+    return max(1, min(FRAME_CYCLES, fit))
+
+
+def pack_frame(seq, tick_ms, period_ms, cycles):
+    payload = bytearray(struct.pack(FRAME_HEADER, FRAME_VERSION, len(cycles),
+                                    seq & 0xFFFF, tick_ms & 0xFFFFFFFF, period_ms & 0xFFFF))
+    for cycle in cycles:
+        payload.extend(struct.pack("<HHHH", *cycle))
+    return payload
+
+
+async def notify_frame(conn, char, payload):
+    if not conn or not conn.is_connected():
+        return
+    try:
+        await char.notify(conn, payload)
+    except Exception as e:
+        print("Frame notify failed:", e)
+
+
+async def measure_cycle():
+    v1 = measure_average(led_1, sensor_2, (l_d-a_d), a_d)
+    await asyncio.sleep_ms(r_d)
+    v3 = measure_average(led_3, sensor_2, (l_d-a_d), a_d)
+    await asyncio.sleep_ms(r_d)
+    mvs4 = measure_average_multi(led_4, (sensor_2, sensor_5, sensor_7), (l_d-a_d), a_d)
+    wv4 = weighted_value(mvs4, WEIGHTS_LED4)
+    await asyncio.sleep_ms(r_d)
+    mvs6 = measure_average_multi(led_6, (sensor_2, sensor_5, sensor_7), (l_d-a_d), a_d)
+    wv6 = weighted_value(mvs6, WEIGHTS_LED6)
+    return (v1, v3, wv4, wv6)
+
+
+async def frame_loop(conn, char):
+    cycles_per_frame = 1
+    try:
+        mtu = await conn.exchange_mtu(FRAME_MTU)
+        cycles_per_frame = frame_capacity(mtu)
+    except Exception as e:
+        print("MTU exchange failed, 1 cycle per frame:", e)
+    print("Frame mode:", cycles_per_frame, "cycles/notification")
+
+    seq = 0
+    pending = []
+    first_tick = 0
+    while conn.is_connected():
+        if not pending:
+            first_tick = utime.ticks_ms()
+        pending.append(await measure_cycle())
+
+        if len(pending) >= cycles_per_frame:
+            period = utime.ticks_diff(utime.ticks_ms(), first_tick) // len(pending)
+            await notify_frame(conn, char, pack_frame(seq, first_tick, period, pending))
+            seq += 1
+            pending = []
+            gc.collect()
+
+        await asyncio.sleep_ms(r_d)
+
+
+def pack_usb_packet(frame):
+    crc = binascii.crc32(frame) & 0xFFFFFFFF
+    return USB_SYNC + struct.pack("<H", len(frame)) + frame + struct.pack("<I", crc)
+
+
+async def usb_stream_loop():
+    out = sys.stdout.buffer
+    seq = 0
+    pending = []
+    first_tick = 0
+    while True:
+        if not pending:
+            first_tick = utime.ticks_ms()
+        pending.append(await measure_cycle())
+
+        if len(pending) >= USB_FRAME_CYCLES:
+            period = utime.ticks_diff(utime.ticks_ms(), first_tick) // len(pending)
+            try:
+                out.write(pack_usb_packet(pack_frame(seq, first_tick, period, pending)))
+            except Exception:
+                # Host not reading - drop the frame, the sequence gap marks the loss
+                pass
+            seq += 1
+            pending = []
+            gc.collect()
+
+        await asyncio.sleep_ms(r_d)
+
+
 async def peripheral():
     while True:
         try:
@@ -150,6 +261,9 @@ async def peripheral():
                 gc.collect()
 
                 try:
+                    if FRAME_MODE:
+                        await frame_loop(conn, chars["FRAME"])
+
                     while conn.is_connected():
                         v1 = measure_average(led_1, sensor_2,(l_d-a_d),a_d)
                         await notify_if_conn(conn, chars["SENSOR_2"], v1)
@@ -183,7 +297,7 @@ async def peripheral():
 
 
 def main():
-    asyncio.run(peripheral())
+    asyncio.run(usb_stream_loop() if USB_STREAM else peripheral())
 
 
 if __name__ == "__main__":
@@ -0,0 +1,217 @@
+"""
+Spektroskopi Sistemi Arka Plan Reklam (Advertisement) Tarayıcısı
+"""
+
+import asyncio
+import threading
+import time
+from collections import deque
+from typing import Any, Dict, List, Optional, Tuple
+
+from config.constants import (
+    TARGET_SENSORS, ADV_CACHE_TTL_S, ADV_RSSI_WINDOW, ADV_SCAN_WINDOW_S, ADV_SCAN_IDLE_S
+)
+from utils.logger import app_logger
+from utils.helpers import map_device_name
+
+class AdvertisementCache:
+    """Hedef sensörlerin TTL'li önbelleği - cihaz başına kayan RSSI ortalaması"""
+
+    def __init__(self, ttl_s: float = ADV_CACHE_TTL_S, rssi_window: int = ADV_RSSI_WINDOW):
+        self.ttl_s = ttl_s
+        self.rssi_window = rssi_window
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        # BLE döngüsü yazar, Tk thread'i okuyabilir
+        self._lock = threading.Lock()
+
+    def update(self, original_name: str, address: str, rssi: Optional[int],
+               device_obj: Any = None, now: Optional[float] = None) -> Optional[str]:
+        """Reklamı kaydet - hedef sensör değilse None, yoksa görünen ad"""
+        if original_name not in TARGET_SENSORS:
+            return None
+
+        display_name = map_device_name(original_name)
+        with self._lock:
+            entry = self._entries.get(display_name)
+            if entry is None or entry['address'] != address:
+                entry = {
+                    'address': address,
+                    'original_name': original_name,
+                    'rssi_history': deque(maxlen=self.rssi_window),
+                    'device_obj': None,
+                    'last_seen': 0.0
+                }
+                self._entries[display_name] = entry
+
+            if rssi is not None:
+                entry['rssi_history'].append(rssi)
+            if device_obj is not None:
+                entry['device_obj'] = device_obj
+            entry['last_seen'] = time.monotonic() if now is None else now
+        return display_name
+
+    def expire(self, now: Optional[float] = None) -> int:
+        """TTL'i dolan cihazları at"""
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            expired = [name for name, entry in self._entries.items()
+                       if now - entry['last_seen'] > self.ttl_s]
+            for name in expired:
+                del self._entries[name]
+        return len(expired)
+
+    @staticmethod
+    def _rssi(entry: Dict[str, Any]) -> Optional[float]:
+        history = entry['rssi_history']
+        return sum(history) / len(history) if history else None
+
+    def devices(self, now: Optional[float] = None) -> Dict[str, Dict[str, Any]]:
+        """Güncel cihazlar - scan_devices ile aynı sözlük yapısı, en güçlü RSSI önce"""
+        self.expire(now)
+        now = time.monotonic() if now is None else now
+        result = {}
+        with self._lock:
+            entries = sorted(self._entries.items(), key=lambda item: self._sort_key(item[1]))
+            for name, entry in entries:
+                rssi = self._rssi(entry)
+                result[name] = {
+                    'address': entry['address'],
+                    'original_name': entry['original_name'],
+                    'rssi': round(rssi, 1) if rssi is not None else 'N/A',
+                    'device_obj': entry['device_obj'],
+                    'age_s': now - entry['last_seen']
+                }
+        return result
+
+    def _sort_key(self, entry: Dict[str, Any]) -> float:
+        rssi = self._rssi(entry)
+        return -rssi if rssi is not None else float('inf')
+
+    def best(self, now: Optional[float] = None) -> Optional[Tuple[str, Dict[str, Any]]]:
+        """En güçlü RSSI'lı cihaz (görünen ad, bilgi)"""
+        devices = self.devices(now)
+        if not devices:
+            return None
+        name = next(iter(devices))
+        return name, devices[name]
+
+    def get(self, display_name: str) -> Optional[Dict[str, Any]]:
+        return self.devices().get(display_name)
+
+    def device_for_address(self, address: str) -> Any:
+        """Adrese ait son BLEDevice - bağlantıda adres çözümleme taraması atlanır"""
+        with self._lock:
+            for entry in self._entries.values():
+                if entry['address'] == address:
+                    return entry['device_obj']
+        return None
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+class AdvertisementScanner:
+    """BLE döngüsünde sürekli, düşük görev döngülü tarama - detection callback ile önbelleği besler"""
+
+    def __init__(self, scanner_factory, cache: Optional[AdvertisementCache] = None,
+                 scan_window_s: float = ADV_SCAN_WINDOW_S,
+                 scan_idle_s: float = ADV_SCAN_IDLE_S):
+        # scanner_factory(detection_callback) -> BleakScanner
+        self.scanner_factory = scanner_factory
+        self.cache = cache or AdvertisementCache()
+        self.scan_window_s = scan_window_s
+        self.scan_idle_s = scan_idle_s
+
+        self.is_running = False
+        self.advertisements = 0
+        self._stop_event: Optional[asyncio.Event] = None
+        self._demand_event: Optional[asyncio.Event] = None
+        self._waiters: List[Tuple[Optional[str], asyncio.Future]] = []
+
+    def on_advertisement(self, device, advertisement_data=None):
+        """Detection callback (BLE döngüsü thread'i) - ilk eşleşmede bekleyenler uyanır"""
+        self.advertisements += 1
+        name = getattr(device, 'name', None) or getattr(advertisement_data, 'local_name', None)
+        if not name:
+            return
+
+        rssi = getattr(advertisement_data, 'rssi', None)
+        if rssi is None:
+            rssi = getattr(device, 'rssi', None)
+        display_name = self.cache.update(name, device.address, rssi, device)
+        if display_name is None:
+            return
+
+        for waiter in list(self._waiters):
+            wanted, future = waiter
+            if (wanted is None or wanted == display_name) and not future.done():
+                future.set_result(display_name)
+
+    async def wait_for_match(self, timeout: float, display_name: Optional[str] = None) -> Optional[str]:
+        """Önbellekte yoksa ilk eşleşen reklamı bekle (tarama penceresi hemen açılır)"""
+        devices = self.cache.devices()
+        if display_name is None and devices:
+            return next(iter(devices))
+        if display_name is not None and display_name in devices:
+            return display_name
+
+        future = asyncio.get_running_loop().create_future()
+        waiter = (display_name, future)
+        self._waiters.append(waiter)
+        if self._demand_event:
+            self._demand_event.set()
+        try:
+            return await asyncio.wait_for(future, timeout)
+        except asyncio.TimeoutError:
+            return None
+        finally:
+            self._waiters.remove(waiter)
+
+    async def run(self):
+        """Tarama penceresi / bekleme döngüsü - bekleyen varsa tarama kesintisiz sürer"""
+        if self.is_running:
+            return
+        self.is_running = True
+        self._stop_event = asyncio.Event()
+        self._demand_event = asyncio.Event()
+        app_logger.info("Arka plan BLE tarayıcısı başlatıldı")
+
+        try:
+            scanner = self.scanner_factory(self.on_advertisement)
+            while not self._stop_event.is_set():
+                await scanner.start()
+                try:
+                    await self._wait_any(self.scan_window_s)
+                    while self._waiters and not self._stop_event.is_set():
+                        await self._wait_any(self.scan_window_s)
+                finally:
+                    await scanner.stop()
+
+                self.cache.expire()
+                self._demand_event.clear()
+                await self._wait_any(self.scan_idle_s, wake_on_demand=True)
+
+        except Exception as e:
+            app_logger.error(f"Arka plan tarama hatası: {e}")
+        finally:
+            self.is_running = False
+            for _wanted, future in self._waiters:
+                if not future.done():
+                    future.set_result(None)
+            app_logger.info("Arka plan BLE tarayıcısı durdu")
+
+    async def _wait_any(self, timeout: float, wake_on_demand: bool = False):
+        events = [self._stop_event.wait()]
+        if wake_on_demand:
+            events.append(self._demand_event.wait())
+        tasks = [asyncio.ensure_future(event) for event in events]
+        try:
+            await asyncio.wait(tasks, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    def stop(self):
+        """Taramayı durdur (BLE döngüsü thread'inden)"""
+        if self._stop_event:
+            self._stop_event.set()
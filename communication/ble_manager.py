@@ -1,9 +1,9 @@
 import asyncio
+import concurrent.futures
+import random
 import threading
 import struct
-from datetime import datetime
 from typing import Dict, List, Optional, Callable, Any
-import queue
 
 try:
     import bleak
@@ -18,88 +18,157 @@ except ImportError:
     BLEAK_AVAILABLE = False
 
 from config.constants import (
-    BLE_CHARACTERISTICS, TARGET_SENSORS, BLE_SCAN_TIMEOUT,
-    VOLTAGE_CONVERSION_FACTOR
+    BLE_CHARACTERISTICS, BLE_SCAN_TIMEOUT,
+    VOLTAGE_CONVERSION_FACTOR, BLE_MAX_CONNECTIONS, BLE_RECONNECT_INITIAL_DELAY_MS,
+    BLE_RECONNECT_MAX_DELAY_MS, BLE_RECONNECT_MAX_ATTEMPTS, BLE_RECONNECT_TIMEOUT
 )
+from .advertisement_scanner import AdvertisementCache, AdvertisementScanner
+from .device_connection import DeviceConnection
+from .capture import CaptureWriter
 from utils.logger import app_logger, log_connection_event, log_error
-from utils.helpers import convert_raw_to_voltage, parse_ble_data, map_device_name
 
 class BLEManager:
     def __init__(self, data_callback: Optional[Callable] = None):
         self.data_callback = data_callback
         self.disconnect_callback = None
-        self.is_connected = False
-        self.current_client = None
-        self.current_device_address = None
-        self.current_device_name = None
+        
+        # Eşzamanlı cihaz bağlantıları - cihaz kimliği (görünen ad) ile
+        self.connections: Dict[str, DeviceConnection] = {}
+        self._connections_lock = threading.Lock()
         
         self.available_devices: Dict[str, Dict[str, Any]] = {}
         
-        self.data_queue = queue.Queue()
-        self.sensor_values = {
-            "SENSOR_2": 0,
-            "SENSOR_5": 0,
-            "SENSOR_7": 0,
-            "SENSOR_EXTRA": 0
-        }
+        # Ham notification kaydı (kapalıyken None)
+        self.capture_writer: Optional[CaptureWriter] = None
+        
+        # Kopan bağlantıyı taramasız yeniden kur (connection.auto_reconnect ayarı)
+        self.auto_reconnect = True
+        
+        # Tarama, bağlantı ve notification'lar tek kalıcı asyncio döngüsünde çalışır
+        self._loop = asyncio.new_event_loop()
+        self._loop_thread = threading.Thread(
+            target=self._run_event_loop, name="BLEEventLoop", daemon=True
+        )
+        self._loop_thread.start()
+        
+        self._scan_lock = threading.Lock()
+        self._scan_future: Optional[concurrent.futures.Future] = None
         
-        self.connection_thread = None
-        self.is_scanning = False
+        # Sürekli düşük görev döngülü reklam taraması - TTL önbelleği ve RSSI ortalaması
+        self.advertisement_scanner = AdvertisementScanner(self._create_scanner)
+        self._background_scan_future: Optional[concurrent.futures.Future] = None
+    
+    def _run_event_loop(self):
+        """BLE asyncio döngüsü thread'i"""
+        asyncio.set_event_loop(self._loop)
+        try:
+            self._loop.run_forever()
+        finally:
+            self._loop.close()
+    
+    def submit(self, coro) -> concurrent.futures.Future:
+        """Coroutine'i BLE döngüsüne gönder - Tk tarafından thread-safe çağrılabilir"""
+        return asyncio.run_coroutine_threadsafe(coro, self._loop)
+    
+    def in_event_loop_thread(self) -> bool:
+        return threading.current_thread() is self._loop_thread
+    
+    def shutdown(self):
+        """BLE döngüsünü durdur (uygulama kapanırken)"""
+        self.stop_capture()
+        self.stop_background_scan()
+        if self._loop.is_running():
+            self._loop.call_soon_threadsafe(self._loop.stop)
+    
+    @property
+    def is_scanning(self) -> bool:
+        future = self._scan_future
+        return future is not None and not future.done()
+    
+    @property
+    def is_connected(self) -> bool:
+        """En az bir cihaz bağlı mı?"""
+        return any(connection.is_connected for connection in list(self.connections.values()))
+    
+    @property
+    def primary_connection(self) -> Optional[DeviceConnection]:
+        """İlk bağlanan cihaz - tek cihazlı API'ler bunu gösterir"""
+        for connection in list(self.connections.values()):
+            if connection.is_connected:
+                return connection
+        return None
+    
+    @property
+    def current_client(self):
+        connection = self.primary_connection
+        return connection.client if connection else None
+    
+    @property
+    def current_device_address(self) -> Optional[str]:
+        connection = self.primary_connection
+        return connection.device_address if connection else None
+    
+    @property
+    def current_device_name(self) -> Optional[str]:
+        connection = self.primary_connection
+        return connection.device_name if connection else None
+    
+    @property
+    def sensor_values(self) -> Dict[str, float]:
+        connection = self.primary_connection
+        if connection:
+            return connection.sensor_values
+        return {"SENSOR_2": 0, "SENSOR_5": 0, "SENSOR_7": 0, "SENSOR_EXTRA": 0}
     
     def is_available(self) -> bool:
         return BLEAK_AVAILABLE
     
+    def _emit_packet(self, data_packet: Dict[str, Any]):
+        """Veri paketini işleme çekirdeğine teslim et"""
+        if self.data_callback:
+            self.data_callback(data_packet)
+    
     def set_disconnect_callback(self, callback: Optional[Callable] = None):
-        """Bağlantı kopma callback'ini ayarla"""
+        """Bağlantı kopma callback'ini ayarla - bağlantı thread'inden çağrılır, GUI Tk thread'ine aktarmalı"""
         self.disconnect_callback = callback
     
+    @property
+    def advertisement_cache(self) -> AdvertisementCache:
+        return self.advertisement_scanner.cache
+    
+    def _create_scanner(self, detection_callback: Callable):
+        return BleakScanner(detection_callback=detection_callback)
+    
+    def start_background_scan(self):
+        """Sürekli arka plan reklam taramasını başlat (zaten çalışıyorsa bir şey yapmaz)"""
+        if not BLEAK_AVAILABLE:
+            return
+        future = self._background_scan_future
+        if future is None or future.done():
+            self._background_scan_future = self.submit(self.advertisement_scanner.run())
+    
+    def stop_background_scan(self):
+        if self._loop.is_running():
+            self._loop.call_soon_threadsafe(self.advertisement_scanner.stop)
+    
     async def scan_devices(self, timeout: float = BLE_SCAN_TIMEOUT) -> Dict[str, Dict[str, Any]]:
+        """Önbellekteki cihazları döndür - boşsa ilk eşleşen reklamı bekle (en fazla timeout)"""
         if not BLEAK_AVAILABLE:
             app_logger.error("Bleak kütüphanesi mevcut değil")
             return {}
         
         try:
-            app_logger.info(f"BLE tarama başlatılıyor (timeout: {timeout}s)")
+            self.start_background_scan()
+            await self.advertisement_scanner.wait_for_match(timeout)
+            found_devices = self.advertisement_cache.devices()
             
-            try:
-                devices = await BleakScanner.discover(timeout=timeout)
-                found_devices = {}
-                
-                for device in devices:
-                    device_name = device.name or "Unknown Device"
-                    
-                    if device_name in TARGET_SENSORS:
-                        display_name = map_device_name(device_name)
-                        
-                        found_devices[display_name] = {
-                            'address': device.address,
-                            'original_name': device_name,
-                            'rssi': getattr(device, 'rssi', 'N/A'),
-                            'device_obj': device
-                        }
-                        
-                        app_logger.info(f"Hedef cihaz bulundu: {display_name} ({device.address})")
-                        
-            except Exception as e:
-                app_logger.warning(f"Eski BLE API başarısız, yeni API deneniyor: {e}")
-                devices_dict = await BleakScanner.discover(timeout=timeout, return_adv=True)
-                found_devices = {}
-                
-                for device, advertisement_data in devices_dict.items():
-                    device_name = getattr(device, 'name', None) or "Unknown Device"
-                    
-                    if device_name in TARGET_SENSORS:
-                        display_name = map_device_name(device_name)
-                        
-                        found_devices[display_name] = {
-                            'address': getattr(device, 'address', 'Unknown'),
-                            'original_name': device_name,
-                            'rssi': getattr(advertisement_data, 'rssi', 'N/A'),
-                            'device_obj': device
-                        }
-                        
-                        app_logger.info(f"Hedef cihaz bulundu: {display_name} ({getattr(device, 'address', 'Unknown')})")
+            if not found_devices and not self.advertisement_scanner.is_running:
+                # Arka plan tarayıcısı başlatılamadı - tek seferlik keşif
+                found_devices = await self._discover_devices(timeout)
             
+            for display_name, device_info in found_devices.items():
+                app_logger.info(f"Hedef cihaz bulundu: {display_name} ({device_info['address']}, "
+                                f"RSSI: {device_info['rssi']})")
             app_logger.info(f"Tarama tamamlandı: {len(found_devices)} cihaz bulundu")
             return found_devices
             
@@ -107,98 +176,176 @@ class BLEManager:
             app_logger.error(f"BLE tarama hatası: {e}")
             return {}
     
+    async def _discover_devices(self, timeout: float) -> Dict[str, Dict[str, Any]]:
+        """Engelleyen BleakScanner.discover taraması - sonuçlar önbelleğe yazılır"""
+        app_logger.info(f"BLE tarama başlatılıyor (timeout: {timeout}s)")
+        devices_dict = await BleakScanner.discover(timeout=timeout, return_adv=True)
+        for device, advertisement_data in devices_dict.values():
+            device_name = getattr(device, 'name', None) or "Unknown Device"
+            self.advertisement_cache.update(device_name, device.address,
+                                            getattr(advertisement_data, 'rssi', None), device)
+        return self.advertisement_cache.devices()
+    
+    def start_scan(self, timeout: float = BLE_SCAN_TIMEOUT,
+                   callback: Optional[Callable] = None) -> concurrent.futures.Future:
+        """Taramayı BLE döngüsünde başlat - devam eden tarama varsa ona katıl"""
+        with self._scan_lock:
+            if self.is_scanning:
+                app_logger.debug("Tarama zaten devam ediyor, mevcut taramaya katılınıyor")
+                future = self._scan_future
+            else:
+                future = self.submit(self.scan_devices(timeout))
+                future.add_done_callback(self._on_scan_finished)
+                self._scan_future = future
+        
+        if callback:
+            def _deliver(done_future):
+                try:
+                    callback(done_future.result())
+                except Exception as e:
+                    app_logger.error(f"Tarama callback hatası: {e}")
+            future.add_done_callback(_deliver)
+        
+        return future
+    
+    def _on_scan_finished(self, future: concurrent.futures.Future):
+        try:
+            self.available_devices.update(future.result())
+        except Exception as e:
+            app_logger.error(f"BLE tarama hatası: {e}")
+    
     def scan_devices_sync(self, timeout: float = BLE_SCAN_TIMEOUT) -> Dict[str, Dict[str, Any]]:
+        if self.in_event_loop_thread():
+            app_logger.error("scan_devices_sync BLE döngüsü içinden çağrılamaz")
+            return {}
         try:
-            return asyncio.run(self.scan_devices(timeout))
+            return self.start_scan(timeout).result(timeout + 5.0)
         except Exception as e:
             app_logger.error(f"Senkron BLE tarama hatası: {e}")
             return {}
     
     def scan_devices_threaded(self, callback: Optional[Callable] = None):
-        if self.is_scanning:
-            app_logger.warning("Tarama zaten devam ediyor")
-            return
-        
-        def scan_thread():
-            self.is_scanning = True
-            try:
-                devices = self.scan_devices_sync()
-                self.available_devices.update(devices)
-                
-                if callback:
-                    callback(devices)
-                    
-            except Exception as e:
-                app_logger.error(f"Thread'li tarama hatası: {e}")
-            finally:
-                self.is_scanning = False
-        
-        thread = threading.Thread(target=scan_thread, daemon=True)
-        thread.start()
+        self.start_scan(callback=callback)
     
     def connect_to_device(self, device_address: str, device_name: str = "Unknown"):
-        """Cihaza bağlan"""
+        """Cihaza bağlan - diğer bağlı cihazlar etkilenmez"""
         if not BLEAK_AVAILABLE:
             app_logger.error("Bleak kütüphanesi mevcut değil")
             return False
         
-        if self.is_connected:
-            app_logger.warning("Zaten bağlı, önce bağlantıyı kes")
-            return False
-        
-        # Bağlantıyı thread'de başlat
-        self.connection_thread = threading.Thread(
-            target=self._connect_async_wrapper,
-            args=(device_address, device_name),
-            daemon=True
-        )
-        self.connection_thread.start()
+        device_id = device_name
+        with self._connections_lock:
+            existing = self.connections.get(device_id)
+            if existing and (existing.is_connected or
+                             (existing.future and not existing.future.done())):
+                app_logger.warning(f"{device_id} zaten bağlı veya bağlanıyor")
+                return False
+            
+            active = [c for c in self.connections.values()
+                      if c.is_connected or (c.future and not c.future.done())]
+            if len(active) >= BLE_MAX_CONNECTIONS:
+                app_logger.warning(f"Eşzamanlı bağlantı sınırı aşıldı ({BLE_MAX_CONNECTIONS})")
+                return False
+            
+            connection = DeviceConnection(device_id, device_name, device_address, self._emit_packet)
+            connection.capture_writer = self.capture_writer
+            self.connections[device_id] = connection
+            
+            # Her bağlantı kalıcı BLE döngüsünde ayrı görev olarak çalışır
+            connection.future = self.submit(self._connect_to_device_async(connection))
         
         return True
     
-    def _connect_async_wrapper(self, device_address: str, device_name: str):
-        """Async bağlantı wrapper"""
-        try:
-            asyncio.run(self._connect_to_device_async(device_address, device_name))
-        except Exception as e:
-            app_logger.error(f"BLE bağlantı async wrapper hatası: {e}")
+    async def _connect_to_device_async(self, connection: DeviceConnection):
+        """Async BLE bağlantısı - kopan bağlantı önbellekteki adrese taramasız yeniden kurulur"""
+        device_name = connection.device_name
+        attempt = 0
+        
+        while not connection.disconnect_requested:
+            link_lost = await self._run_connection(connection, reconnect=attempt > 0)
+            if connection.disconnect_requested:
+                break
+            
+            if link_lost:
+                # Kesinti depoya işaretlenir; deneme sayacı başarılı bağlantıdan sonra sıfırlanır
+                connection.mark_link_lost()
+                attempt = 0
+            elif connection.connected_at is None:
+                # İlk bağlantı hiç kurulamadı - eski davranış: yeniden deneme yok
+                connection.is_connected = False
+                connection.client = None
+                return
+            
+            attempt += 1
+            if not self.auto_reconnect or attempt > BLE_RECONNECT_MAX_ATTEMPTS:
+                app_logger.warning(f"{device_name} yeniden bağlanamadı, bağlantı kapatılıyor")
+                self.disconnect(connection.device_id)
+                break
+            
+            delay = self._reconnect_delay(attempt)
+            app_logger.info(f"{device_name} yeniden bağlanıyor ({attempt}. deneme, {delay * 1000:.0f} ms)")
+            await asyncio.sleep(delay)
+    
+    @staticmethod
+    def _reconnect_delay(attempt: int) -> float:
+        """Üstel bekleme + tam jitter (saniye) - aynı anda kopan cihazlar birlikte denemez"""
+        ceiling = min(BLE_RECONNECT_MAX_DELAY_MS,
+                      BLE_RECONNECT_INITIAL_DELAY_MS * (2 ** (attempt - 1)))
+        return random.uniform(ceiling / 2, ceiling) / 1000.0
     
-    async def _connect_to_device_async(self, device_address: str, device_name: str):
-        """Async BLE bağlantısı"""
+    async def _run_connection(self, connection: DeviceConnection, reconnect: bool = False) -> bool:
+        """Tek bağlantı oturumu - bağlantı kurulduktan sonra koptuysa True"""
+        device_name = connection.device_name
+        link_up = False
         try:
-            app_logger.info(f"BLE bağlantısı kuruluyor: {device_name} ({device_address})")
+            app_logger.info(f"BLE bağlantısı kuruluyor: {device_name} ({connection.device_address})")
+            
+            disconnected = asyncio.Event()
+            client_kwargs = {'disconnected_callback': lambda _client: disconnected.set()}
+            if reconnect:
+                client_kwargs['timeout'] = BLE_RECONNECT_TIMEOUT
             
-            async with BleakClient(device_address) as client:
-                self.current_client = client
-                self.current_device_address = device_address
-                self.current_device_name = device_name
-                self.is_connected = True
+            # Önbellekteki BLEDevice verilirse Bleak adres çözümleme taraması yapmaz
+            target = self.advertisement_cache.device_for_address(connection.device_address)
+            async with BleakClient(target or connection.device_address, **client_kwargs) as client:
+                connection.mark_connected(client)
+                link_up = True
                 
-                log_connection_event(app_logger, device_name, "CONNECTED", True)
+                log_connection_event(app_logger, device_name,
+                                     "RECONNECTED" if reconnect else "CONNECTED", True)
                 
-                await self._setup_notifications(client)
+                await self._setup_notifications(client, connection)
                 
-                app_logger.info("BLE bağlantısı sonsuz mod aktif - timeout yok")
+                app_logger.info(f"{device_name} bağlantısı sonsuz mod aktif - timeout yok")
                 
-                while self.is_connected:
+                while connection.is_connected:
                     if not client.is_connected:
-                        app_logger.warning("BLE cihazı bağlantısı kesildi")
-                        self.disconnect()
                         break
-                    await asyncio.sleep(2.0)  
-                    
+                    # Eksik kanalı gelmeyen döngüyü süre aşımında kapat
+                    connection.cycle_assembler.flush_expired()
+                    try:
+                        # Kopma callback'i beklemeyi hemen bitirir
+                        await asyncio.wait_for(disconnected.wait(), 0.5)
+                        break
+                    except asyncio.TimeoutError:
+                        pass
+            
         except Exception as e:
             log_connection_event(app_logger, device_name, "CONNECTION_FAILED", False)
-            log_error(app_logger, e, "BLE bağlantı hatası")
-            self.is_connected = False
-            self.current_client = None
+            log_error(app_logger, e, f"{device_name} BLE bağlantı hatası")
+        
+        if link_up and not connection.disconnect_requested:
+            app_logger.warning(f"{device_name} bağlantısı kesildi")
+            return True
+        return False
     
-    async def _setup_notifications(self, client: BleakClient):
+    async def _setup_notifications(self, client: BleakClient, connection: DeviceConnection):
         """BLE notification'ları kur"""
         try:
             for char_name, char_uuid in BLE_CHARACTERISTICS.items():
                 try:
-                    await client.start_notify(char_uuid, self._notification_handler)
+                    # Handler karakteristiğe bağlanır - her pakette UUID araması yapılmaz
+                    await client.start_notify(char_uuid, connection.notification_handler(char_name))
                     app_logger.debug(f"Notification başlatıldı: {char_name} ({char_uuid})")
                 except Exception as e:
                     app_logger.warning(f"Notification başlatma hatası {char_name}: {e}")
@@ -206,127 +353,84 @@ class BLEManager:
         except Exception as e:
             app_logger.error(f"Notification kurulum hatası: {e}")
     
-    def _notification_handler(self, sender, data: bytes):
-        """BLE notification handler"""
-        try:
-            # Veri alım zamanını hemen kaydet (zaman sıralama sorununu önler)
-            receive_timestamp = datetime.now()
-            
-            app_logger.info(f"Raspberry Pi'dan veri alındı: {sender}, uzunluk: {len(data)}")
-            
-            # Veriyi parse et
-            raw_value = parse_ble_data(data)
-            if raw_value is None:
-                return
-            
-            # Voltaja çevir
-            voltage = convert_raw_to_voltage(raw_value)
-            app_logger.info(f"Raspberry Pi verisi: Ham={raw_value}, Voltaj={voltage:.3f}V")
-            
-            # Sensör türünü belirle
-            sensor_key = self._identify_sensor_from_uuid(str(sender))
-            
-            if sensor_key:
-                self.sensor_values[sensor_key] = voltage
-                
-                # Veri paketini oluştur - timestamp'i en başta aldığımız zamanla kullan
-                data_packet = {
-                    'timestamp': receive_timestamp,  # Sabit zaman kullan
-                    'sensor_key': sensor_key,  # Hangi sensörden geldiğini belirt
-                    'sensor_2': voltage if sensor_key == "SENSOR_2" else 0,
-                    'sensor_5': voltage if sensor_key == "SENSOR_5" else 0,
-                    'sensor_7': voltage if sensor_key == "SENSOR_7" else 0,
-                    'sensor_extra': voltage if sensor_key == "SENSOR_EXTRA" else 0
-                }
-                
-                # Veri callback'ini çağır
-                if self.data_callback:
-                    self.data_callback(data_packet)
-                
-                # Queue'ya ekle
-                self.data_queue.put(data_packet)
-                
-                app_logger.info(f"Raspberry Pi verisi işlendi: {sensor_key} = {voltage:.3f}V")
-            
-        except Exception as e:
-            log_error(app_logger, e, "BLE notification handler hatası")
-    
-    def _identify_sensor_from_uuid(self, sender_uuid: str) -> Optional[str]:
-        """UUID'den sensör türünü belirle"""
-        try:
-            # UUID'yi temizle
-            clean_uuid = sender_uuid.split(' ')[0].split('(')[0].strip()
-            
-            # Karakteristik UUID'leri ile karşılaştır
-            for sensor_key, uuid in BLE_CHARACTERISTICS.items():
-                if clean_uuid.upper() == uuid.upper():
-                    return sensor_key
-            
-            app_logger.warning(f"Bilinmeyen UUID: {sender_uuid}")
-            return None
-            
-        except Exception as e:
-            app_logger.error(f"UUID tanımlama hatası: {e}")
-            return None
+    def disconnect(self, device_id: Optional[str] = None):
+        """BLE bağlantısını kes - device_id verilmezse tüm cihazlar"""
+        if device_id is None:
+            targets = list(self.connections.values())
+        else:
+            targets = [self.connections[device_id]] if device_id in self.connections else []
+        
+        for connection in targets:
+            self._disconnect_connection(connection)
+        
+        if device_id is None:
+            app_logger.info("BLE bağlantısı kesildi")
     
-    def disconnect(self):
-        """BLE bağlantısını kes"""
+    def _disconnect_connection(self, connection: DeviceConnection):
         try:
-            self.is_connected = False
-            
-            if self.current_client:
-                self.current_client = None
-            
-            device_name = self.current_device_name
-            if device_name:
-                log_connection_event(app_logger, device_name, "DISCONNECTED", True)
+            # Yeniden bağlanma beklenirken de bağlı sayılır; ikinci çağrı callback'i tekrarlamaz
+            was_connected = (not connection.disconnect_requested and
+                             (connection.is_connected or connection.connected_at is not None))
+            connection.disconnect_requested = True
+            connection.mark_disconnected()
             
-            # Değişkenleri sıfırla
-            self.current_device_address = None
-            self.current_device_name = None
-            
-            # Sensör değerlerini sıfırla
-            for key in self.sensor_values:
-                self.sensor_values[key] = 0
-            
-            app_logger.info("BLE bağlantısı kesildi")
+            if was_connected:
+                log_connection_event(app_logger, connection.device_name, "DISCONNECTED", True)
             
             # Disconnect callback'ini çağır
-            if self.disconnect_callback:
+            if was_connected and self.disconnect_callback:
                 try:
-                    self.disconnect_callback(device_name)
+                    self.disconnect_callback(connection.device_name)
                 except Exception as callback_error:
                     app_logger.error(f"Disconnect callback hatası: {callback_error}")
             
         except Exception as e:
             log_error(app_logger, e, "BLE bağlantı kesme hatası")
     
+    def start_capture(self, path: Optional[str] = None) -> str:
+        """Tüm bağlantıların ham bayt akışını kayıt dosyasına yazmaya başla"""
+        if self.capture_writer:
+            return self.capture_writer.path
+        
+        self.capture_writer = CaptureWriter(path)
+        for connection in list(self.connections.values()):
+            connection.capture_writer = self.capture_writer
+        app_logger.info(f"Ham BLE kaydı etkin: {self.capture_writer.path}")
+        return self.capture_writer.path
+    
+    def stop_capture(self):
+        """Kaydı durdur ve dosyayı kapat"""
+        capture_writer, self.capture_writer = self.capture_writer, None
+        if capture_writer:
+            for connection in list(self.connections.values()):
+                connection.capture_writer = None
+            capture_writer.close()
+    
     def get_connection_status(self) -> Dict[str, Any]:
         """Bağlantı durumu bilgilerini al"""
         return {
             'is_connected': self.is_connected,
             'device_name': self.current_device_name,
             'device_address': self.current_device_address,
+            'connected_devices': self.get_connected_devices(),
             'available_devices_count': len(self.available_devices),
-            'queue_size': self.data_queue.qsize(),
             'is_scanning': self.is_scanning
         }
     
+    def get_connected_devices(self) -> List[str]:
+        """Bağlı cihaz kimliklerini al"""
+        return [device_id for device_id, connection in list(self.connections.items())
+                if connection.is_connected]
+    
+    def get_device_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Cihaz bazlı throughput ve kayıp istatistiklerini al"""
+        return {device_id: connection.get_stats()
+                for device_id, connection in list(self.connections.items())}
+    
     def get_available_devices(self) -> Dict[str, Dict[str, Any]]:
         """Mevcut cihazları al"""
         return self.available_devices.copy()
     
-    def get_data_from_queue(self) -> List[Dict[str, Any]]:
-        """Queue'dan veri al"""
-        data_list = []
-        try:
-            while not self.data_queue.empty():
-                data_list.append(self.data_queue.get_nowait())
-        except queue.Empty:
-            pass
-        
-        return data_list
-    
     def set_data_callback(self, callback: Callable):
         """Veri callback fonksiyonunu ayarla"""
         self.data_callback = callback
@@ -0,0 +1,294 @@
+"""
+Spektroskopi Sistemi Ham BLE Kayıt Dosyası ve Tekrar Oynatma
+"""
+
+import os
+import struct
+import threading
+import time
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from config.constants import (
+    BLE_CHARACTERISTICS, CAPTURE_BUFFER_SIZE, CAPTURE_DIRECTORY, REPLAY_MAX_SPEED
+)
+from .device_connection import DeviceConnection
+from utils.logger import app_logger, log_connection_event, log_error
+from utils.helpers import generate_filename
+from utils.session_clock import session_clock
+
+# Dosya: MAGIC + kayıtlar. Kayıt: duvar saati(ns) | tür | cihaz no | karakteristik no | uzunluk | veri
+CAPTURE_MAGIC = b"SPCAP\x00\x01\n"
+RECORD_HEADER = struct.Struct("<qBBBH")
+
+RECORD_NOTIFICATION = 0
+RECORD_DEVICE = 1            # veri = cihaz kimliği (utf-8), cihaz no atanır
+RECORD_CHARACTERISTIC = 2    # veri = karakteristik adı (utf-8), karakteristik no atanır
+
+CaptureRecord = Tuple[int, str, str, bytes]   # (zaman ns, cihaz, karakteristik, veri)
+
+class CaptureWriter:
+    """Notification bayt akışını tamponlu G/Ç ile kompakt binary dosyaya yaz"""
+
+    def __init__(self, path: Optional[str] = None, buffer_size: int = CAPTURE_BUFFER_SIZE):
+        if path is None:
+            os.makedirs(CAPTURE_DIRECTORY, exist_ok=True)
+            path = os.path.join(CAPTURE_DIRECTORY, generate_filename("capture", "spcap"))
+        self.path = path
+        self.buffer_size = buffer_size
+
+        self._file = None
+        self._closed = False
+        self._lock = threading.Lock()
+        self._device_indexes: Dict[str, int] = {}
+        self._characteristic_indexes: Dict[str, int] = {}
+
+        self.records = 0
+        self.bytes_written = 0
+
+    def _open(self):
+        # Dosya ilk kayıtta açılır - bağlantı yokken boş kayıt oluşmaz
+        self._file = open(self.path, 'wb', buffering=self.buffer_size)
+        self._file.write(CAPTURE_MAGIC)
+        self.bytes_written += len(CAPTURE_MAGIC)
+        app_logger.info(f"Ham BLE kaydı başladı: {self.path}")
+
+    def _write_record(self, timestamp_ns: int, kind: int, device_index: int,
+                      characteristic_index: int, payload: bytes):
+        self._file.write(RECORD_HEADER.pack(timestamp_ns, kind, device_index,
+                                            characteristic_index, len(payload)))
+        self._file.write(payload)
+        self.bytes_written += RECORD_HEADER.size + len(payload)
+
+    def _index_for(self, table: Dict[str, int], kind: int, name: str, timestamp_ns: int) -> int:
+        index = table.get(name)
+        if index is None:
+            index = len(table)
+            if index > 0xFF:
+                raise ValueError(f"Kayıt tablosu dolu: {name}")
+            table[name] = index
+            self._write_record(timestamp_ns, kind, index, index, name.encode('utf-8'))
+        return index
+
+    def write(self, device_id: str, characteristic: str, payload: bytes,
+              timestamp: int):
+        """Tek notification kaydı ekle (BLE döngüsü thread'inden, timestamp: monotonik ns)"""
+        with self._lock:
+            if self._file is None:
+                # Kapatıldıktan sonra gelen yazmalar yok sayılır
+                if self._closed:
+                    return
+                self._open()
+            # Dosyada duvar saati tutulur - oturumlar arası anlamlı kalır
+            timestamp_ns = session_clock.to_wall_ns(timestamp)
+            device_index = self._index_for(self._device_indexes, RECORD_DEVICE,
+                                           device_id, timestamp_ns)
+            characteristic_index = self._index_for(self._characteristic_indexes,
+                                                   RECORD_CHARACTERISTIC, characteristic,
+                                                   timestamp_ns)
+            self._write_record(timestamp_ns, RECORD_NOTIFICATION, device_index,
+                               characteristic_index, bytes(payload))
+            self.records += 1
+
+    def flush(self):
+        with self._lock:
+            if self._file:
+                self._file.flush()
+
+    def close(self):
+        """Tamponu boşalt ve dosyayı kapat"""
+        with self._lock:
+            self._closed = True
+            if self._file:
+                self._file.close()
+                self._file = None
+                app_logger.info(f"Ham BLE kaydı kapatıldı: {self.path} "
+                                f"({self.records} kayıt, {self.bytes_written} byte)")
+
+def read_capture(path: str) -> Iterator[CaptureRecord]:
+    """Kayıt dosyasını sırayla oku"""
+    with open(path, 'rb', buffering=CAPTURE_BUFFER_SIZE) as capture_file:
+        if capture_file.read(len(CAPTURE_MAGIC)) != CAPTURE_MAGIC:
+            raise ValueError(f"Geçersiz kayıt dosyası: {path}")
+
+        devices: List[str] = []
+        characteristics: List[str] = []
+        header_size = RECORD_HEADER.size
+
+        while True:
+            header = capture_file.read(header_size)
+            if len(header) < header_size:
+                break
+            timestamp_ns, kind, device_index, characteristic_index, length = RECORD_HEADER.unpack(header)
+            payload = capture_file.read(length)
+            if len(payload) < length:
+                app_logger.warning(f"Kayıt dosyası yarıda kesilmiş: {path}")
+                break
+
+            if kind == RECORD_DEVICE:
+                devices.append(payload.decode('utf-8'))
+            elif kind == RECORD_CHARACTERISTIC:
+                characteristics.append(payload.decode('utf-8'))
+            elif kind == RECORD_NOTIFICATION:
+                yield (timestamp_ns, devices[device_index],
+                       characteristics[characteristic_index], payload)
+
+class ReplaySource:
+    """Kayıt dosyasını canlı BLE ile aynı alım yolundan 1x, Nx veya azami hızda oynat"""
+
+    def __init__(self, path: str, data_callback: Optional[Callable] = None,
+                 speed: float = 1.0,
+                 pressure_check: Optional[Callable[[], bool]] = None):
+        self.path = path
+        self.data_callback = data_callback
+        self.disconnect_callback = None
+        # REPLAY_MAX_SPEED (0) -> bekleme yok
+        self.speed = float(speed)
+        # Azami hızda alım kuyruğu dolarken yavaşla (ör. IngestQueue.is_under_pressure)
+        self.pressure_check = pressure_check
+
+        self.connections: Dict[str, DeviceConnection] = {}
+        self.available_devices: Dict[str, Dict[str, Any]] = {}
+
+        self._thread: Optional[threading.Thread] = None
+        self._stop_event = threading.Event()
+        self.records_replayed = 0
+        self.finished = False
+
+    @property
+    def is_connected(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    @property
+    def is_scanning(self) -> bool:
+        return False
+
+    def is_available(self) -> bool:
+        return os.path.exists(self.path)
+
+    def set_data_callback(self, callback: Callable):
+        """Veri callback fonksiyonunu ayarla"""
+        self.data_callback = callback
+
+    def set_disconnect_callback(self, callback: Optional[Callable] = None):
+        """Bağlantı kopma callback'ini ayarla - bağlantı thread'inden çağrılır, GUI Tk thread'ine aktarmalı"""
+        self.disconnect_callback = callback
+
+    def _emit_packet(self, data_packet: Dict[str, Any]):
+        if self.data_callback:
+            self.data_callback(data_packet)
+
+    def _connection_for(self, device_id: str) -> DeviceConnection:
+        connection = self.connections.get(device_id)
+        if connection is None:
+            connection = DeviceConnection(device_id, device_id, self.path, self._emit_packet)
+            connection.mark_connected(None)
+            self.connections[device_id] = connection
+            self.available_devices[device_id] = {'address': self.path, 'original_name': device_id}
+            log_connection_event(app_logger, device_id, "CONNECTED", True)
+        return connection
+
+    def connect_to_device(self, device_address: str = "", device_name: str = "Replay") -> bool:
+        """BLEManager uyumlu başlatma"""
+        return self.start()
+
+    def start(self) -> bool:
+        """Oynatma thread'ini başlat"""
+        if self.is_connected:
+            app_logger.warning("Oynatma zaten devam ediyor")
+            return False
+
+        self._stop_event.clear()
+        self.finished = False
+        self._thread = threading.Thread(target=self._run, name="ReplaySource", daemon=True)
+        self._thread.start()
+        speed_text = "azami" if self.speed <= REPLAY_MAX_SPEED else f"{self.speed:g}x"
+        app_logger.info(f"Kayıt oynatılıyor: {self.path} ({speed_text})")
+        return True
+
+    def replay_all(self) -> int:
+        """Kaydı bu thread'de bekleme olmadan oynat (profil ölçümleri için)"""
+        speed, self.speed = self.speed, REPLAY_MAX_SPEED
+        try:
+            self._run()
+        finally:
+            self.speed = speed
+        return self.records_replayed
+
+    def _run(self):
+        # (cihaz, karakteristik) -> bağlı handler; canlı BLE ile aynı ön çözümleme
+        handlers: Dict[Tuple[str, str], Callable] = {}
+        first_ns = None
+        start_perf = time.perf_counter()
+        # Kayıttaki aralıklar korunarak bu oturumun monotonik saatine taşınır
+        base_ns = session_clock.now_ns()
+        try:
+            for timestamp_ns, device_id, characteristic, payload in read_capture(self.path):
+                if self._stop_event.is_set():
+                    break
+
+                if first_ns is None:
+                    first_ns = timestamp_ns
+                if self.speed > REPLAY_MAX_SPEED:
+                    delay = (timestamp_ns - first_ns) / 1e9 / self.speed - (time.perf_counter() - start_perf)
+                    if delay > 0 and self._stop_event.wait(delay):
+                        break
+                elif self.pressure_check:
+                    while self.pressure_check() and not self._stop_event.is_set():
+                        time.sleep(0.005)
+
+                handler = handlers.get((device_id, characteristic))
+                if handler is None:
+                    connection = self._connection_for(device_id)
+                    handler = connection.notification_handler(characteristic)
+                    handlers[(device_id, characteristic)] = handler
+                receive_timestamp = base_ns + (timestamp_ns - first_ns)
+                handler(BLE_CHARACTERISTICS.get(characteristic, characteristic),
+                        payload, receive_timestamp)
+                self.records_replayed += 1
+
+            self.finished = not self._stop_event.is_set()
+        except Exception as e:
+            log_error(app_logger, e, "Kayıt oynatma hatası")
+        finally:
+            self._close_connections()
+
+    def _close_connections(self):
+        for connection in self.connections.values():
+            if connection.is_connected:
+                connection.mark_disconnected()
+                log_connection_event(app_logger, connection.device_id, "DISCONNECTED", True)
+                if self.disconnect_callback:
+                    try:
+                        self.disconnect_callback(connection.device_name)
+                    except Exception as callback_error:
+                        app_logger.error(f"Disconnect callback hatası: {callback_error}")
+
+    def disconnect(self, device_id: Optional[str] = None):
+        """Oynatmayı durdur"""
+        self._stop_event.set()
+        if self._thread and threading.current_thread() is not self._thread:
+            self._thread.join(timeout=2.0)
+
+    def shutdown(self):
+        self.disconnect()
+
+    def get_connected_devices(self) -> List[str]:
+        return [device_id for device_id, connection in self.connections.items()
+                if connection.is_connected]
+
+    def get_connection_status(self) -> Dict[str, Any]:
+        """Bağlantı durumu bilgilerini al"""
+        connected = self.get_connected_devices()
+        return {
+            'is_connected': self.is_connected,
+            'device_name': connected[0] if connected else None,
+            'device_address': self.path,
+            'connected_devices': connected,
+            'available_devices_count': len(self.available_devices),
+            'is_scanning': False
+        }
+
+    def get_device_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Cihaz bazlı istatistikler (BLEManager.get_device_stats ile aynı)"""
+        return {device_id: connection.get_stats()
+                for device_id, connection in self.connections.items()}
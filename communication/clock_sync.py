@@ -0,0 +1,150 @@
+"""
+Spektroskopi Sistemi Cihaz/Host Saat Eşlemesi
+"""
+
+from collections import deque
+from typing import Any, Dict, Optional
+
+import numpy as np
+
+from config.constants import (
+    CLOCK_TICK_PERIOD_MS, CLOCK_SYNC_WINDOW, CLOCK_SYNC_MIN_POINTS, CLOCK_SYNC_REFIT_INTERVAL,
+    CLOCK_SYNC_OFFSET_PERCENTILE, CLOCK_SYNC_RESET_MS
+)
+
+NOMINAL_NS_PER_TICK = 1_000_000.0
+
+class DeviceClockModel:
+    """Cihaz ticks_ms -> host monotonik ns doğrusal modeli (ofset + sürüklenme)
+
+    Eğim kayan pencerede yarım pencere aralıklı nokta çiftlerinin medyan eğimidir;
+    ofset artıkların alt yüzdeliğidir. Bağlantı gecikmesi yalnızca ekleyebildiği için
+    alt zarf en az gecikmeli varışları izler, jitter damgalara geçmez.
+
+    Yeniden uydurma ofseti geri çekebilir; to_host_ns çıktısı artan tick'ler için geri gitmez,
+    damgalar yeni modele yetişene kadar sıkışır (depo zaman indeksi sıralı kalır).
+    """
+
+    def __init__(self, window: int = CLOCK_SYNC_WINDOW,
+                 min_points: int = CLOCK_SYNC_MIN_POINTS,
+                 refit_interval: int = CLOCK_SYNC_REFIT_INTERVAL,
+                 offset_percentile: float = CLOCK_SYNC_OFFSET_PERCENTILE,
+                 tick_period_ms: int = CLOCK_TICK_PERIOD_MS,
+                 reset_ms: float = CLOCK_SYNC_RESET_MS):
+        self.min_points = min_points
+        self.refit_interval = refit_interval
+        self.offset_percentile = offset_percentile
+        self.tick_period_ms = tick_period_ms
+        self.reset_ns = reset_ms * 1_000_000
+
+        self._ticks = deque(maxlen=window)
+        self._host = deque(maxlen=window)
+        self.resets = 0
+        # Son verilen çıktı - sıfırlamada yalnızca tick tarafı unutulur
+        self._out_ns: Optional[int] = None
+        self.reset()
+
+    def reset(self):
+        """Modeli unut (cihaz yeniden başladı, tick sayacı sıfırlandı)"""
+        self._ticks.clear()
+        self._host.clear()
+        self._last_raw: Optional[int] = None
+        self._last_unwrapped = 0
+        self._since_fit = 0
+
+        self.slope = NOMINAL_NS_PER_TICK
+        self.latency_ns = 0.0
+        self._tick_ref = 0
+        self._host_ref = 0
+        self._intercept = 0.0
+        self._out_ticks: Optional[int] = None
+
+    @property
+    def is_ready(self) -> bool:
+        return bool(self._ticks)
+
+    @property
+    def drift_ppm(self) -> float:
+        return (self.slope / NOMINAL_NS_PER_TICK - 1.0) * 1e6
+
+    def unwrap(self, tick_ms: int) -> int:
+        """Sarmal tick'i son gözleme göre aç (geri adımlar işaretli)"""
+        if self._last_raw is None:
+            return tick_ms
+        delta = (tick_ms - self._last_raw) % self.tick_period_ms
+        if delta >= self.tick_period_ms // 2:
+            delta -= self.tick_period_ms
+        return self._last_unwrapped + delta
+
+    def observe(self, tick_ms: int, host_ns: int):
+        """Cihaz tick'i ile host varış zamanı çiftini ekle"""
+        ticks = self.unwrap(tick_ms)
+        if self._last_raw is not None:
+            step_ns = (ticks - self._last_unwrapped) * self.slope
+            residual = host_ns - self._map(ticks)
+            if step_ns < -self.reset_ns or residual < -self.reset_ns:
+                # Tick sayacı geri gitti ya da ileri sıçradı - cihaz yeniden başlamış
+                self.reset()
+                self.resets += 1
+                ticks = tick_ms
+            elif step_ns < 0:
+                # Sıra dışı gözlem - modele katılmaz
+                return
+
+        self._last_raw = tick_ms
+        self._last_unwrapped = ticks
+        self._ticks.append(ticks)
+        self._host.append(host_ns)
+
+        self._since_fit += 1
+        if len(self._ticks) <= self.min_points or self._since_fit >= self.refit_interval:
+            self._fit()
+
+    def _fit(self):
+        self._since_fit = 0
+        self._tick_ref = self._ticks[0]
+        self._host_ref = self._host[0]
+        x = np.fromiter(self._ticks, dtype=np.int64, count=len(self._ticks)) - self._tick_ref
+        y = np.fromiter(self._host, dtype=np.int64, count=len(self._host)) - self._host_ref
+        x = x.astype(np.float64)
+        y = y.astype(np.float64)
+
+        half = len(x) // 2
+        if len(x) >= self.min_points:
+            dx = x[half:2 * half] - x[:half]
+            valid = dx > 0
+            if valid.any():
+                self.slope = float(np.median((y[half:2 * half] - y[:half])[valid] / dx[valid]))
+
+        residuals = y - self.slope * x
+        self._intercept = float(np.percentile(residuals, self.offset_percentile))
+        self.latency_ns = float(np.median(residuals) - self._intercept)
+
+    def _map(self, ticks: int) -> float:
+        return self._host_ref + self._intercept + self.slope * (ticks - self._tick_ref)
+
+    def to_host_ns(self, tick_ms: int) -> int:
+        """Cihaz tick'ini düzeltilmiş host monotonik ns'ye çevir - artan tick'lerde kesin artan"""
+        ticks = self.unwrap(tick_ms)
+        host_ns = int(round(self._map(ticks)))
+        if self._out_ticks is None:
+            # İlk çıktı ya da cihaz yeniden başladı - önceki çıktının gerisine düşmez
+            if self._out_ns is not None:
+                host_ns = max(host_ns, self._out_ns + 1)
+        elif ticks >= self._out_ticks:
+            # Tick başına en az 1 ns ilerler
+            host_ns = max(host_ns, self._out_ns + (ticks - self._out_ticks))
+        else:
+            # Önceki tick sorgusu - sınır güncellenmez
+            return host_ns
+        self._out_ticks = ticks
+        self._out_ns = host_ns
+        return host_ns
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            'points': len(self._ticks),
+            'drift_ppm': self.drift_ppm,
+            'latency_ms': self.latency_ns / 1e6,
+            'resets': self.resets
+        }
@@ -0,0 +1,100 @@
+"""
+Spektroskopi Sistemi LED Döngü Birleştirici
+"""
+
+from typing import Callable, Dict, List, Optional
+
+from config.constants import (
+    FRAME_CHANNEL_ORDER, CYCLE_ASSEMBLY_TIMEOUT_MS, CYCLE_EMIT_PARTIAL
+)
+from utils.logger import app_logger
+from utils.sensor_sample import SensorSample
+from utils.session_clock import session_clock
+
+class CycleAssembler:
+    """Tek kanallı örnekleri LED döngüsü başına birleştirir - döngü, geliş sırasıyla örnek tuple'ıdır"""
+
+    def __init__(self, emit_callback: Callable[[tuple], None],
+                 timeout_ms: int = CYCLE_ASSEMBLY_TIMEOUT_MS,
+                 emit_partial: bool = CYCLE_EMIT_PARTIAL,
+                 channel_order: Optional[List[str]] = None):
+        self.emit_callback = emit_callback
+        self.timeout_ns = int(timeout_ms) * 1_000_000
+        self.emit_partial = emit_partial
+        self.channel_order = list(channel_order or FRAME_CHANNEL_ORDER)
+        self._expected_mask = 0
+        for sensor_key in self.channel_order:
+            self._expected_mask |= 1 << FRAME_CHANNEL_ORDER.index(sensor_key)
+
+        # Geliş sırasıyla döngü örnekleri ve görülen kanal bit maskesi
+        self._pending: List[SensorSample] = []
+        self._seen_mask = 0
+        self._cycle_start: Optional[int] = None
+
+        # İstatistikler
+        self.complete_cycles = 0
+        self.partial_cycles = 0
+        self.dropped_partials = 0
+
+    def add(self, sample: SensorSample):
+        """Tek kanal örneğini ekle - döngü tamamlanınca örnekler birlikte yayınlanır"""
+        bit = 1 << sample.channel
+        if not bit & self._expected_mask:
+            return
+
+        if self._pending:
+            # Aynı kanal tekrar geldiyse yeni döngü başlamıştır; süre aşımı da döngüyü kapatır
+            if bit & self._seen_mask or sample.timestamp - self._cycle_start > self.timeout_ns:
+                self._close_cycle()
+
+        if not self._pending:
+            self._cycle_start = sample.timestamp
+        self._pending.append(sample)
+        self._seen_mask |= bit
+
+        if self._seen_mask == self._expected_mask:
+            self._close_cycle()
+
+    def flush_expired(self, now: Optional[int] = None):
+        """Süresi dolan yarım döngüyü kapat (bağlantı döngüsünden çağrılır)"""
+        if now is None:
+            now = session_clock.now_ns()
+        if self._pending and now - self._cycle_start > self.timeout_ns:
+            self._close_cycle()
+
+    def flush(self):
+        """Bekleyen döngüyü hemen kapat (bağlantı kesilirken)"""
+        if self._pending:
+            self._close_cycle()
+
+    def reset(self):
+        """Bekleyen veriyi at"""
+        self._pending = []
+        self._seen_mask = 0
+        self._cycle_start = None
+
+    def _close_cycle(self):
+        is_complete = self._seen_mask == self._expected_mask
+        pending = self._pending
+        self.reset()
+
+        if is_complete:
+            self.complete_cycles += 1
+        elif self.emit_partial:
+            self.partial_cycles += 1
+            app_logger.debug(f"Yarım döngü: {sorted(sample.channel for sample in pending)}")
+        else:
+            self.dropped_partials += 1
+            return
+
+        # Eksik kanalların örneği yok -> işleme çekirdeğinde geçersiz olarak işaretlenir
+        self.emit_callback(tuple(pending))
+
+    def get_stats(self) -> Dict[str, int]:
+        """Birleştirici istatistiklerini al"""
+        return {
+            'complete_cycles': self.complete_cycles,
+            'partial_cycles': self.partial_cycles,
+            'dropped_partials': self.dropped_partials,
+            'pending_channels': len(self._pending)
+        }
@@ -0,0 +1,292 @@
+"""
+Spektroskopi Sistemi Cihaz Bağlantısı
+"""
+
+import functools
+import time
+from typing import Any, Callable, Dict, Optional
+
+import numpy as np
+
+from config.constants import (
+    BLE_CHARACTERISTICS, FRAME_CHANNEL_ORDER, SEQUENCE_MAX_MASKED_ROWS, SEQUENCE_LOG_INTERVAL_S,
+    CLOCK_SYNC_ENABLED
+)
+from .clock_sync import DeviceClockModel
+from .frame_protocol import decode_frame
+from .cycle_assembler import CycleAssembler
+from .sequence_tracker import SequenceTracker, SEQUENCE_DUPLICATE, SEQUENCE_OUT_OF_ORDER
+from utils.logger import app_logger, log_error
+from utils.helpers import convert_raw_to_voltage, parse_ble_data
+from utils.sensor_sample import SensorSample, CHANNEL_GAP
+from utils.session_clock import session_clock
+
+_CHANNEL_INDEX = {sensor_key: channel for channel, sensor_key in enumerate(FRAME_CHANNEL_ORDER)}
+
+def identify_characteristic(sender_uuid: str) -> Optional[str]:
+    """UUID'den karakteristik adını belirle"""
+    try:
+        # UUID'yi temizle
+        clean_uuid = sender_uuid.split(' ')[0].split('(')[0].strip()
+
+        # Karakteristik UUID'leri ile karşılaştır
+        for sensor_key, uuid in BLE_CHARACTERISTICS.items():
+            if clean_uuid.upper() == uuid.upper():
+                return sensor_key
+
+        app_logger.warning(f"Bilinmeyen UUID: {sender_uuid}")
+        return None
+
+    except Exception as e:
+        app_logger.error(f"UUID tanımlama hatası: {e}")
+        return None
+
+class DeviceConnection:
+    """Tek cihaz bağlantısı: kendi döngü birleştiricisi, son değerleri ve istatistikleri"""
+
+    def __init__(self, device_id: str, device_name: str, device_address: str,
+                 emit_callback: Callable[[Any], None]):
+        self.device_id = device_id
+        self.device_name = device_name
+        self.device_address = device_address
+        self.emit_callback = emit_callback
+
+        self.client = None
+        self.is_connected = False
+        self.future = None
+        # Kullanıcı kesti -> yeniden bağlanma denenmez
+        self.disconnect_requested = False
+
+        # Ham bayt akışı kaydı (BLEManager.start_capture ile atanır)
+        self.capture_writer = None
+
+        self.sensor_values = {sensor_key: 0 for sensor_key in FRAME_CHANNEL_ORDER}
+
+        # Her cihazın kendi yarım döngüsü olur - birleştiriciler paylaşılmaz
+        self.cycle_assembler = CycleAssembler(self._emit_cycle)
+
+        # İstatistikler
+        self.connected_at: Optional[float] = None
+        self.notifications = 0
+        self.bytes_received = 0
+        self.samples = 0
+        self.frames = 0
+        self.reconnects = 0
+        self.gaps = 0
+        self.masked_samples = 0
+        self.late_frames = 0
+
+        # Frame sıra takibi - eski 2 byte notification'lar sıra numarası taşımaz, yalnızca frame yolu izlenir
+        self.sequence_tracker = SequenceTracker()
+        self._last_loss_log = 0.0
+
+        # Frame tick_ms'ten düzeltilmiş cihaz zamanı - yeniden bağlanmada korunur
+        self.clock_model = DeviceClockModel() if CLOCK_SYNC_ENABLED else None
+
+    def mark_connected(self, client):
+        if self.connected_at is not None:
+            self.reconnects += 1
+        else:
+            # Süre ve throughput ilk bağlantıdan itibaren ölçülür
+            self.connected_at = time.monotonic()
+        self.client = client
+        self.is_connected = True
+        # Firmware yeniden başlamış olabilir - sıra numarası yeniden öğrenilir
+        self.sequence_tracker.reset()
+
+    def mark_disconnected(self):
+        self.is_connected = False
+        self.client = None
+        # Bekleyen yarım döngüyü teslim et
+        self.cycle_assembler.flush()
+        for key in self.sensor_values:
+            self.sensor_values[key] = 0
+
+    def mark_link_lost(self):
+        """Bağlantı beklenmedik koptu - bekleyen döngüyü teslim et ve kesinti işareti yayınla"""
+        self.mark_disconnected()
+        self.gaps += 1
+        self.emit_callback(SensorSample(self.device_id, CHANNEL_GAP, None, session_clock.now_ns()))
+
+    def _emit_packet(self, data_packet: Dict[str, Any], samples: int = 1):
+        """Paketi cihaz kimliği ile etiketleyip yayınla"""
+        data_packet['device_id'] = self.device_id
+        self.samples += samples
+        self.emit_callback(data_packet)
+
+    def _emit_cycle(self, cycle: tuple):
+        """Birleştirilmiş döngüyü (kanal örnekleri) tek örnek olarak yayınla"""
+        self.samples += 1
+        self.emit_callback(cycle)
+
+    def notification_handler(self, sensor_key: str) -> Callable:
+        """Karakteristiğe bağlı handler - UUID çözümlemesi start_notify'da bir kez yapılır"""
+        if sensor_key == "FRAME":
+            return functools.partial(self.handle_frame_notification, sensor_key)
+        return functools.partial(self.handle_channel_notification, sensor_key)
+
+    def handle_notification(self, sender, data: bytes,
+                            receive_timestamp: Optional[int] = None):
+        """Karakteristiği bilinmeyen notification - UUID'den çözümleyip ilgili handler'a yönlendir"""
+        sensor_key = identify_characteristic(str(sender))
+        if sensor_key is None:
+            return
+        self.notification_handler(sensor_key)(sender, data, receive_timestamp)
+
+    def handle_frame_notification(self, sensor_key: str, sender, data: bytes,
+                                  receive_timestamp: Optional[int] = None):
+        """Çok kanallı frame notification'ı - tüm döngüler tek paket (oynatmada kayıttaki zaman verilir)"""
+        if receive_timestamp is None:
+            receive_timestamp = session_clock.now_ns()
+        try:
+            self.notifications += 1
+            self.bytes_received += len(data)
+            capture_writer = self.capture_writer
+            if capture_writer:
+                capture_writer.write(self.device_id, sensor_key, data, receive_timestamp)
+
+            self._handle_frame(data, receive_timestamp)
+        except Exception as e:
+            log_error(app_logger, e, f"{self.device_id} notification handler hatası")
+
+    def handle_channel_notification(self, sensor_key: str, sender, data: bytes,
+                                    receive_timestamp: Optional[int] = None):
+        """Eski tek kanallı 2 byte notification'ı - sıra numarası yok, kayıp takibi yapılmaz"""
+        # Veri alım zamanını hemen kaydet (zaman sıralama sorununu önler)
+        if receive_timestamp is None:
+            receive_timestamp = session_clock.now_ns()
+        try:
+            self.notifications += 1
+            self.bytes_received += len(data)
+            capture_writer = self.capture_writer
+            if capture_writer:
+                capture_writer.write(self.device_id, sensor_key, data, receive_timestamp)
+
+            raw_value = parse_ble_data(data)
+            if raw_value is None:
+                return
+
+            voltage = convert_raw_to_voltage(raw_value)
+            self.sensor_values[sensor_key] = voltage
+
+            # Döngünün 4 kanalı toplanınca tek örnek olarak yayınlanır
+            channel = _CHANNEL_INDEX.get(sensor_key)
+            if channel is not None:
+                self.cycle_assembler.add(SensorSample(self.device_id, channel, None,
+                                                      receive_timestamp, voltage))
+
+        except Exception as e:
+            log_error(app_logger, e, f"{self.device_id} notification handler hatası")
+
+    def _handle_frame(self, data: bytes, receive_timestamp: int):
+        """Çok kanallı frame'i tek parti paketi olarak yayınla (döngü başına satır)"""
+        frame = decode_frame(data)
+        if frame is None:
+            return
+
+        outcome, lost = self.sequence_tracker.observe(frame.sequence)
+        if outcome == SEQUENCE_DUPLICATE:
+            app_logger.debug(f"{self.device_id} tekrar eden frame atlandı: seq={frame.sequence}")
+            return
+        if outcome == SEQUENCE_OUT_OF_ORDER:
+            # Döngüleri boşluk görüldüğünde LOST olarak yazıldı - kayıp sayılmaya devam eder
+            self.late_frames += 1
+            app_logger.debug(f"{self.device_id} geç gelen frame atlandı (kayıp işaretlendi): seq={frame.sequence}")
+            return
+
+        self.frames += 1
+        cycle_count = frame.cycle_count
+
+        clock_model = self.clock_model
+        if clock_model is not None:
+            # Döngü i, cihazda tick_ms + (i + 1) * period anında biter; frame son döngüyle gönderilir
+            last_tick = frame.tick_ms + cycle_count * frame.period_ms
+            clock_model.observe(last_tick, receive_timestamp)
+            # İlk ve son döngü modelden - model çıktısı geri gitmediğinden frame'ler sıralı kalır
+            first_timestamp = clock_model.to_host_ns(last_tick - (cycle_count - 1) * frame.period_ms)
+            last_timestamp = clock_model.to_host_ns(last_tick)
+            if cycle_count > 1:
+                period_ns = (last_timestamp - first_timestamp) // (cycle_count - 1)
+            else:
+                period_ns = int(frame.period_ms * clock_model.slope)
+        else:
+            # Son döngü alım anına denk gelir, öncekiler periyot kadar geriye
+            period_ns = frame.period_ms * 1_000_000
+            first_timestamp = receive_timestamp - (cycle_count - 1) * period_ns
+        if lost:
+            # Kayıp frame'lerin döngüleri de aynı uzunlukta varsayılır
+            self._emit_masked(lost * cycle_count, first_timestamp, period_ns)
+
+        # Değer matrisi FRAME_CHANNEL_ORDER kolonlarıyla - DataProcessor.process_batch düzeni
+        values = convert_raw_to_voltage(frame.values.astype(np.float64))
+        timestamps = first_timestamp + np.arange(cycle_count, dtype=np.int64) * period_ns
+        self._emit_packet({
+            'timestamp': first_timestamp,
+            'sensor_key': "BATCH",
+            'sequence': frame.sequence,
+            'timestamps': timestamps,
+            'values': values
+        }, cycle_count)
+
+        for sensor_key, value in zip(FRAME_CHANNEL_ORDER, values[-1].tolist()):
+            self.sensor_values[sensor_key] = value
+
+        app_logger.debug(f"{self.device_id} frame işlendi: seq={frame.sequence}, {cycle_count} döngü")
+
+    def _emit_masked(self, count: int, before_timestamp: int, period_ns: int):
+        """Kaybolan örnekleri tek LOST paketiyle yayınla - depoda maskeli satırlar olur (en eskiden yeniye)"""
+        count = min(count, SEQUENCE_MAX_MASKED_ROWS)
+        timestamps = before_timestamp - np.arange(count, 0, -1, dtype=np.int64) * period_ns
+        self.emit_callback({
+            'timestamp': int(timestamps[0]),
+            'sensor_key': "LOST",
+            'device_id': self.device_id,
+            'timestamps': timestamps
+        })
+        self.masked_samples += count
+
+        now = time.monotonic()
+        if now - self._last_loss_log >= SEQUENCE_LOG_INTERVAL_S:
+            self._last_loss_log = now
+            stats = self.get_loss_stats()
+            app_logger.warning(f"{self.device_id} paket kaybı: toplam {stats['lost']} kayıp, "
+                               f"{stats['duplicates']} tekrar, {stats['out_of_order']} sıra dışı, "
+                               f"son pencere kayıp oranı %{stats['rolling_loss_rate'] * 100:.1f}")
+
+    def get_loss_stats(self) -> Dict[str, Any]:
+        """Frame sıra istatistikleri (eski tek kanallı notification'lar sayılmaz)"""
+        return self.sequence_tracker.get_stats()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Cihaz throughput ve kayıp istatistiklerini al"""
+        elapsed = time.monotonic() - self.connected_at if self.connected_at else 0.0
+        assembler_stats = self.cycle_assembler.get_stats()
+        loss_stats = self.get_loss_stats()
+        clock_stats = self.clock_model.get_stats() if self.clock_model else {}
+
+        return {
+            'device_id': self.device_id,
+            'device_name': self.device_name,
+            'is_connected': self.is_connected,
+            'uptime_s': elapsed,
+            'notifications': self.notifications,
+            'bytes_received': self.bytes_received,
+            'samples': self.samples,
+            'samples_per_second': self.samples / elapsed if elapsed > 0 else 0.0,
+            'bytes_per_second': self.bytes_received / elapsed if elapsed > 0 else 0.0,
+            'frames': self.frames,
+            'lost_frames': loss_stats['lost'],
+            'frame_loss_rate': loss_stats['loss_rate'],
+            'rolling_loss_rate': loss_stats['rolling_loss_rate'],
+            'duplicates': loss_stats['duplicates'],
+            'out_of_order': loss_stats['out_of_order'],
+            'masked_samples': self.masked_samples,
+            'late_frames': self.late_frames,
+            'reconnects': self.reconnects,
+            'gaps': self.gaps,
+            'clock_drift_ppm': clock_stats.get('drift_ppm', 0.0),
+            'clock_latency_ms': clock_stats.get('latency_ms', 0.0),
+            'clock_resets': clock_stats.get('resets', 0),
+            'partial_cycles': assembler_stats['partial_cycles'],
+            'dropped_partials': assembler_stats['dropped_partials']
+        }
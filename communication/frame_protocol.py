@@ -0,0 +1,148 @@
+"""
+Spektroskopi Sistemi Binary Frame Protokolü
+"""
+
+import struct
+import zlib
+from typing import Dict, List, NamedTuple, Optional, Sequence
+
+import numpy as np
+
+from config.constants import FRAME_VERSION, FRAME_HEADER_FORMAT, FRAME_CHANNEL_ORDER, SERIAL_SYNC
+from utils.logger import app_logger
+
+FRAME_HEADER = struct.Struct(FRAME_HEADER_FORMAT)
+FRAME_CHANNEL_COUNT = len(FRAME_CHANNEL_ORDER)
+FRAME_CYCLE_SIZE = FRAME_CHANNEL_COUNT * 2
+LEGACY_PACKET_SIZE = 2
+
+# Seri akış sarmalayıcısı: SYNC + uzunluk (u16) ... CRC32 (u32)
+SERIAL_LENGTH = struct.Struct("<H")
+SERIAL_CRC = struct.Struct("<I")
+SERIAL_PREFIX_SIZE = len(SERIAL_SYNC) + SERIAL_LENGTH.size
+SERIAL_MAX_PAYLOAD = FRAME_HEADER.size + 255 * FRAME_CYCLE_SIZE
+
+_CYCLE_DTYPE = np.dtype('<u2')
+
+class SensorFrame(NamedTuple):
+    """Çözülmüş frame: N döngü x 4 kanal"""
+    version: int
+    sequence: int
+    tick_ms: int
+    period_ms: int
+    values: np.ndarray  # shape (cycles, 4), uint16 mV - FRAME_CHANNEL_ORDER sırasıyla
+
+    @property
+    def cycle_count(self) -> int:
+        return self.values.shape[0]
+
+def is_legacy_packet(data: bytes) -> bool:
+    """Eski tek kanallı 2 byte paket mi?"""
+    return len(data) == LEGACY_PACKET_SIZE
+
+def decode_frame(data: bytes) -> Optional[SensorFrame]:
+    """Frame'i çöz - başlık struct ile, gövde np.frombuffer ile (kopyasız)"""
+    if len(data) < FRAME_HEADER.size:
+        app_logger.warning(f"Frame çok kısa: {len(data)} byte")
+        return None
+
+    version, cycles, sequence, tick_ms, period_ms = FRAME_HEADER.unpack_from(data)
+    if version != FRAME_VERSION:
+        app_logger.warning(f"Desteklenmeyen frame sürümü: {version}")
+        return None
+
+    expected_size = FRAME_HEADER.size + cycles * FRAME_CYCLE_SIZE
+    if cycles == 0 or len(data) != expected_size:
+        app_logger.warning(f"Frame uzunluğu hatalı: {len(data)} (beklenen {expected_size})")
+        return None
+
+    values = np.frombuffer(data, dtype=_CYCLE_DTYPE, offset=FRAME_HEADER.size)
+    return SensorFrame(version, sequence, tick_ms, period_ms,
+                       values.reshape(cycles, FRAME_CHANNEL_COUNT))
+
+def encode_frame(sequence: int, tick_ms: int, period_ms: int,
+                 cycles: Sequence[Sequence[int]]) -> bytes:
+    """Frame oluştur (firmware ile aynı düzen)"""
+    values = np.asarray(cycles, dtype=_CYCLE_DTYPE).reshape(-1, FRAME_CHANNEL_COUNT)
+    header = FRAME_HEADER.pack(FRAME_VERSION, values.shape[0], sequence & 0xFFFF,
+                               tick_ms & 0xFFFFFFFF, period_ms & 0xFFFF)
+    return header + values.tobytes()
+
+def encode_serial_packet(frame: bytes) -> bytes:
+    """Frame'i seri akış için sarmala (firmware USB_STREAM ile aynı düzen)"""
+    return (SERIAL_SYNC + SERIAL_LENGTH.pack(len(frame)) + frame +
+            SERIAL_CRC.pack(zlib.crc32(frame) & 0xFFFFFFFF))
+
+class SerialFrameParser:
+    """Bayt akışından sarmalanmış frame'leri ayıklar - bozuk veride SYNC'e yeniden hizalanır"""
+
+    def __init__(self):
+        self._buffer = bytearray()
+        self.packets = 0
+        self.crc_errors = 0
+        self.resyncs = 0
+        self.discarded_bytes = 0
+
+    def feed(self, data: bytes) -> List[bytes]:
+        """Okunan baytları ekle, tamamlanan frame gövdelerini döndür"""
+        buffer = self._buffer
+        buffer += data
+        payloads = []
+        position = 0
+        end = len(buffer)
+
+        while True:
+            start = buffer.find(SERIAL_SYNC, position)
+            if start < 0:
+                # Son bayt SYNC'in ilk yarısı olabilir
+                keep = end - 1 if end > position and buffer[-1] == SERIAL_SYNC[0] else end
+                self.discarded_bytes += keep - position
+                position = keep
+                break
+            if start != position:
+                self.discarded_bytes += start - position
+                self.resyncs += 1
+                position = start
+
+            if end - position < SERIAL_PREFIX_SIZE:
+                break
+            (length,) = SERIAL_LENGTH.unpack_from(buffer, position + len(SERIAL_SYNC))
+            if length < FRAME_HEADER.size or length > SERIAL_MAX_PAYLOAD:
+                # Sahte SYNC - bir bayt ileriden ara
+                self.discarded_bytes += 1
+                self.resyncs += 1
+                position += 1
+                continue
+
+            packet_end = position + SERIAL_PREFIX_SIZE + length + SERIAL_CRC.size
+            if end < packet_end:
+                break
+
+            payload = bytes(buffer[position + SERIAL_PREFIX_SIZE:packet_end - SERIAL_CRC.size])
+            (crc,) = SERIAL_CRC.unpack_from(buffer, packet_end - SERIAL_CRC.size)
+            if zlib.crc32(payload) & 0xFFFFFFFF != crc:
+                self.crc_errors += 1
+                self.discarded_bytes += 1
+                self.resyncs += 1
+                position += 1
+                continue
+
+            payloads.append(payload)
+            self.packets += 1
+            position = packet_end
+
+        if position:
+            del buffer[:position]
+        return payloads
+
+    def reset(self):
+        self._buffer.clear()
+
+    def get_stats(self) -> Dict[str, int]:
+        return {
+            'packets': self.packets,
+            'crc_errors': self.crc_errors,
+            'resyncs': self.resyncs,
+            'discarded_bytes': self.discarded_bytes,
+            'buffered_bytes': len(self._buffer)
+        }
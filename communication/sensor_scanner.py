@@ -1,12 +1,11 @@
 
-import threading
 import tkinter as tk
 from tkinter import messagebox
 from typing import Dict, List, Optional, Callable, Any
 
 from .ble_manager import BLEManager
 from config.constants import DEFAULT_SENSORS, TARGET_SENSORS
-from utils.logger import app_logger, log_connection_event
+from utils.logger import app_logger, log_connection_event, log_error
 from utils.helpers import map_device_name
 
 class SensorScanner:
@@ -25,10 +24,11 @@ class SensorScanner:
         # Durum takibi
         self.current_selected_sensor = None
         self.auto_connection_enabled = True
-        
-        # Thread yönetimi - aynı anda sadece 1 thread
-        self.active_scan_thread = None
-        self.is_scanning = False
+    
+    @property
+    def is_scanning(self) -> bool:
+        """Tarama durumu BLEManager'ın tek tarama future'ından okunur"""
+        return self.ble_manager.is_scanning
     
     def set_ui_components(self, sensor_combo, scan_button, status_label):
         """UI bileşenlerini ayarla"""
@@ -47,8 +47,27 @@ class SensorScanner:
         self.scan_callback = scan_callback
         self.connection_callback = connection_callback
     
+    def _on_ui_thread(self, callback: Callable, *args):
+        """BLE döngüsü thread'inden gelen çağrıyı Tk thread'ine aktar (after(0, ...))"""
+        widget = self.status_label or self.scan_button or self.sensor_combo
+        if widget is None:
+            callback(*args)
+            return
+        try:
+            widget.after(0, lambda: callback(*args))
+        except RuntimeError:
+            app_logger.warning("UI güncelleme hatası - main thread mevcut değil")
+    
+    @staticmethod
+    def _best_device(devices: Dict[str, Dict[str, Any]]) -> str:
+        """Birden fazla prob menzildeyse kayan ortalama RSSI'ı en güçlü olanı seç"""
+        def rssi_of(name):
+            rssi = devices[name].get('rssi')
+            return rssi if isinstance(rssi, (int, float)) else float('-inf')
+        return max(devices, key=rssi_of)
+    
     def scan_and_connect_sensors(self):
-        """Sensörleri tara ve ilk bulduğuna bağlan - thread yönetimi optimize edildi"""
+        """Önbellekten (yoksa ilk reklamdan) en güçlü sensörü seç ve bağlan"""
         if not self.ble_manager.is_available():
             if self.status_label:
                 self.status_label.configure(text="Bleak Not Available", foreground="red")
@@ -57,30 +76,19 @@ class SensorScanner:
         
         # Zaten tarama yapılıyorsa çık
         if self.is_scanning:
-            app_logger.warning("Tarama zaten devam ediyor, yeni thread oluşturulmadı")
-            return
-            
-        # Önceki thread'i temizle
-        if self.active_scan_thread and self.active_scan_thread.is_alive():
-            app_logger.warning("Önceki tarama thread'i hala aktif, bekleniyor...")
+            app_logger.warning("Tarama zaten devam ediyor, yeni tarama başlatılmadı")
             return
         
         # UI güncelle
         if self.scan_button:
             self.scan_button.configure(state=tk.DISABLED, text="Scanning...")
         
-        def scan_thread():
-            self.is_scanning = True  # Tarama başladı
+        def on_scan_done(devices):
+            # BLE döngüsü thread'inde çalışır - UI güncellemeleri after() ile
             try:
-                # Cihazları tara
-                devices = self.ble_manager.scan_devices_sync()
-                
                 if devices:
-                    # Available devices'ı güncelle
-                    self.ble_manager.available_devices.update(devices)
-                    
-                    # İlk cihazı seç
-                    first_device = list(devices.keys())[0]
+                    # En güçlü RSSI'lı cihazı seç
+                    first_device = self._best_device(devices)
                     
                     # UI'yi güncelle (thread-safe)
                     if self.sensor_combo:
@@ -109,13 +117,13 @@ class SensorScanner:
                             except RuntimeError:
                                 pass
                         
-                        # Callback çağır
+                        # Callback çağır (Tk thread'inde)
                         if self.connection_callback:
-                            self.connection_callback(first_device, device_info, True)
+                            self._on_ui_thread(self.connection_callback, first_device, device_info, True)
                     
-                    # Callback çağır
+                    # Callback çağır (Tk thread'inde)
                     if self.scan_callback:
-                        self.scan_callback(devices)
+                        self._on_ui_thread(self.scan_callback, devices)
                         
                 else:
                     # Hiç cihaz bulunamadı
@@ -127,9 +135,8 @@ class SensorScanner:
                             app_logger.warning("Cihaz bulunamadı mesajı gösterilemedi")
                 
             except Exception as e:
-                log_error(app_logger, e, "Tarama thread hatası")
+                log_error(app_logger, e, "Tarama sonucu işleme hatası")
             finally:
-                self.is_scanning = False  # Tarama bitti
                 # Scan butonunu geri aç
                 if self.scan_button:
                     try:
@@ -138,10 +145,45 @@ class SensorScanner:
                     except RuntimeError:
                         app_logger.warning("Scan butonu güncellenemedi")
         
-        # Thread oluştur ve referansı sakla
-        self.active_scan_thread = threading.Thread(target=scan_thread, daemon=True)
-        self.active_scan_thread.start()
-        app_logger.debug("Yeni tarama thread'i başlatıldı")
+        # Tarama kalıcı BLE döngüsünde çalışır, sonuç callback ile gelir
+        self.ble_manager.start_scan(callback=on_scan_done)
+        app_logger.debug("Yeni tarama başlatıldı")
+    
+    def scan_and_connect_all(self):
+        """Tara ve bulunan tüm sensörlere eşzamanlı bağlan"""
+        if not self.ble_manager.is_available():
+            messagebox.showerror("Error", "Bleak library not installed!")
+            return
+        
+        def on_scan_done(devices):
+            # BLE döngüsü thread'inde çalışır - callback'ler ve UI güncellemeleri Tk thread'ine aktarılır
+            try:
+                connected = []
+                for device_name, device_info in devices.items():
+                    # Her cihaz kendi bağlantı görevinde çalışır
+                    if self.ble_manager.connect_to_device(device_info['address'], device_name):
+                        connected.append(device_name)
+                        if self.connection_callback:
+                            self._on_ui_thread(self.connection_callback, device_name, device_info, True)
+                
+                app_logger.info(f"Çoklu bağlantı başlatıldı: {connected}")
+                
+                if self.status_label and connected:
+                    try:
+                        self.status_label.after(100, 
+                            lambda: self.status_label.configure(
+                                text=f"{len(connected)} sensors", foreground="green"))
+                    except RuntimeError:
+                        pass
+                
+                if self.scan_callback:
+                    self._on_ui_thread(self.scan_callback, devices)
+                    
+            except Exception as e:
+                log_error(app_logger, e, "Çoklu bağlantı hatası")
+        
+        self.ble_manager.start_scan(callback=on_scan_done)
+        app_logger.debug("Çoklu bağlantı için tarama başlatıldı")
     
     def on_sensor_selection_changed(self, event):
         """Sensör seçimi değiştiğinde çağrılır"""
@@ -181,9 +223,11 @@ class SensorScanner:
         # Önce current_selected_sensor'ı güncelle
         self.current_selected_sensor = sensor_name
         
-        if sensor_name in self.ble_manager.available_devices:
+        # Arka plan tarayıcısının güncel kaydı önce, yoksa son tarama sonucu
+        device_info = (self.ble_manager.advertisement_cache.get(sensor_name) or
+                       self.ble_manager.available_devices.get(sensor_name))
+        if device_info:
             # Mevcut cihaza bağlan
-            device_info = self.ble_manager.available_devices[sensor_name]
             app_logger.info(f"{sensor_name} cihazına bağlanılıyor...")
             
             success = self.ble_manager.connect_to_device(
@@ -218,15 +262,11 @@ class SensorScanner:
             app_logger.warning(f"{sensor_name} tarama atlandı - zaten tarama devam ediyor")
             return
             
-        def scan_thread():
-            self.is_scanning = True
+        def on_scan_done(devices):
+            # BLE döngüsü thread'inde çalışır - callback'ler ve UI güncellemeleri Tk thread'ine aktarılır
             try:
-                # Tarama yap
-                devices = self.ble_manager.scan_devices_sync()
-                
                 if sensor_name in devices:
-                    # Cihaz bulundu, available_devices'a ekle ve bağlan
-                    self.ble_manager.available_devices.update(devices)
+                    # Cihaz bulundu, bağlan (available_devices BLEManager'da güncellendi)
                     device_info = devices[sensor_name]
                     app_logger.info(f"{sensor_name} cihazına bağlanılıyor...")
                     
@@ -238,33 +278,32 @@ class SensorScanner:
                     if success:
                         # UI durumunu güncelle
                         if self.status_label:
-                            self.status_label.configure(text=sensor_name, foreground="green")
+                            self._on_ui_thread(lambda: self.status_label.configure(
+                                text=sensor_name, foreground="green"))
                         
                         # Callback çağır
                         if self.connection_callback:
-                            self.connection_callback(sensor_name, device_info, True)
+                            self._on_ui_thread(self.connection_callback, sensor_name, device_info, True)
                     else:
                         # Bağlantı başarısız
                         if self.status_label:
-                            self.status_label.configure(text="Connection Failed", foreground="red")
+                            self._on_ui_thread(lambda: self.status_label.configure(
+                                text="Connection Failed", foreground="red"))
                         
                         if self.connection_callback:
-                            self.connection_callback(sensor_name, device_info, False)
+                            self._on_ui_thread(self.connection_callback, sensor_name, device_info, False)
                 else:
                     # Cihaz bulunamadı
                     app_logger.warning(f"{sensor_name} bulunamadı")
                     if self.status_label:
-                        self.status_label.configure(text=f"{sensor_name} Not Found", foreground="red")
+                        self._on_ui_thread(lambda: self.status_label.configure(
+                            text=f"{sensor_name} Not Found", foreground="red"))
                 
             except Exception as e:
                 log_error(app_logger, e, f"{sensor_name} tarama hatası")
-            finally:
-                self.is_scanning = False
         
-        # Thread oluştur ve referansı sakla
-        self.active_scan_thread = threading.Thread(target=scan_thread, daemon=True)
-        self.active_scan_thread.start()
-        app_logger.debug(f"{sensor_name} için yeni tarama thread'i başlatıldı")
+        self.ble_manager.start_scan(callback=on_scan_done)
+        app_logger.debug(f"{sensor_name} için yeni tarama başlatıldı")
     
     def disconnect_current_sensor(self):
         """Mevcut sensör bağlantısını kes"""
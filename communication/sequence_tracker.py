@@ -0,0 +1,102 @@
+"""
+Spektroskopi Sistemi Sıra Numarası ve Paket Kaybı Takibi
+"""
+
+from collections import deque
+from typing import Any, Dict, Optional
+
+from config.constants import SEQUENCE_MODULUS, SEQUENCE_LOSS_WINDOW
+
+# observe() sonuçları
+SEQUENCE_OK = 0
+SEQUENCE_LOST = 1
+SEQUENCE_DUPLICATE = 2
+SEQUENCE_OUT_OF_ORDER = 3
+
+class SequenceTracker:
+    """Tek akışın (cihaz) sarmal sıra numaralarını izler: kayıp, tekrar, sıra dışı"""
+
+    def __init__(self, modulus: int = SEQUENCE_MODULUS,
+                 loss_window: int = SEQUENCE_LOSS_WINDOW):
+        self.modulus = modulus
+        self.half = modulus // 2
+        self.loss_window = loss_window
+
+        self.received = 0
+        self.lost = 0
+        self.duplicates = 0
+        self.out_of_order = 0
+
+        self._last: Optional[int] = None
+        # Son sıra numaraları - tekrar / geç gelen ayrımı için
+        self._recent = deque(maxlen=64)
+        # Kayan kayıp oranı: (alınan, kaybolan) olayları, toplam beklenen <= loss_window
+        self._window = deque()
+        self._window_expected = 0
+        self._window_lost = 0
+
+    def reset(self):
+        """Yeniden bağlanınca sıra numarası baştan başlayabilir"""
+        self._last = None
+        self._recent.clear()
+
+    def observe(self, sequence: int):
+        """Sıra numarasını işle -> (sonuç, kayıp sayısı)"""
+        sequence %= self.modulus
+        if self._last is None:
+            self._accept(sequence, 0)
+            return SEQUENCE_OK, 0
+
+        delta = (sequence - self._last) % self.modulus
+        if delta == 0 or (delta >= self.half and sequence in self._recent):
+            self.duplicates += 1
+            return SEQUENCE_DUPLICATE, 0
+
+        if delta >= self.half:
+            # Geride kalan numara: boşlukta kayıp sayıldı ve satırları maskelendi - kayıp olarak kalır
+            self.out_of_order += 1
+            self._recent.append(sequence)
+            return SEQUENCE_OUT_OF_ORDER, 0
+
+        gap = delta - 1
+        self._accept(sequence, gap)
+        return (SEQUENCE_LOST, gap) if gap else (SEQUENCE_OK, 0)
+
+    def _accept(self, sequence: int, gap: int):
+        self.received += 1
+        self.lost += gap
+        self._last = sequence
+        self._recent.append(sequence)
+        self._record(1 + gap, gap)
+
+    def _record(self, expected: int, lost: int):
+        self._window.append((expected, lost))
+        self._window_expected += expected
+        self._window_lost += lost
+        while self._window_expected > self.loss_window and len(self._window) > 1:
+            old_expected, old_lost = self._window.popleft()
+            self._window_expected -= old_expected
+            self._window_lost -= old_lost
+
+    @property
+    def loss_rate(self) -> float:
+        """Kümülatif kayıp oranı"""
+        expected = self.received + self.lost
+        return self.lost / expected if expected else 0.0
+
+    @property
+    def rolling_loss_rate(self) -> float:
+        """Son loss_window beklenen paket üzerindeki kayıp oranı"""
+        if self._window_expected <= 0:
+            return 0.0
+        return self._window_lost / self._window_expected
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            'received': self.received,
+            'lost': self.lost,
+            'duplicates': self.duplicates,
+            'out_of_order': self.out_of_order,
+            'loss_rate': self.loss_rate,
+            'rolling_loss_rate': self.rolling_loss_rate
+        }
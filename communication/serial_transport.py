@@ -0,0 +1,268 @@
+"""
+Spektroskopi Sistemi USB Seri (CDC) Aktarımı
+"""
+
+import os
+import threading
+from typing import Any, Callable, Dict, List, Optional
+
+try:
+    import serial
+    import serial.tools.list_ports
+    SERIAL_AVAILABLE = True
+except ImportError:
+    serial = None
+    SERIAL_AVAILABLE = False
+
+from config.constants import (
+    SERIAL_DEFAULT_BAUDRATE, SERIAL_READ_SIZE, SERIAL_READ_TIMEOUT_S, SERIAL_DEVICE_NAME,
+    BLE_RECONNECT_INITIAL_DELAY_MS, BLE_RECONNECT_MAX_DELAY_MS, BLE_RECONNECT_MAX_ATTEMPTS
+)
+from .capture import CaptureWriter
+from .device_connection import DeviceConnection
+from .frame_protocol import FRAME_HEADER, SerialFrameParser
+from utils.logger import app_logger, log_connection_event, log_error
+from utils.session_clock import session_clock
+
+class SerialTransport:
+    """USB-CDC üzerinden sarmalanmış v1 frame okuyan, BLEManager ile aynı callback arayüzüne sahip aktarım"""
+
+    def __init__(self, data_callback: Optional[Callable] = None,
+                 port: Optional[str] = None,
+                 baudrate: int = SERIAL_DEFAULT_BAUDRATE):
+        self.data_callback = data_callback
+        self.disconnect_callback = None
+        self.port = port
+        self.baudrate = baudrate
+
+        # Kopan port yeniden açılmaya çalışılır (connection.auto_reconnect ayarı)
+        self.auto_reconnect = True
+
+        self.connection: Optional[DeviceConnection] = None
+        self.parser = SerialFrameParser()
+        self.capture_writer: Optional[CaptureWriter] = None
+
+        self._serial = None
+        self._thread: Optional[threading.Thread] = None
+        self._stop_event = threading.Event()
+        self.reads = 0
+
+    @staticmethod
+    def list_ports() -> List[str]:
+        """Sistemdeki seri portlar"""
+        if not SERIAL_AVAILABLE:
+            return []
+        try:
+            return [port_info.device for port_info in serial.tools.list_ports.comports()]
+        except Exception as e:
+            app_logger.error(f"Seri port listeleme hatası: {e}")
+            return []
+
+    @property
+    def available_devices(self) -> Dict[str, Dict[str, Any]]:
+        return {port: {'address': port, 'original_name': port, 'rssi': 'N/A'}
+                for port in self.list_ports()}
+
+    @property
+    def is_connected(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    @property
+    def current_device_name(self) -> Optional[str]:
+        return self.connection.device_name if self.connection and self.is_connected else None
+
+    @property
+    def is_scanning(self) -> bool:
+        return False
+
+    def is_available(self) -> bool:
+        return SERIAL_AVAILABLE
+
+    def set_data_callback(self, callback: Callable):
+        """Veri callback fonksiyonunu ayarla"""
+        self.data_callback = callback
+
+    def set_disconnect_callback(self, callback: Optional[Callable] = None):
+        """Bağlantı kopma callback'ini ayarla - bağlantı thread'inden çağrılır, GUI Tk thread'ine aktarmalı"""
+        self.disconnect_callback = callback
+
+    def _emit_packet(self, data_packet: Dict[str, Any]):
+        if self.data_callback:
+            self.data_callback(data_packet)
+
+    def connect_to_device(self, device_address: Optional[str] = None,
+                          device_name: Optional[str] = None) -> bool:
+        """BLEManager uyumlu başlatma - adres seri port yoludur"""
+        if device_address:
+            self.port = device_address
+        return self.start(device_name)
+
+    def start(self, device_name: Optional[str] = None) -> bool:
+        """Portu aç ve okuma thread'ini başlat"""
+        if not SERIAL_AVAILABLE:
+            app_logger.error("pyserial bulunamadı - USB seri aktarımı kullanılamaz")
+            return False
+        if self.is_connected:
+            app_logger.warning("Seri aktarım zaten çalışıyor")
+            return False
+        if not self.port:
+            app_logger.error("Seri port seçilmedi")
+            return False
+
+        try:
+            self._open()
+        except Exception as e:
+            app_logger.error(f"Seri port açma hatası: {e}")
+            return False
+
+        device_id = device_name or f"{SERIAL_DEVICE_NAME} {os.path.basename(self.port)}"
+        self.connection = DeviceConnection(device_id, device_id, self.port, self._emit_packet)
+        self.connection.capture_writer = self.capture_writer
+        self.connection.mark_connected(self._serial)
+        self.parser.reset()
+
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name="SerialTransport", daemon=True)
+        self._thread.start()
+
+        log_connection_event(app_logger, device_id, "CONNECTED", True)
+        app_logger.info(f"USB seri aktarım başlatıldı: {self.port} @ {self.baudrate}")
+        return True
+
+    def _open(self):
+        # serial_for_url düz yolları (pty dahil) ve loop:// gibi test URL'lerini açar
+        self._serial = serial.serial_for_url(self.port, baudrate=self.baudrate,
+                                             timeout=SERIAL_READ_TIMEOUT_S)
+
+    def _close(self):
+        port, self._serial = self._serial, None
+        if port is not None:
+            try:
+                port.close()
+            except Exception as e:
+                app_logger.error(f"Seri port kapatma hatası: {e}")
+
+    def _run(self):
+        """Okuma döngüsü: bekleyen tüm baytlar tek read ile alınır"""
+        while not self._stop_event.is_set():
+            try:
+                port = self._serial
+                data = port.read(min(max(port.in_waiting, 1), SERIAL_READ_SIZE))
+            except Exception as e:
+                if self._stop_event.is_set():
+                    break
+                app_logger.error(f"Seri okuma hatası: {e}")
+                if not self._recover():
+                    break
+                continue
+
+            if data:
+                self.reads += 1
+                self._handle_bytes(data, session_clock.now_ns())
+
+        self._close()
+
+    def _handle_bytes(self, data: bytes, receive_timestamp: int):
+        """Okunan bloktaki frame'leri ayıkla; bloktaki önceki frame'ler süreleri kadar geriye damgalanır"""
+        payloads = self.parser.feed(data)
+        if not payloads:
+            return
+
+        offsets = []
+        offset_ns = 0
+        for payload in reversed(payloads):
+            offsets.append(offset_ns)
+            _, cycles, _, _, period_ms = FRAME_HEADER.unpack_from(payload)
+            offset_ns += cycles * period_ms * 1_000_000
+
+        connection = self.connection
+        for payload, offset_ns in zip(payloads, reversed(offsets)):
+            connection.handle_frame_notification("FRAME", None, payload,
+                                                 receive_timestamp - offset_ns)
+
+    def _recover(self) -> bool:
+        """Port koptu - kesinti işaretle, auto_reconnect açıksa üstel beklemeyle yeniden aç"""
+        self._close()
+        self.connection.mark_link_lost()
+        log_connection_event(app_logger, self.connection.device_name, "LINK_LOST", False)
+        if not self.auto_reconnect:
+            self._notify_disconnect()
+            return False
+
+        delay_ms = BLE_RECONNECT_INITIAL_DELAY_MS
+        for attempt in range(1, BLE_RECONNECT_MAX_ATTEMPTS + 1):
+            if self._stop_event.wait(delay_ms / 1000.0):
+                return False
+            try:
+                self._open()
+            except Exception as e:
+                app_logger.debug(f"Seri port yeniden açma denemesi {attempt} başarısız: {e}")
+                delay_ms = min(delay_ms * 2, BLE_RECONNECT_MAX_DELAY_MS)
+                continue
+
+            self.parser.reset()
+            self.connection.mark_connected(self._serial)
+            log_connection_event(app_logger, self.connection.device_name, "RECONNECTED", True)
+            return True
+
+        app_logger.error(f"Seri port yeniden açılamadı: {self.port}")
+        self._notify_disconnect()
+        return False
+
+    def _notify_disconnect(self):
+        if self.disconnect_callback and self.connection:
+            try:
+                self.disconnect_callback(self.connection.device_name)
+            except Exception as callback_error:
+                app_logger.error(f"Disconnect callback hatası: {callback_error}")
+
+    def disconnect(self, device_id: Optional[str] = None):
+        """Okumayı durdur ve portu kapat"""
+        if not self.is_connected:
+            return
+
+        try:
+            self._stop_event.set()
+            if threading.current_thread() is not self._thread:
+                self._thread.join(timeout=2.0)
+
+            self.connection.disconnect_requested = True
+            self.connection.mark_disconnected()
+            log_connection_event(app_logger, self.connection.device_name, "DISCONNECTED", True)
+            self._notify_disconnect()
+        except Exception as e:
+            log_error(app_logger, e, "Seri bağlantı kesme hatası")
+
+    def shutdown(self):
+        self.disconnect()
+        self.set_capture_writer(None)
+
+    def set_capture_writer(self, capture_writer: Optional[CaptureWriter]):
+        """Ham frame akışını BLE ile ortak kayıt dosyasına yaz (dosyanın sahibi BLEManager)"""
+        self.capture_writer = capture_writer
+        if self.connection:
+            self.connection.capture_writer = capture_writer
+
+    def get_connection_status(self) -> Dict[str, Any]:
+        """Bağlantı durumu bilgilerini al"""
+        return {
+            'is_connected': self.is_connected,
+            'device_name': self.current_device_name,
+            'device_address': self.port if self.is_connected else None,
+            'connected_devices': self.get_connected_devices(),
+            'available_devices_count': len(self.list_ports()),
+            'is_scanning': False
+        }
+
+    def get_connected_devices(self) -> List[str]:
+        return [self.connection.device_id] if self.connection and self.is_connected else []
+
+    def get_device_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Cihaz istatistikleri (BLEManager.get_device_stats ile aynı anahtarlar + akış sayaçları)"""
+        if not self.connection:
+            return {}
+        stats = self.connection.get_stats()
+        stats['is_connected'] = self.is_connected
+        stats['serial_reads'] = self.reads
+        stats.update({f"stream_{key}": value for key, value in self.parser.get_stats().items()})
+        return {self.connection.device_id: stats}
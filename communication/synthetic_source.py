@@ -0,0 +1,265 @@
+"""
+Spektroskopi Sistemi Sentetik Sensör Kaynağı
+"""
+
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+
+from config.constants import (
+    FRAME_CHANNEL_ORDER, SYNTHETIC_DEFAULT_RATE_HZ, SYNTHETIC_SATURATION_MV,
+    SYNTHETIC_TICK_MS
+)
+from utils.logger import app_logger, log_connection_event
+from utils.sensor_sample import SensorSample
+from utils.session_clock import session_clock
+
+# Kanal başına dalga formu: taban + sürüklenme + kare basamak + gürültü, 3300 mV'ta doyum
+DEFAULT_WAVEFORM = {
+    'base': 1200.0,          # mV
+    'drift_per_s': 0.0,      # mV/s
+    'step_amplitude': 0.0,   # mV
+    'step_period_s': 0.0,    # 0 -> basamak yok
+    'noise': 5.0             # mV (standart sapma)
+}
+
+DEFAULT_CHANNEL_WAVEFORMS = {
+    'SENSOR_2': {'base': 850.0},
+    'SENSOR_EXTRA': {'base': 1400.0, 'step_amplitude': 200.0, 'step_period_s': 5.0},
+    'SENSOR_5': {'base': 2100.0, 'drift_per_s': 2.0},
+    'SENSOR_7': {'base': 3000.0, 'noise': 150.0}
+}
+
+class SyntheticSensorSource:
+    """Donanımsız yük/dayanıklılık testi için BLEManager ile aynı callback arayüzüne sahip kaynak"""
+
+    def __init__(self, data_callback: Optional[Callable] = None,
+                 device_count: int = 1,
+                 rate_hz: float = SYNTHETIC_DEFAULT_RATE_HZ,
+                 waveforms: Optional[Dict[str, Dict[str, float]]] = None,
+                 seed: Optional[int] = None):
+        self.data_callback = data_callback
+        self.disconnect_callback = None
+        self.rate_hz = float(rate_hz)
+        self.device_ids = [f"synthetic-{i + 1}" for i in range(max(1, int(device_count)))]
+        self.waveforms = self._build_waveforms(waveforms)
+
+        # BLEManager uyumluluğu
+        self.available_devices = {
+            device_id: {'address': device_id, 'original_name': device_id, 'rssi': 0}
+            for device_id in self.device_ids
+        }
+
+        self._rng = np.random.default_rng(seed)
+        self._thread: Optional[threading.Thread] = None
+        self._stop_event = threading.Event()
+        self._start_ns: Optional[int] = None
+        self._start_perf = 0.0
+
+        # Cihaz bazlı üretilen örnek sayısı (sıra numarası da buradan türetilir)
+        self._emitted = {device_id: 0 for device_id in self.device_ids}
+
+    def _build_waveforms(self, waveforms: Optional[Dict[str, Dict[str, float]]]) -> Dict[str, Dict[str, float]]:
+        source = DEFAULT_CHANNEL_WAVEFORMS if waveforms is None else waveforms
+        result = {}
+        for sensor_key in FRAME_CHANNEL_ORDER:
+            config = dict(DEFAULT_WAVEFORM)
+            config.update(source.get(sensor_key, {}))
+            result[sensor_key] = config
+        return result
+
+    @property
+    def is_connected(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    @property
+    def current_device_name(self) -> Optional[str]:
+        return self.device_ids[0] if self.is_connected else None
+
+    @property
+    def is_scanning(self) -> bool:
+        return False
+
+    def is_available(self) -> bool:
+        return True
+
+    def set_data_callback(self, callback: Callable):
+        """Veri callback fonksiyonunu ayarla"""
+        self.data_callback = callback
+
+    def set_disconnect_callback(self, callback: Optional[Callable] = None):
+        """Bağlantı kopma callback'ini ayarla"""
+        self.disconnect_callback = callback
+
+    def set_waveform(self, sensor_key: str, **params):
+        """Tek kanalın dalga formunu çalışırken değiştir"""
+        if sensor_key in self.waveforms:
+            self.waveforms[sensor_key].update(params)
+
+    def connect_to_device(self, device_address: str = "", device_name: str = "Synthetic") -> bool:
+        """BLEManager uyumlu başlatma"""
+        return self.start()
+
+    def start(self) -> bool:
+        """Üretim thread'ini başlat"""
+        if self.is_connected:
+            app_logger.warning("Sentetik kaynak zaten çalışıyor")
+            return False
+
+        self._stop_event.clear()
+        self._start_ns = session_clock.now_ns()
+        self._start_perf = time.perf_counter()
+        self._emitted = {device_id: 0 for device_id in self.device_ids}
+
+        self._thread = threading.Thread(target=self._run, name="SyntheticSource", daemon=True)
+        self._thread.start()
+
+        for device_id in self.device_ids:
+            log_connection_event(app_logger, device_id, "CONNECTED", True)
+        app_logger.info(f"Sentetik kaynak başlatıldı: {len(self.device_ids)} cihaz, {self.rate_hz:.0f} Hz")
+        return True
+
+    def disconnect(self, device_id: Optional[str] = None):
+        """Üretimi durdur (tüm sanal cihazlar birlikte durur)"""
+        if not self.is_connected:
+            return
+
+        self._stop_event.set()
+        if threading.current_thread() is not self._thread:
+            self._thread.join(timeout=2.0)
+
+        for stopped_device in self.device_ids:
+            log_connection_event(app_logger, stopped_device, "DISCONNECTED", True)
+            if self.disconnect_callback:
+                try:
+                    self.disconnect_callback(stopped_device)
+                except Exception as callback_error:
+                    app_logger.error(f"Disconnect callback hatası: {callback_error}")
+
+    def shutdown(self):
+        self.disconnect()
+
+    def _run(self):
+        """Zamanlayıcı döngüsü: her tikte gecikmiş örnekleri toplu üret"""
+        tick = SYNTHETIC_TICK_MS / 1000.0
+        while not self._stop_event.is_set():
+            due = int((time.perf_counter() - self._start_perf) * self.rate_hz)
+            for device_id in self.device_ids:
+                count = due - self._emitted[device_id]
+                if count > 0:
+                    self._emit_batch(device_id, self._emitted[device_id], count)
+            self._stop_event.wait(tick)
+
+    def _generate_values(self, start_index: int, count: int) -> np.ndarray:
+        """(count, 4) mV değer matrisi - FRAME_CHANNEL_ORDER sırasıyla"""
+        t = (np.arange(start_index, start_index + count, dtype=np.float64)) / self.rate_hz
+        values = np.empty((count, len(FRAME_CHANNEL_ORDER)), dtype=np.float64)
+
+        for channel, sensor_key in enumerate(FRAME_CHANNEL_ORDER):
+            config = self.waveforms[sensor_key]
+            column = config['base'] + config['drift_per_s'] * t
+            if config['step_amplitude'] and config['step_period_s'] > 0:
+                column += config['step_amplitude'] * (np.floor(t / config['step_period_s']) % 2)
+            if config['noise'] > 0:
+                column += self._rng.normal(0.0, config['noise'], count)
+            values[:, channel] = column
+
+        # ADC doyumu
+        return np.clip(np.rint(values), 0.0, SYNTHETIC_SATURATION_MV)
+
+    def generate(self, count: int, device_index: int = 0,
+                 start_time: Optional[int] = None) -> List[tuple]:
+        """Zamanlayıcı olmadan `count` döngü (kanal örneği tuple'ı) üret (azami hız ölçümleri için)"""
+        device_id = self.device_ids[device_index]
+        if start_time is not None:
+            self._start_ns = start_time
+        elif self._start_ns is None:
+            self._start_ns = session_clock.now_ns()
+        start_index = self._emitted[device_id]
+        cycles = self._build_cycles(device_id, start_index, count)
+        self._emitted[device_id] = start_index + count
+        return cycles
+
+    def generate_batch(self, count: int, device_index: int = 0,
+                       start_time: Optional[int] = None) -> Dict[str, Any]:
+        """generate() ile aynı örnekler, tek parti paketi olarak (DataProcessor.process_batch düzeni)"""
+        device_id = self.device_ids[device_index]
+        if start_time is not None:
+            self._start_ns = start_time
+        elif self._start_ns is None:
+            self._start_ns = session_clock.now_ns()
+        start_index = self._emitted[device_id]
+        batch_packet = self._build_batch_packet(device_id, start_index, count)
+        self._emitted[device_id] = start_index + count
+        return batch_packet
+
+    def _build_batch_packet(self, device_id: str, start_index: int, count: int) -> Dict[str, Any]:
+        period_ns = 1e9 / self.rate_hz
+        indices = np.arange(start_index, start_index + count, dtype=np.int64)
+        timestamps = self._start_ns + (indices * period_ns).astype(np.int64)
+        return {
+            'timestamp': int(timestamps[0]),
+            'sensor_key': "BATCH",
+            'sequence': start_index & 0xFFFF,
+            'device_id': device_id,
+            'timestamps': timestamps,
+            'values': self._generate_values(start_index, count)
+        }
+
+    def _build_cycles(self, device_id: str, start_index: int, count: int) -> List[tuple]:
+        values = self._generate_values(start_index, count).tolist()
+        period_ns = 1e9 / self.rate_hz
+
+        cycles = []
+        for offset, row in enumerate(values):
+            index = start_index + offset
+            timestamp = self._start_ns + int(index * period_ns)
+            sequence = index & 0xFFFF
+            cycles.append(tuple(SensorSample(device_id, channel, sequence, timestamp, value)
+                                for channel, value in enumerate(row)))
+        return cycles
+
+    def _emit_batch(self, device_id: str, start_index: int, count: int):
+        try:
+            # Tikte biriken örnekler tek parti olarak yayınlanır
+            batch_packet = self._build_batch_packet(device_id, start_index, count)
+            self._emitted[device_id] = start_index + count
+            if self.data_callback:
+                self.data_callback(batch_packet)
+        except Exception as e:
+            app_logger.error(f"Sentetik veri üretim hatası: {e}")
+
+    def get_connection_status(self) -> Dict[str, Any]:
+        """Bağlantı durumu bilgilerini al"""
+        return {
+            'is_connected': self.is_connected,
+            'device_name': self.current_device_name,
+            'device_address': self.current_device_name,
+            'connected_devices': list(self.device_ids) if self.is_connected else [],
+            'available_devices_count': len(self.available_devices),
+            'is_scanning': False
+        }
+
+    def get_connected_devices(self) -> List[str]:
+        return list(self.device_ids) if self.is_connected else []
+
+    def get_device_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Cihaz bazlı üretim istatistikleri (BLEManager.get_device_stats ile aynı anahtarlar)"""
+        elapsed = time.perf_counter() - self._start_perf if self._start_ns else 0.0
+        stats = {}
+        for device_id in self.device_ids:
+            samples = self._emitted[device_id]
+            stats[device_id] = {
+                'device_id': device_id,
+                'device_name': device_id,
+                'is_connected': self.is_connected,
+                'uptime_s': elapsed,
+                'samples': samples,
+                'samples_per_second': samples / elapsed if elapsed > 0 else 0.0,
+                'lost_frames': 0,
+                'frame_loss_rate': 0.0,
+                'rolling_loss_rate': 0.0
+            }
+        return stats
@@ -1,14 +1,47 @@
+import os
+
 APP_TITLE = "Spectroscopy System - Data Monitoring | by Prof.Dr. Uğur AKSU"
 APP_VERSION = "2.0.0"
 APP_GEOMETRY = "1200x800"
+# Uygulama kök dizini - çalışma dizininden bağımsız veri klasörleri bunun altında açılır
+APP_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 
 BLE_CHARACTERISTICS = {
     "SENSOR_2": "6E400002-B5A3-F393-E0A9-E50E24DCCA9E",
     "SENSOR_5": "6E400003-B5A3-F393-E0A9-E50E24DCCA9E", 
     "SENSOR_7": "6E400004-B5A3-F393-E0A9-E50E24DCCA9E",
-    "SENSOR_EXTRA": "6E400005-B5A3-F393-E0A9-E50E24DCCA9E"
+    "SENSOR_EXTRA": "6E400005-B5A3-F393-E0A9-E50E24DCCA9E",
+    "FRAME": "6E400006-B5A3-F393-E0A9-E50E24DCCA9E"
 }
 
+# Çok kanallı binary frame protokolü (v1)
+# Başlık: version(u8), cycles(u8), sequence(u16), tick_ms(u32), period_ms(u16)
+# Gövde: cycles x 4 x uint16 mV, LED döngü sırasıyla
+FRAME_VERSION = 1
+FRAME_HEADER_FORMAT = "<BBHIH"
+FRAME_CHANNEL_ORDER = ["SENSOR_2", "SENSOR_EXTRA", "SENSOR_5", "SENSOR_7"]
+
+# USB-CDC seri akışı: SYNC(2) + uzunluk(u16) + v1 frame + CRC32(u32, frame üzerinden)
+SERIAL_SYNC = b"\xAA\x55"
+SERIAL_DEFAULT_BAUDRATE = 921600
+SERIAL_READ_SIZE = 65536
+SERIAL_READ_TIMEOUT_S = 0.05
+SERIAL_DEVICE_NAME = "USB"
+
+# Cihaz/host saat eşlemesi: frame tick_ms -> host monotonik ns (ofset + sürüklenme)
+# MicroPython ticks_ms 2^30'da sarar; alt zarf yüzdeliği bağlantı gecikmesi jitter'ını ayıklar
+CLOCK_SYNC_ENABLED = True
+CLOCK_TICK_PERIOD_MS = 1 << 30
+CLOCK_SYNC_WINDOW = 256
+CLOCK_SYNC_MIN_POINTS = 8
+CLOCK_SYNC_REFIT_INTERVAL = 16
+CLOCK_SYNC_OFFSET_PERCENTILE = 5.0
+CLOCK_SYNC_RESET_MS = 2000
+
+# Tek kanallı notification'lar için döngü birleştirme
+CYCLE_ASSEMBLY_TIMEOUT_MS = 1500
+CYCLE_EMIT_PARTIAL = True
+
 SENSOR_MAPPING = {
     'sensor_2': 'UV_360nm',      
     'sensor_extra': 'Blue_450nm',
@@ -23,6 +56,8 @@ LED_MAPPING = {
     'sensor_7': 'IR LED (850nm)'      
 }
 
+SENSOR_KEYS = ['UV_360nm', 'Blue_450nm', 'IR_850nm', 'IR_940nm']
+
 SENSOR_INFO = [
     ("UV Detector", "UV_360nm", "purple"),
     ("Blue Detector", "Blue_450nm", "blue"),
@@ -59,6 +94,8 @@ MAX_CALIBRATION_POINTS = 6
 SETTINGS_FILE = "app_settings.json"
 CALIBRATION_FILE_PREFIX = "calibration_"
 EXPORT_FILE_PREFIX = "spectroscopy_export_"
+# Dışa aktarma depodan bu kadar satırlık partilerle okunur (tüm oturum belleğe alınmaz)
+EXPORT_BATCH_ROWS = 50000
 
 WINDOW_PADDING = 10
 FRAME_PADDING = 10
@@ -76,7 +113,50 @@ MAX_GRAPH_HEIGHT = 12
 BLE_SCAN_TIMEOUT = 10.0
 BLE_CONNECTION_RETRY_DELAY = 1000 
 AUTO_CONNECTION_DELAY = 1000 
+BLE_MAX_CONNECTIONS = 7
+
+# Bağlantı kopunca önbellekteki adrese taramasız yeniden bağlanma (üstel bekleme + jitter)
+BLE_RECONNECT_INITIAL_DELAY_MS = 100
+BLE_RECONNECT_MAX_DELAY_MS = 5000
+BLE_RECONNECT_MAX_ATTEMPTS = 30
+BLE_RECONNECT_TIMEOUT = 5.0
+
+# Arka plan reklam taraması: tarama penceresi / bekleme (düşük görev döngüsü), önbellek ömrü
+ADV_SCAN_WINDOW_S = 2.0
+ADV_SCAN_IDLE_S = 3.0
+ADV_CACHE_TTL_S = 30.0
+ADV_RSSI_WINDOW = 8
+
+# Sıra numarası takibi: 16 bit sarmal sayaç, kayan kayıp oranı penceresi (beklenen paket)
+SEQUENCE_MODULUS = 0x10000
+SEQUENCE_LOSS_WINDOW = 1000
+SEQUENCE_MAX_MASKED_ROWS = 1000
+SEQUENCE_LOG_INTERVAL_S = 5.0
 
 DATA_BUFFER_SIZE = 10000  
 UPDATE_INTERVAL_MS = 1000
-MAX_MEMORY_BUFFER_SIZE = 100000  
\ No newline at end of file
+# Gerçek zamanlı grafik pencerelerine gönderilen son satır sayısı
+REALTIME_DISPLAY_POINTS = 1000
+MAX_MEMORY_BUFFER_SIZE = 100000  
+
+STORE_CHUNK_SIZE = 4096
+STORE_CRITICAL_ROWS = 86400
+# Uzun oturumlar: RAM'de kalan son chunk sayısı, daha eski dolu chunk'lar oturum dizinine taşınır (mmap)
+STORE_HOT_CHUNKS = 16
+STORE_SPILL_DIRECTORY = os.path.join(APP_ROOT, "sessions")
+# Uzaklaştırılmış grafikler için min/maks/ortalama özet seviyeleri (kova genişliği, saniye)
+OVERVIEW_LEVELS_S = (1, 10, 60, 600)
+OVERVIEW_MAX_POINTS = 2000
+INGEST_QUEUE_CAPACITY = 20000
+
+# Geç gelen paketler için yeniden sıralama tamponu: filigran gecikmesi ve azami derinlik
+REORDER_WATERMARK_MS = 100
+REORDER_CAPACITY = 4096
+
+SYNTHETIC_DEFAULT_RATE_HZ = 10.0
+SYNTHETIC_SATURATION_MV = 3300.0
+SYNTHETIC_TICK_MS = 10
+
+CAPTURE_DIRECTORY = os.path.join(APP_ROOT, "captures")
+CAPTURE_BUFFER_SIZE = 1024 * 1024
+REPLAY_MAX_SPEED = 0.0
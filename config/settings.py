@@ -36,7 +36,11 @@ class SettingsManager:
             'connection': {
                 'auto_connect': True,
                 'last_connected_sensor': None,
-                'scan_timeout': 7.0
+                'scan_timeout': 7.0,
+                'capture_raw': False,
+                'auto_reconnect': True,
+                'serial_port': None,
+                'serial_baudrate': 921600
             },
             'sampling': {
                 'rate_ms': 500,
@@ -1,48 +1,55 @@
+import os
 import queue
-from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Any
-try:
-    import numpy as np
-    NUMPY_AVAILABLE = True
-except ImportError:
-    NUMPY_AVAILABLE = False
-    np = None
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional, Any
+
+import numpy as np
 
 from config.constants import (
     SENSOR_MAPPING, LED_MAPPING, MAX_DATA_POINTS, 
-    DATA_BUFFER_SIZE, MAX_MEMORY_BUFFER_SIZE
+    MAX_MEMORY_BUFFER_SIZE,
+    SENSOR_KEYS, STORE_CRITICAL_ROWS, FRAME_CHANNEL_ORDER, STORE_SPILL_DIRECTORY,
+    OVERVIEW_MAX_POINTS, REALTIME_DISPLAY_POINTS, EXPORT_BATCH_ROWS
 )
+from data.sample_store import SampleStore, StoreSnapshot, GAP_FLAG, LOST_FLAG, MARKER_FLAGS
+from data.ingest_queue import IngestQueue
+from data.reorder_buffer import ReorderBuffer
+from data.sample_bus import SampleBus
 from utils.logger import app_logger, log_data_event
-from utils.helpers import limit_data_points, calculate_moving_average
+from utils.helpers import (
+    limit_data_points, calculate_moving_average,
+    device_namespace
+)
+from utils.sensor_sample import (
+    IngestItem, SensorSample, item_device_id, item_kind, item_timestamp, to_packet
+)
+from utils.session_clock import session_clock
+
+# Örnek kanal indeksi ve parti kolonları FRAME_CHANNEL_ORDER sırasındadır -> depo (SENSOR_KEYS) sırası
+_CHANNEL_SENSOR_KEYS = [SENSOR_MAPPING[sensor_key.lower()] for sensor_key in FRAME_CHANNEL_ORDER]
+_BATCH_COLUMNS = [_CHANNEL_SENSOR_KEYS.index(sensor_key) for sensor_key in SENSOR_KEYS]
+_CHANNEL_BITS = (1 << np.arange(len(SENSOR_KEYS))).astype(np.uint8)
+# Kendi içinde sıralı öğeler (frame partileri, kesinti/kayıp işaretleri) yeniden sıralama beklemez
+_ORDERED_KINDS = ("BATCH", "LOST", "GAP")
 
 class DataProcessor:
     """Veri işleme sınıfı"""
     
     def __init__(self):
-        # Ana veri depoları
-        self.measurements = {
-            'UV_360nm': [],
-            'Blue_450nm': [],
-            'IR_850nm': [],
-            'IR_940nm': [],
-            'timestamps': []
-        }
+        # Oturum dizini - eski chunk'lar cihaz başına alt dizine taşınır (RAM'de sıcak pencere kalır)
+        self.session_directory = os.path.join(
+            STORE_SPILL_DIRECTORY,
+            f"session_{datetime.now().strftime('%d-%m-%Y_%H.%M.%S')}_{os.getpid()}"
+        )
         
-        self.raw_data = {
-            'UV_360nm': [],
-            'Blue_450nm': [],
-            'IR_850nm': [],
-            'IR_940nm': [],
-            'timestamps': []
-        }
+        # Ana veri deposu - measurements/raw_data/calibrated_data bu depodan okunur
+        self.store = self._new_store("primary")
         
-        self.calibrated_data = {
-            'UV_360nm': [],
-            'Blue_450nm': [],
-            'IR_850nm': [],
-            'IR_940nm': [],
-            'timestamps': []
-        }
+        # Tek veri alım yolu: BLE thread'i kuyruğa yazar, GUI thread'i boşaltır
+        self.ingest_queue = IngestQueue()
+        
+        # Paneller getter'ları yoklamak yerine işlenen satırlara abone olur
+        self.sample_bus = SampleBus(SENSOR_KEYS)
         
         # Custom data depoları
         self.custom_data = {
@@ -58,9 +65,7 @@ class DataProcessor:
             'timestamps': []
         }
         
-        # Zamanlama kontrolü
-        self.last_output_time = datetime.now()
-        self.last_display_time = datetime.now()  # Display için ayrı zaman
+        # Zamanlama kontrolü cihaz durumlarında tutulur (last_output_time / last_display_time)
         # Sampling rate kaldırıldı - tüm veriler direkt işlenir
         
         # Sistem durumu
@@ -70,43 +75,95 @@ class DataProcessor:
         # Kalibrasyon fonksiyonları (dışarıdan set edilecek)
         self.calibration_functions = {}
         
+        # Formül motoru (dışarıdan set edilecek) - birincil cihaz satırları depoya yazılırken hesaplanır
+        self.formula_engine = None
+        
         self.last_sensor_values = {
             'UV_360nm': 0.0,
             'Blue_450nm': 0.0,
             'IR_850nm': 0.0,
             'IR_940nm': 0.0
         }
+        
+        # Cihaz bazlı kanal alanları - ilk görülen cihaz birincil cihazdır ve
+        # store / data_buffer / last_sensor_values onun durumunu gösterir
+        self.primary_device_id: Optional[str] = None
+        self._primary_state = self._new_device_state(
+            self.store, self.data_buffer, self.last_sensor_values
+        )
+        self.devices: Dict[str, Dict[str, Any]] = {}
+    
+    def _new_store(self, name: str) -> SampleStore:
+        """Oturum dizinine taşıma yapan cihaz deposu oluştur"""
+        return SampleStore(SENSOR_KEYS, spill_directory=os.path.join(self.session_directory, name))
+    
+    def _new_device_state(self, store: Optional[SampleStore] = None,
+                          data_buffer: Optional[Dict[str, List]] = None,
+                          last_sensor_values: Optional[Dict[str, float]] = None) -> Dict[str, Any]:
+        """Bir cihazın depo, buffer ve son değer durumunu oluştur"""
+        now = session_clock.now_ns()
+        return {
+            'store': store if store is not None else SampleStore(SENSOR_KEYS),
+            'data_buffer': data_buffer if data_buffer is not None else
+                {sensor_key: [] for sensor_key in SENSOR_KEYS + ['timestamps']},
+            'last_sensor_values': last_sensor_values if last_sensor_values is not None else
+                {sensor_key: 0.0 for sensor_key in SENSOR_KEYS},
+            'last_output_time': now,
+            'last_display_time': now,
+            'device_id': None,
+            # Geç gelen paketler filigran geçene kadar bekletilip sırayla işlenir
+            'reorder': ReorderBuffer()
+        }
+    
+    def _device_state(self, device_id: Optional[str]) -> Dict[str, Any]:
+        """Paketin cihazına ait durumu al - yeni cihaz için kanal alanı aç"""
+        if device_id is None or device_id == self.primary_device_id:
+            return self._primary_state
+        
+        state = self.devices.get(device_id)
+        if state is None:
+            if self.primary_device_id is None:
+                self.primary_device_id = device_id
+                state = self._primary_state
+            else:
+                state = self._new_device_state(self._new_store(device_namespace(device_id)))
+                self._apply_store_calibration(state['store'])
+            state['device_id'] = device_id
+            self.devices[device_id] = state
+            app_logger.info(f"Cihaz kanal alanı açıldı: {device_id} ({device_namespace(device_id)}_*)")
+        return state
+    
+    def _get_store(self, device_id: Optional[str] = None) -> SampleStore:
+        """Cihazın deposunu al (None -> birincil cihaz)"""
+        if device_id is None or device_id == self.primary_device_id:
+            return self.store
+        state = self.devices.get(device_id)
+        return state['store'] if state else SampleStore(SENSOR_KEYS)
     
     def _cleanup_synchronized_buffers(self):
-        """VERİ TEMİZLEME TAMAMEN DEVRE DIŞI - TÜM VERİLER KORUNUYOR"""
+        """Kritik bellek durumunda en eski chunk'ları at (kolonlar her zaman senkron)
+        
+        Depo diske taşıyabildiği sürece RAM sıcak pencereyle sınırlıdır ve hiçbir veri atılmaz;
+        temizleme yalnızca disk kullanılamadığında son çaredir.
+        """
         try:
-            if 'timestamps' not in self.measurements:
+            current_length = len(self.store)
+            
+            if self.store.spill_enabled:
+                app_logger.debug(f"TÜM VERİLER KORUNUYOR: {current_length} veri noktası, "
+                                 f"{self.store.spilled_rows()} diskte")
                 return
-                
-            current_length = len(self.measurements['timestamps'])
             
             # SADECE KRİTİK BELLEK DURUMU - 24 saat veri (86400 veri noktası)
-            critical_limit = 86400  # 24 saat * 60 dakika * 60 saniye / 1 saniye
+            critical_limit = STORE_CRITICAL_ROWS
             
-            # SADECE gerçekten kritik durumlarda minimal temizleme
             if current_length > critical_limit:
                 # MINIMAL temizleme - sadece %5 sil (%95 koru)
-                keep_size = int(critical_limit * 0.95)  # 82080 veri noktası koru
+                keep_size = int(critical_limit * 0.95)
                 app_logger.error(f"KRİTİK BELLEK DURUMU - Minimal temizleme: {current_length} -> {keep_size} veri noktası")
                 
-                # Tüm buffer'ları senkronize şekilde temizle
-                for key in ['UV_360nm', 'Blue_450nm', 'IR_850nm', 'IR_940nm', 'timestamps']:
-                    if key in self.measurements and len(self.measurements[key]) > keep_size:
-                        # Son N veriyi tut - veri sıralaması korunur
-                        self.measurements[key] = self.measurements[key][-keep_size:]
-                
-                # Temizlik sonrası senkronizasyon kontrolü
-                self._verify_buffer_synchronization()
-                
-                # Garbage collection
-                import gc
-                gc.collect()
-                app_logger.error(f"KRİTİK temizleme tamamlandı: {current_length - keep_size} veri noktası silindi")
+                dropped = self.store.discard_oldest(keep_size)
+                app_logger.error(f"KRİTİK temizleme tamamlandı: {dropped} veri noktası silindi")
             else:
                 # NORMAL DURUM - HİÇBİR VERİ SİLİNMİYOR
                 app_logger.debug(f"TÜM VERİLER KORUNUYOR: {current_length}/{critical_limit} veri noktası (VERİ TEMİZLEME DEVRE DIŞI)")
@@ -114,156 +171,255 @@ class DataProcessor:
         except Exception as e:
             app_logger.error(f"Buffer kontrol hatası: {e}")
     
-    def _verify_buffer_synchronization(self):
-        """Buffer senkronizasyonunu doğrula"""
-        try:
-            lengths = {}
-            for key in ['UV_360nm', 'Blue_450nm', 'IR_850nm', 'IR_940nm', 'timestamps']:
-                if key in self.measurements:
-                    lengths[key] = len(self.measurements[key])
-            
-            # Tüm uzunluklar aynı mı?
-            unique_lengths = set(lengths.values())
-            if len(unique_lengths) > 1:
-                app_logger.warning(f"Buffer senkronizasyon hatası: {lengths}")
-                # En kısa uzunluğa göre düzelt
-                min_length = min(lengths.values())
-                for key in lengths.keys():
-                    if key in self.measurements:
-                        self.measurements[key] = self.measurements[key][-min_length:]
-                app_logger.info(f"Buffer senkronizasyonu düzeltildi: {min_length} veri noktası")
-            else:
-                app_logger.debug(f"Buffer senkronizasyonu OK: {list(unique_lengths)[0]} veri noktası")
-                
-        except Exception as e:
-            app_logger.error(f"Buffer senkronizasyon doğrulama hatası: {e}")
-    
     def set_calibration_functions(self, calibration_functions: Dict[str, Dict[str, Any]]):
-        """Kalibrasyon fonksiyonlarını ayarla"""
+        """Kalibrasyon fonksiyonlarını ayarla - kayıtlı geçmiş yeni katsayılarla tembel yeniden kalibre edilir"""
         self.calibration_functions = calibration_functions
+        for state in self._all_device_states():
+            self._apply_store_calibration(state['store'])
+    
+    def _apply_store_calibration(self, store: SampleStore):
+        """Kalibrasyon fonksiyonlarını depo katsayılarına çevir (SENSOR_KEYS sırası)"""
+        slopes, intercepts, calibrated_mask = [], [], []
+        for sensor_key in store.channels:
+            cal_func = self.calibration_functions.get(sensor_key)
+            calibrated_mask.append(cal_func is not None)
+            slopes.append(cal_func.get('slope', 1.0) if cal_func is not None else 1.0)
+            intercepts.append(cal_func.get('intercept', 0.0) if cal_func is not None else 0.0)
+        store.set_calibration(slopes, intercepts, calibrated_mask)
     
     # set_sampling_rate fonksiyonu kaldırıldı - tüm veriler direkt işlenir
     
     def set_system_state(self, running: bool):
         """Sistem durumunu ayarla"""
+        # Bekleyen paketler geldikleri moddaki gibi işlenir
+        self.flush_reorder_buffers()
+        
         self.system_running = running
         self.system_stopped = not running
         
         if running:
             # Sistem başladığında buffer'ları temizle
             self.clear_buffers()
-            self.last_output_time = datetime.now()
-            self.last_display_time = datetime.now()
+            for state in self._all_device_states():
+                state['last_output_time'] = session_clock.now_ns()
+                state['last_display_time'] = session_clock.now_ns()
             app_logger.info("Sistem başlatıldı - veri işleme aktif")
         else:
             app_logger.info("Sistem durduruldu - veri işleme pasif")
     
-    def process_incoming_data(self, data_packet: Dict[str, Any]) -> bool:
-        """Gelen veri paketini işle"""
+    def drain_ingest_queue(self, max_items: Optional[int] = None) -> int:
+        """Alım kuyruğunu boşalt ve her paketi tam olarak bir kez işle"""
+        packets = self.ingest_queue.drain(max_items)
+        for data_packet in packets:
+            self.process_incoming_data(data_packet)
+        
+        # Akış durduysa da filigranı geçen paketler bekletilmez
+        now = session_clock.now_ns()
+        for state in self._all_device_states():
+            self._release_ready(state, now)
+        
+        self.sample_bus.flush()
+        return len(packets)
+    
+    def flush_reorder_buffers(self):
+        """Yeniden sıralama tamponlarındaki tüm paketleri hemen işle"""
+        for state in self._all_device_states():
+            for data_packet in state['reorder'].flush():
+                self._dispatch_packet(data_packet, state)
+    
+    def get_ingest_stats(self) -> Dict[str, Any]:
+        """Alım kuyruğu istatistiklerini ve cihaz bazlı yeniden sıralama istatistiklerini al"""
+        stats = self.ingest_queue.get_stats()
+        stats['reorder'] = {state['device_id'] or "primary": state['reorder'].get_stats()
+                            for state in self._all_device_states()}
+        return stats
+    
+    def process_incoming_data(self, data_packet: IngestItem) -> bool:
+        """Gelen öğeyi (örnek, döngü veya dict paket) yeniden sıralama tamponundan geçirerek işle"""
         try:
-            current_time = data_packet.get('timestamp', datetime.now())
+            device_id = item_device_id(data_packet)
+            state = self._device_state(device_id)
+            
+            if isinstance(data_packet, dict) and not data_packet.get('timestamp'):
+                data_packet['timestamp'] = session_clock.now_ns()
+            
+            # Sıra numaralı partiler ve işaretler zaten sıralıdır - tampon boşsa filigran beklenmez
+            timestamp = item_timestamp(data_packet)
+            if item_kind(data_packet) in _ORDERED_KINDS and state['reorder'].bypass(timestamp):
+                return self._dispatch_packet(data_packet, state)
+            
+            if not state['reorder'].push(timestamp, data_packet):
+                # Filigrandan sonra gelen paket zaman eksenini bozmamak için atılır
+                app_logger.debug(f"Geç gelen paket atıldı: {device_id}")
+                return False
+            
+            self._release_ready(state)
+            return True
             
+        except Exception as e:
+            app_logger.error(f"Veri işleme hatası: {e}")
+            return False
+    
+    def process_batch(self, timestamps: np.ndarray, values: np.ndarray,
+                      device_id: Optional[str] = None, sequence: Optional[int] = None) -> bool:
+        """Dizi tabanlı örnek partisini işle
+
+        timestamps: (n,) int64 monotonik ns, values: (n, 4) mV - FRAME_CHANNEL_ORDER sırasıyla.
+        Parti yeniden sıralama tamponundan tek öğe olarak geçer; kalibrasyon, depo yazımı
+        ve veri yolu yayını satır döngüsü olmadan tek vektörel geçişte yapılır.
+        """
+        timestamps = np.asarray(timestamps, dtype=np.int64)
+        if not len(timestamps):
+            return False
+        return self.process_incoming_data({
+            'timestamp': int(timestamps[0]),
+            'sensor_key': "BATCH",
+            'sequence': sequence,
+            'device_id': device_id,
+            'timestamps': timestamps,
+            'values': values
+        })
+
+    def _release_ready(self, state: Dict[str, Any], now: Optional[int] = None):
+        """Filigranı geçen paketleri zaman sırasıyla işle"""
+        for data_packet in state['reorder'].pop_ready(session_clock.now_ns() if now is None else now):
+            self._dispatch_packet(data_packet, state)
+    
+    def _dispatch_packet(self, data_packet: IngestItem, state: Dict[str, Any]) -> bool:
+        """Sıralanmış paketi türüne ve sistem durumuna göre işle"""
+        try:
+            # Bağlantı kesintisi / kayıp örnek işaretleri
+            sensor_key = item_kind(data_packet)
+            if sensor_key == "GAP":
+                return self._process_marker(data_packet, state, GAP_FLAG)
+            if sensor_key == "LOST":
+                return self._process_marker(data_packet, state, LOST_FLAG)
+            if sensor_key == "BATCH":
+                return self._process_batch_rows(data_packet, state)
+
             # Sistem durumuna göre işlem yap
             if not self.system_running and self.system_stopped:
                 # Sadece real-time display için işle
-                return self._process_realtime_display_only(data_packet)
+                return self._process_realtime_display_only(data_packet, state)
             else:
                 # Tam veri işleme
-                return self._process_full_data(data_packet)
+                return self._process_full_data(data_packet, state)
                 
         except Exception as e:
             app_logger.error(f"Veri işleme hatası: {e}")
             return False
     
-    def _process_realtime_display_only(self, data_packet: Dict[str, Any]) -> bool:
+    def _process_realtime_display_only(self, data_packet: IngestItem,
+                                       state: Optional[Dict[str, Any]] = None) -> bool:
         """Real-time display için veri işle (tüm veriler direkt işlenir)"""
         try:
-            current_time = data_packet.get('timestamp', datetime.now())
+            state = state or self._primary_state
+            last_sensor_values = state['last_sensor_values']
+            current_time = item_timestamp(data_packet)
             
-            # Zaman sıralama kontrolü - geriye gitmeyi önle
-            if hasattr(self, 'last_display_time') and current_time < self.last_display_time:
-                # Geriye giden zaman durumunda, son zamandan 1ms sonra ayarla
-                current_time = self.last_display_time + timedelta(milliseconds=1)
-                app_logger.warning(f"Zaman sıralama düzeltildi: {current_time}")
+            raw_row = [0.0] * len(SENSOR_KEYS)
+            flags = 0
             
             # Önce gelen veriyi son değerlere kaydet
-            for pi_sensor, gui_sensor in SENSOR_MAPPING.items():
-                if pi_sensor in data_packet and data_packet[pi_sensor] > 0:
-                    raw_value = data_packet[pi_sensor]
-                    self.last_sensor_values[gui_sensor] = raw_value
-                    log_data_event(app_logger, f"{pi_sensor}->{gui_sensor}", raw_value, "realtime_update")
-            
+            for gui_sensor, raw_value in self._row_values(data_packet):
+                last_sensor_values[gui_sensor] = raw_value
+                channel = state['store'].channel_index[gui_sensor]
+                raw_row[channel] = raw_value
+                flags |= 1 << channel
+                log_data_event(app_logger, gui_sensor, raw_value, "realtime_update")
             
+            # Sistem dururken de canlı göstergeler veri yolundan beslenir (depoya yazılmaz)
+            if flags:
+                self._publish(state, current_time, raw_row, flags)
 
-            self.last_display_time = current_time
-            app_logger.debug(f"Display güncellendi: UV={int(self.last_sensor_values['UV_360nm']):04d}mV, "
-                           f"Blue={int(self.last_sensor_values['Blue_450nm']):04d}mV, "
-                           f"IR850={int(self.last_sensor_values['IR_850nm']):04d}mV, "
-                           f"IR940={int(self.last_sensor_values['IR_940nm']):04d}mV")
+            state['last_display_time'] = current_time
+            app_logger.debug(f"Display güncellendi: UV={int(last_sensor_values['UV_360nm']):04d}mV, "
+                           f"Blue={int(last_sensor_values['Blue_450nm']):04d}mV, "
+                           f"IR850={int(last_sensor_values['IR_850nm']):04d}mV, "
+                           f"IR940={int(last_sensor_values['IR_940nm']):04d}mV")
             return True
             
         except Exception as e:
             app_logger.error(f"Real-time display işleme hatası: {e}")
             return False
     
-    def _process_full_data(self, data_packet: Dict[str, Any]) -> bool:
+    def _process_full_data(self, data_packet: IngestItem,
+                           state: Optional[Dict[str, Any]] = None) -> bool:
         """Tam veri işleme (örnekleme ile)"""
         try:
-            current_time = data_packet.get('timestamp', datetime.now())
+            state = state or self._primary_state
+            current_time = item_timestamp(data_packet)
             
             # Gelen veriyi buffer'a ekle
-            for pi_sensor, gui_sensor in SENSOR_MAPPING.items():
-                if pi_sensor in data_packet and data_packet[pi_sensor] > 0:
-                    raw_value = data_packet[pi_sensor]
-                    self.data_buffer[gui_sensor].append(raw_value)
+            for gui_sensor, raw_value in self._row_values(data_packet):
+                state['data_buffer'][gui_sensor].append(raw_value)
             
             # Tüm veriler direkt işlenir - sampling rate kontrolü kaldırıldı
-            return self._process_averaged_data(current_time)
+            return self._process_averaged_data(current_time, state)
             
         except Exception as e:
             app_logger.error(f"Tam veri işleme hatası: {e}")
             return False
     
-    def _process_averaged_data(self, current_time: datetime) -> bool:
+    @staticmethod
+    def _row_values(data_packet: IngestItem) -> List[tuple]:
+        """Satırın ölçümü olan kanalları: (gui_sensor, mV) - dict paket veya kanal örnekleri"""
+        if isinstance(data_packet, dict):
+            return [(gui_sensor, data_packet[pi_sensor])
+                    for pi_sensor, gui_sensor in SENSOR_MAPPING.items()
+                    if pi_sensor in data_packet and data_packet[pi_sensor] > 0]
+        samples = (data_packet,) if isinstance(data_packet, SensorSample) else data_packet
+        return [(_CHANNEL_SENSOR_KEYS[sample.channel], sample.value)
+                for sample in samples if sample.value > 0]
+    
+    def _process_averaged_data(self, current_time: int,
+                               state: Optional[Dict[str, Any]] = None) -> bool:
         try:
-            if hasattr(self, 'last_output_time') and current_time < self.last_output_time:
-                current_time = self.last_output_time + timedelta(milliseconds=1)
-                app_logger.warning(f"Zaman sıralama düzeltildi (averaged): {current_time}")
+            state = state or self._primary_state
+            store = state['store']
+            data_buffer = state['data_buffer']
             
             app_logger.debug("Veri işleme tamamlandı - sampling rate kontrolü kaldırıldı")
             
+            raw_row = [0.0] * len(SENSOR_KEYS)
+            flags = 0
+            
             # Her sensör için ortalama hesapla
             for gui_sensor in SENSOR_MAPPING.values():
-                if self.data_buffer[gui_sensor]:
+                if data_buffer[gui_sensor]:
                     # Ortalama hesapla
-                    avg_raw_value = sum(self.data_buffer[gui_sensor]) / len(self.data_buffer[gui_sensor])
-                    buffer_size = len(self.data_buffer[gui_sensor])
+                    avg_raw_value = sum(data_buffer[gui_sensor]) / len(data_buffer[gui_sensor])
+                    buffer_size = len(data_buffer[gui_sensor])
                     
                     app_logger.debug(f"{gui_sensor}: {buffer_size} veri noktası ortalaması = {int(avg_raw_value):04d}mV")
                     
-                    # Ana veri depolarına ekle
-                    self.measurements[gui_sensor].append(avg_raw_value)
-                    self.raw_data[gui_sensor].append(avg_raw_value)
-                    
-                    # Kalibrasyon uygula
-                    calibrated_value = self._apply_calibration(gui_sensor, avg_raw_value)
-                    self.calibrated_data[gui_sensor].append(calibrated_value)
+                    # Satıra ekle (kalibre değer depoda ham kolondan türetilir)
+                    channel = store.channel_index[gui_sensor]
+                    raw_row[channel] = avg_raw_value
+                    flags |= 1 << channel
                     
                     # Buffer'ı temizle
-                    self.data_buffer[gui_sensor] = []
+                    data_buffer[gui_sensor] = []
                     
                     log_data_event(app_logger, gui_sensor, avg_raw_value, "averaged")
             
-            # Zaman damgası ekle
-            self.measurements['timestamps'].append(current_time)
-            self.raw_data['timestamps'].append(current_time)
-            self.calibrated_data['timestamps'].append(current_time)
+            # Hiçbir kanalda veri yoksa satır yazılmaz (depoda yalnızca ölçüm ve işaret satırları)
+            if not flags:
+                return False
+            
+            # Zaman damgası ile tek satır olarak depoya ekle
+            store.append(current_time, raw_row, flags)
+            self._publish(state, current_time, raw_row, flags)
+            if self._formulas_active(state):
+                self._record_formulas(np.array([current_time], dtype=np.int64),
+                                      store.calibrate([raw_row], [flags]))
             
             # Son çıktı zamanını güncelle
-            self.last_output_time = current_time
+            state['last_output_time'] = current_time
             
             # Veri limitini kontrol et
-            self._limit_data_points()
+            if store is self.store:
+                self._limit_data_points()
             
             return True
             
@@ -271,6 +427,124 @@ class DataProcessor:
             app_logger.error(f"Ortalama veri işleme hatası: {e}")
             return False
     
+    def _process_batch_rows(self, data_packet: Dict[str, Any], state: Dict[str, Any]) -> bool:
+        """Sıralanmış partiyi vektörel işle (paket yolundaki satır işlemenin dizi karşılığı)"""
+        try:
+            timestamps = data_packet['timestamps']
+            values = np.asarray(data_packet['values'], dtype=np.float64)[:, _BATCH_COLUMNS]
+            valid = values > 0
+            flags = valid.astype(np.uint8) @ _CHANNEL_BITS
+            raw = np.where(valid, values, 0.0)
+            last_time = int(timestamps[-1])
+
+            if not self.system_running and self.system_stopped:
+                # Sadece real-time display: son değerler güncellenir, depoya yazılmaz
+                last_sensor_values = state['last_sensor_values']
+                for channel, sensor_key in enumerate(SENSOR_KEYS):
+                    valid_rows = np.flatnonzero(valid[:, channel])
+                    if len(valid_rows):
+                        last_sensor_values[sensor_key] = float(raw[valid_rows[-1], channel])
+                self._publish_batch(state, timestamps, raw, flags)
+                state['last_display_time'] = last_time
+                return True
+
+            store = state['store']
+            store.append_batch(timestamps, raw, flags)
+            # Kalibrasyon parti başına bir kez - veri yolu ve formüller aynı matrisi kullanır
+            formulas_active = self._formulas_active(state)
+            calibrated = (store.calibrate(raw, flags)
+                          if formulas_active or self.sample_bus.is_staging else None)
+            self._publish_batch(state, timestamps, raw, flags, calibrated)
+            if formulas_active:
+                self._record_formulas(timestamps, calibrated)
+            state['last_output_time'] = last_time
+
+            if store is self.store:
+                self._limit_data_points(len(timestamps))
+
+            app_logger.debug(f"Parti işlendi: {len(timestamps)} örnek ({data_packet.get('device_id')})")
+            return True
+
+        except Exception as e:
+            app_logger.error(f"Parti işleme hatası: {e}")
+            return False
+
+    def _process_marker(self, data_packet: IngestItem, state: Dict[str, Any],
+                        marker_flag: int) -> bool:
+        """Kesinti (GAP) veya kayıp örnek (LOST) işaret satırını depoya yaz
+
+        'timestamps' taşıyan LOST paketi (kayıp frame döngüleri) tek partide maskeli satırlar olur.
+        """
+        try:
+            if marker_flag == GAP_FLAG:
+                # Kopma öncesi yarım ortalama atılır
+                for sensor_key in SENSOR_KEYS:
+                    state['data_buffer'][sensor_key] = []
+            
+            if not self.system_running:
+                return True
+            
+            timestamps = data_packet.get('timestamps') if isinstance(data_packet, dict) else None
+            if timestamps is not None and len(timestamps):
+                timestamps = np.asarray(timestamps, dtype=np.int64)
+                raw = np.zeros((len(timestamps), len(SENSOR_KEYS)))
+                flags = np.full(len(timestamps), marker_flag, dtype=np.uint8)
+                state['store'].append_batch(timestamps, raw, flags)
+                self._publish_batch(state, timestamps, raw, flags)
+                current_time = int(timestamps[-1])
+            else:
+                current_time = item_timestamp(data_packet)
+                state['store'].append_marker(current_time, marker_flag)
+                self._publish(state, current_time, [0.0] * len(SENSOR_KEYS), marker_flag)
+            state['last_output_time'] = current_time
+            if marker_flag == GAP_FLAG:
+                app_logger.info(f"Bağlantı kesintisi işaretlendi: {item_device_id(data_packet)}")
+            return True
+            
+        except Exception as e:
+            app_logger.error(f"Kesinti işaretleme hatası: {e}")
+            return False
+    
+    def _publish(self, state: Dict[str, Any], timestamp: int, raw_row: List[float], flags: int):
+        """Satırı veri yoluna yayınla (aktif abone yoksa maliyetsiz - kalibrasyon da yapılmaz)"""
+        if not self.sample_bus.is_staging:
+            return
+        calibrated_row = [
+            self._apply_calibration(sensor_key, raw_row[channel]) if (flags >> channel) & 1
+            else float('nan')
+            for channel, sensor_key in enumerate(SENSOR_KEYS)
+        ]
+        self.sample_bus.publish(state['device_id'], state is self._primary_state,
+                                timestamp, raw_row, calibrated_row, flags)
+    
+    def _publish_batch(self, state: Dict[str, Any], timestamps: np.ndarray, raw: np.ndarray,
+                       flags: np.ndarray, calibrated: Optional[np.ndarray] = None):
+        """Partiyi veri yoluna tek blok olarak yayınla"""
+        if not self.sample_bus.is_staging:
+            return
+        if calibrated is None:
+            calibrated = state['store'].calibrate(raw, flags)
+        self.sample_bus.publish_batch(state['device_id'], state is self._primary_state,
+                                      timestamps, raw, calibrated, flags)
+    
+    def set_formula_engine(self, formula_engine):
+        """Ingest sırasında hesaplanacak formül motorunu ayarla"""
+        self.formula_engine = formula_engine
+    
+    def _formulas_active(self, state: Dict[str, Any]) -> bool:
+        """Custom data depo satırlarıyla hizalıdır - yalnızca birincil cihaz için hesaplanır"""
+        return (state is self._primary_state and self.formula_engine is not None
+                and bool(self.formula_engine.formulas))
+    
+    def _record_formulas(self, timestamps: np.ndarray, calibrated: np.ndarray):
+        """Formülleri kalibre matris üzerinde tek geçişte hesapla ve custom data'ya ekle"""
+        try:
+            sensor_data = {sensor_key: calibrated[:, channel].astype(np.float64)
+                           for channel, sensor_key in enumerate(SENSOR_KEYS)}
+            self.add_custom_batch(timestamps, self.formula_engine.calculate_batch(sensor_data))
+        except Exception as e:
+            app_logger.error(f"Formül hesaplama hatası: {e}")
+    
     def _apply_calibration(self, sensor_key: str, raw_value: float) -> float:
         """Kalibrasyon uygula"""
         if (sensor_key in self.calibration_functions and 
@@ -285,196 +559,267 @@ class DataProcessor:
         else:
             return raw_value  # Kalibrasyon yoksa ham değeri döndür
     
-    def _limit_data_points(self):
+    def _limit_data_points(self, added: int = 1):
         """VERİ NOKTALARI SINIRLANDIRMAsI TAMAMEN DEVRE DIŞI - TÜM VERİLER KORUNUYOR"""
         
         # VERİ TEMİZLEME TAMAMEN DEVRE DIŞI - EXPORT İÇİN TÜM VERİLER SAKLANACAK
-        app_logger.debug("Veri sınırlandırma DEVRE DIŞI - tüm veriler export için korunuyor")
-        
-        # Sadece istatistiksel bilgi için veri sayılarını logla
-        for data_store_name, data_store in [("measurements", self.measurements), 
-                                           ("raw_data", self.raw_data), 
-                                           ("calibrated_data", self.calibrated_data)]:
-            for key, data_list in data_store.items():
-                if isinstance(data_list, list) and len(data_list) > 0:
-                    if len(data_list) % 1000 == 0:  # Her 1000 veri noktasında bir logla
-                        app_logger.info(f"VERİ İSTATİSTİĞİ: {data_store_name}.{key} = {len(data_list)} veri noktası (KORUNUYOR)")
-        
-        # Buffer temizleme de DEVRE DIŞI
-        # self._cleanup_data_buffers()  # DEVRE DIŞI
-    
-    def _cleanup_data_buffers(self):
-        """Veri buffer'larını temizle"""
-        buffer_cleaned = 0
-        for sensor_key, buffer_list in self.data_buffer.items():
-            if isinstance(buffer_list, list) and len(buffer_list) > DATA_BUFFER_SIZE:
-                original_size = len(buffer_list)
-                self.data_buffer[sensor_key] = buffer_list[-DATA_BUFFER_SIZE:]
-                buffer_cleaned += original_size - DATA_BUFFER_SIZE
-        
-        if buffer_cleaned > 0:
-            app_logger.debug(f"Buffer temizleme: {buffer_cleaned} veri noktası temizlendi")
+        # Sadece istatistiksel bilgi için veri sayısını logla
+        data_count = len(self.store)
+        if data_count > 0 and data_count // 1000 != (data_count - added) // 1000:  # Her 1000 veri noktasında bir logla
+            app_logger.info(f"VERİ İSTATİSTİĞİ: {data_count} veri noktası, "
+                            f"{self.store.memory_usage() / (1024 * 1024):.1f} MB RAM, "
+                            f"{self.store.disk_usage() / (1024 * 1024):.1f} MB disk (KORUNUYOR)")
+            self._cleanup_synchronized_buffers()
+    
+    def _all_device_states(self) -> List[Dict[str, Any]]:
+        """Birincil dahil tüm cihaz durumları"""
+        states = [self._primary_state]
+        states.extend(state for state in self.devices.values() if state is not self._primary_state)
+        return states
     
     def clear_buffers(self):
         """Veri buffer'larını temizle"""
-        for sensor in self.data_buffer:
-            self.data_buffer[sensor] = []
+        for state in self._all_device_states():
+            for sensor in state['data_buffer']:
+                state['data_buffer'][sensor] = []
         app_logger.info("Veri buffer'ları temizlendi")
     
+    def close(self):
+        """Oturum dosyalarını kapat ve sil (uygulama çıkışı)"""
+        for state in self._all_device_states():
+            state['store'].close()
+        try:
+            os.rmdir(self.session_directory)
+        except OSError:
+            pass
+        app_logger.info(f"Oturum depoları kapatıldı: {self.session_directory}")
+    
     def clear_all_data(self):
         """Tüm verileri temizle"""
-        for data_store in [self.measurements, self.raw_data, self.calibrated_data, self.data_buffer]:
-            for key in data_store:
-                data_store[key] = []
+        for state in self._all_device_states():
+            state['store'].clear()
+            state['reorder'].clear()
+            for key in state['data_buffer']:
+                state['data_buffer'][key] = []
+        
+        self.sample_bus.clear()
         
         # Custom data'yı da temizle
         self.clear_custom_data()
         
         app_logger.info("Tüm veriler temizlendi (custom data dahil)")
     
-    def get_measurements(self) -> Dict[str, List]:
-        """Ölçüm verilerini al"""
-        return self.measurements.copy()
-    
-    def get_raw_data(self) -> Dict[str, List]:
-        """Ham verileri al"""
-        return self.raw_data.copy()
-    
-    def get_calibrated_data(self) -> Dict[str, List]:
-        """Kalibre edilmiş verileri al"""
-        return self.calibrated_data.copy()
-    
-    def get_latest_values(self) -> Dict[str, float]:
+    def _store_to_lists(self, column: str, device_id: Optional[str] = None,
+                        last_rows: Optional[int] = REALTIME_DISPLAY_POINTS) -> Dict[str, List]:
+        """Deponun son last_rows satırını eski dict-of-lists formatına çevir (her liste timestamps uzunluğunda)
+
+        Liste/datetime dönüşümü pahalıdır; taşınmış (mmap) geçmiş dahil tüm oturumu
+        çevirmemek için varsayılan pencere grafik penceresi kadardır. None tüm depo demektir.
+        """
+        snapshot = self.get_snapshot(device_id, last_rows)
+        # Geçersiz kanal, kesinti ve kayıp satırları NaN olur - değerler zamanlarıyla hizalı kalır,
+        # grafik çizgisi boşluğun üzerinden birleşmez
+        data = getattr(snapshot, column)
+        result = {}
+        for channel, sensor_key in enumerate(snapshot.channels):
+            values = data[:, channel].astype(np.float64)
+            values[~snapshot.valid(channel)] = np.nan
+            result[sensor_key] = values.tolist()
+        result['timestamps'] = session_clock.to_datetimes(snapshot.timestamps)
+        return result
+    
+    def get_snapshot(self, device_id: Optional[str] = None,
+                     last_rows: Optional[int] = None) -> StoreSnapshot:
+        """Deponun (son last_rows satırının) salt okunur görünümü - generation değişmediyse veri de aynıdır"""
+        return self._get_store(device_id).snapshot(-last_rows if last_rows else None)
+    
+    def get_data_generation(self, device_id: Optional[str] = None) -> int:
+        """Depo nesil numarası (her yazma/silmede artar)"""
+        return self._get_store(device_id).generation
+    
+    def _valid_channel_values(self, sensor_key: str, start: Optional[int] = None) -> 'np.ndarray':
+        """Bir kanalın geçerli ham değerlerini dizi olarak al"""
+        channel = self.store.channel_index[sensor_key]
+        raw = self.store.column('raw', start)
+        flags = self.store.column('flags', start)
+        return raw[((flags >> channel) & 1).astype(bool), channel]
+    
+    def get_measurements(self, device_id: Optional[str] = None,
+                         last_rows: Optional[int] = REALTIME_DISPLAY_POINTS) -> Dict[str, List]:
+        """Ölçüm verilerini al (son last_rows satır)"""
+        return self._store_to_lists('raw', device_id, last_rows)
+    
+    def get_raw_data(self, device_id: Optional[str] = None,
+                     last_rows: Optional[int] = REALTIME_DISPLAY_POINTS) -> Dict[str, List]:
+        """Ham verileri al (son last_rows satır)"""
+        return self._store_to_lists('raw', device_id, last_rows)
+    
+    def get_calibrated_data(self, device_id: Optional[str] = None,
+                            last_rows: Optional[int] = REALTIME_DISPLAY_POINTS) -> Dict[str, List]:
+        """Kalibre edilmiş verileri al (son last_rows satır)"""
+        return self._store_to_lists('calibrated', device_id, last_rows)
+    
+    def get_latest_values(self, device_id: Optional[str] = None) -> Dict[str, float]:
         """En son değerleri al (tüm sensörler için)"""
+        if device_id is None or device_id == self.primary_device_id:
+            state = self._primary_state
+        elif device_id in self.devices:
+            state = self.devices[device_id]
+        else:
+            return {sensor_key: 0.0 for sensor_key in SENSOR_KEYS}
+        store = state['store']
+        
         # Önce son sensör değerlerini döndür (daha güncel)
-        latest_values = self.last_sensor_values.copy()
+        latest_values = state['last_sensor_values'].copy()
         
-        # Eğer measurements'ta daha yeni veri varsa onu kullan
-        for sensor_key in ['UV_360nm', 'Blue_450nm', 'IR_850nm', 'IR_940nm']:
-            if sensor_key in self.measurements and self.measurements[sensor_key]:
-                measurement_value = self.measurements[sensor_key][-1]
-                # Son ölçüm değeri varsa onu kullan
-                if measurement_value > 0:
-                    latest_values[sensor_key] = measurement_value
+        # Eğer depoda daha yeni veri varsa onu kullan (O(1))
+        latest_raw = store.latest_raw()
+        for channel, sensor_key in enumerate(store.channels):
+            measurement_value = float(latest_raw[channel])
+            # Son ölçüm değeri varsa onu kullan
+            if measurement_value > 0:
+                latest_values[sensor_key] = measurement_value
         
         return latest_values
     
     def get_latest_calibrated_values(self) -> Dict[str, float]:
         """En son kalibre edilmiş değerleri al - sadece kalibre edilmiş sensörler için"""
         latest_values = {}
+        latest_calibrated = self.store.latest_calibrated()
         
-        for sensor_key in ['UV_360nm', 'Blue_450nm', 'IR_850nm', 'IR_940nm']:
-            # Sadece kalibrasyon fonksiyonu olan ve calibrated_data'sı bulunan sensörler
+        for channel, sensor_key in enumerate(self.store.channels):
+            # Sadece kalibrasyon fonksiyonu olan ve kalibre değeri bulunan sensörler
             if (sensor_key in self.calibration_functions and 
                 self.calibration_functions[sensor_key] is not None and
-                sensor_key in self.calibrated_data and 
-                self.calibrated_data[sensor_key]):
-                latest_values[sensor_key] = self.calibrated_data[sensor_key][-1]
+                not np.isnan(latest_calibrated[channel])):
+                latest_values[sensor_key] = float(latest_calibrated[channel])
             # Kalibre edilmemiş sensörler için değer döndürme - None veya hiç ekleme
         
         return latest_values
     
+    def _recent_channel_values(self, sensor_key: str, count: int) -> 'np.ndarray':
+        """Kanalın son `count` geçerli değerini sadece depo kuyruğunu tarayarak al"""
+        window = max(count * len(self.store.channels), 1)
+        while True:
+            values = self._valid_channel_values(sensor_key, -window)
+            if len(values) >= count or window >= len(self.store):
+                return values[-count:]
+            window *= 2
+    
     def get_spectrum_intensities(self, average_points: int = 10) -> List[float]:
         """Spektrum analizi için yoğunluk değerlerini al"""
         intensities = []
         
-        for sensor_key in ['UV_360nm', 'Blue_450nm', 'IR_850nm', 'IR_940nm']:
-            if sensor_key in self.measurements and self.measurements[sensor_key]:
-                # Son N ölçümün ortalamasını al
-                recent_data = self.measurements[sensor_key][-average_points:]
-                if NUMPY_AVAILABLE and np:
-                    intensity = np.mean(recent_data) if recent_data else 0.0
-                else:
-                    intensity = sum(recent_data) / len(recent_data) if recent_data else 0.0
-                intensities.append(intensity)
-            else:
-                intensities.append(0.0)
+        for sensor_key in self.store.channels:
+            # Son N ölçümün ortalamasını al
+            recent_data = self._recent_channel_values(sensor_key, average_points)
+            intensities.append(float(np.mean(recent_data)) if len(recent_data) else 0.0)
         
         return intensities
     
-    def get_data_statistics(self) -> Dict[str, Dict[str, float]]:
-        """Veri istatistiklerini al"""
-        stats = {}
+    def get_data_statistics(self, start_time=None, end_time=None,
+                            calibrated: bool = False) -> Dict[str, Dict[str, float]]:
+        """Veri istatistiklerini al - oturum birikimlerinden O(1), zaman penceresi için önek toplamlarından"""
+        if start_time is None and end_time is None:
+            stats = self.store.statistics(calibrated=calibrated)
+        else:
+            stats = self.store.statistics_between(
+                self._to_monotonic_ns(start_time) if start_time is not None else None,
+                self._to_monotonic_ns(end_time) if end_time is not None else None,
+                calibrated
+            )
         
-        for sensor_key in ['UV_360nm', 'Blue_450nm', 'IR_850nm', 'IR_940nm']:
-            if sensor_key in self.measurements and self.measurements[sensor_key]:
-                data = self.measurements[sensor_key]
-                if NUMPY_AVAILABLE and np:
-                    data_array = np.array(data)
-                    stats[sensor_key] = {
-                        'count': len(data),
-                        'mean': float(np.mean(data_array)),
-                        'std': float(np.std(data_array)),
-                        'min': float(np.min(data_array)),
-                        'max': float(np.max(data_array)),
-                        'latest': float(data[-1]) if len(data) > 0 else 0.0
-                    }
-                else:
-                    # NumPy olmadan basit istatistik
-                    stats[sensor_key] = {
-                        'count': len(data),
-                        'mean': sum(data) / len(data) if data else 0.0,
-                        'std': 0.0,  # Standart sapma hesabı karmaşık
-                        'min': min(data) if data else 0.0,
-                        'max': max(data) if data else 0.0,
-                        'latest': data[-1] if data else 0.0
-                    }
-            else:
-                stats[sensor_key] = {
-                    'count': 0,
-                    'mean': 0.0,
-                    'std': 0.0,
-                    'min': 0.0,
-                    'max': 0.0,
-                    'latest': 0.0
-                }
+        latest = self.store.latest_calibrated() if calibrated else self.store.latest_raw()
+        for channel, sensor_key in enumerate(self.store.channels):
+            stats[sensor_key]['latest'] = float(latest[channel]) if stats[sensor_key]['count'] else 0.0
         
         return stats
     
+    def get_export_statistics(self) -> Dict[str, Dict[str, Dict[str, float]]]:
+        """Export özeti için sensör istatistikleri (kalibre bölüm yalnızca kalibrasyonlu kanallarda)"""
+        raw_stats = self.store.statistics()
+        calibrated_stats = self.store.statistics(calibrated=True)
+        calibration_status = self.get_calibration_status()
+        
+        statistics = {}
+        for sensor_key in self.store.channels:
+            fields = ('count', 'min', 'max', 'mean')
+            statistics[sensor_key] = {
+                'raw_data': {field: raw_stats[sensor_key][field] for field in fields}
+            }
+            if calibration_status.get(sensor_key) and calibrated_stats[sensor_key]['count']:
+                statistics[sensor_key]['calibrated_data'] = {
+                    field: calibrated_stats[sensor_key][field] for field in fields
+                }
+        return statistics
+    
     def apply_smoothing(self, sensor_key: str, window_size: int = 5) -> List[float]:
         """Veri düzgünleştirme uygula"""
-        if sensor_key in self.measurements and self.measurements[sensor_key]:
-            return calculate_moving_average(self.measurements[sensor_key], window_size)
+        if sensor_key in self.store.channel_index:
+            return calculate_moving_average(self._valid_channel_values(sensor_key).tolist(), window_size)
         else:
             return []
     
-    def get_data_in_time_range(self, start_time: datetime, end_time: datetime) -> Dict[str, List]:
+    @staticmethod
+    def _to_monotonic_ns(timestamp) -> int:
+        """datetime veya monotonik int ns -> monotonik int ns"""
+        if isinstance(timestamp, datetime):
+            return session_clock.from_datetime(timestamp)
+        return int(timestamp)
+    
+    def get_timestamps_ns(self, device_id: Optional[str] = None) -> 'np.ndarray':
+        """Ham int64 monotonik ns zaman damgaları (dönüşümsüz)"""
+        return self._get_store(device_id).column('timestamps')
+    
+    def get_overview(self, start_time=None, end_time=None,
+                     max_points: int = OVERVIEW_MAX_POINTS,
+                     device_id: Optional[str] = None,
+                     calibrated: bool = False) -> Dict[str, Any]:
+        """Zaman aralığının min/maks/ortalama özeti - maliyet oturum uzunluğundan bağımsız
+        
+        Kolonlar SENSOR_KEYS sırasındadır; 'timestamps' kova başlangıcı (monotonik ns),
+        'level_s' seçilen kova genişliğidir (0 -> satırların kendisi); 'gap' kesinti/kayıp
+        işareti içeren kovalardır (değerleri NaN).
+        """
+        start_ns = self._to_monotonic_ns(start_time) if start_time is not None else None
+        end_ns = self._to_monotonic_ns(end_time) if end_time is not None else None
+        return self._get_store(device_id).get_overview(start_ns, end_ns, max_points, calibrated)
+    
+    def get_data_in_time_range(self, start_time, end_time) -> Dict[str, List]:
         """Belirtilen zaman aralığındaki verileri al"""
-        if not self.measurements['timestamps']:
+        if not len(self.store):
             return {}
         
-        # Zaman aralığındaki indeksleri bul
-        filtered_indices = []
-        for i, timestamp in enumerate(self.measurements['timestamps']):
-            if start_time <= timestamp <= end_time:
-                filtered_indices.append(i)
-        
-        if not filtered_indices:
+        # Zaman indeksinde ikili arama - yalnızca aralıktaki satırlar okunur
+        start_ns = self._to_monotonic_ns(start_time)
+        end_ns = self._to_monotonic_ns(end_time)
+        start, stop = self.store.time_range(start_ns, end_ns)
+        if start == stop:
             return {}
         
+        data = self.store.snapshot(start, stop)
+        in_range = (data.timestamps >= start_ns) & (data.timestamps <= end_ns)
+        
         # Filtrelenmiş verileri oluştur
         filtered_data = {}
-        
-        for key in self.measurements:
-            if key == 'timestamps':
-                filtered_data[key] = [self.measurements[key][i] for i in filtered_indices]
-            else:
-                filtered_data[key] = [self.measurements[key][i] for i in filtered_indices 
-                                    if i < len(self.measurements[key])]
+        for channel, sensor_key in enumerate(self.store.channels):
+            valid = in_range & data.valid(channel)
+            filtered_data[sensor_key] = data.raw[valid, channel].tolist()
+        filtered_data['timestamps'] = session_clock.to_datetimes(data.timestamps[in_range])
         
         return filtered_data
     
-    def get_active_sensors_from_data(self, data_packet: Dict[str, Any]) -> List[str]:
+    def get_active_sensors_from_data(self, data_packet: IngestItem) -> List[str]:
         """Veri paketinden aktif sensörleri belirle"""
         active_sensors = []
         
-        for pi_sensor, value in data_packet.items():
-            if pi_sensor.startswith('sensor_') and value > 0:
+        for pi_sensor, value in to_packet(data_packet).items():
+            if pi_sensor in SENSOR_MAPPING and value > 0:
                 active_sensors.append(pi_sensor)
         
         return active_sensors
     
-    def get_led_status_from_data(self, data_packet: Dict[str, Any]) -> Dict[str, bool]:
+    def get_led_status_from_data(self, data_packet: IngestItem) -> Dict[str, bool]:
         """Veri paketinden LED durumlarını belirle"""
         led_status = {}
         active_sensors = self.get_active_sensors_from_data(data_packet)
@@ -493,57 +838,99 @@ class DataProcessor:
     
     def has_data(self) -> bool:
         """Veri var mı?"""
-        return len(self.measurements['timestamps']) > 0
+        return len(self.store) > 0
     
-    def get_data_count(self) -> int:
+    def get_data_count(self, device_id: Optional[str] = None) -> int:
         """Toplam veri sayısını al"""
-        return len(self.measurements['timestamps'])
+        return len(self._get_store(device_id))
+    
+    def get_device_ids(self) -> List[str]:
+        """Veri gelen cihazların kimlikleri (ilk eleman birincil cihaz)"""
+        return list(self.devices.keys())
+    
+    def get_device_latest_values(self) -> Dict[str, Dict[str, float]]:
+        """Cihaz bazlı en son değerler"""
+        return {device_id: self.get_latest_values(device_id) for device_id in self.devices}
+    
+    def get_formula_sensor_data(self) -> Dict[str, float]:
+        """Formül motoru için değerler: birincil cihaz kanalları + cihaz önekli kanallar (d2_UV_360nm)"""
+        sensor_data = self.get_latest_values()
+        for device_id, latest_values in self.get_device_latest_values().items():
+            namespace = device_namespace(device_id)
+            for sensor_key, value in latest_values.items():
+                sensor_data[f"{namespace}_{sensor_key}"] = value
+        return sensor_data
     
     def get_buffer_status(self) -> Dict[str, int]:
         """Buffer durumunu al"""
         return {sensor: len(data_list) for sensor, data_list in self.data_buffer.items()}
     
-    def export_data_for_csv(self) -> List[Dict[str, Any]]:
-        """CSV export için veri hazırla"""
-        export_data = []
-        
-        if not self.measurements['timestamps']:
-            return export_data
-        
-        for i in range(len(self.measurements['timestamps'])):
-            row = {
-                'timestamp': self.measurements['timestamps'][i],
-                'raw_data': {},
-                'calibrated_data': {},
-                'custom_data': {}
-            }
+    def get_custom_formula_names(self) -> List[str]:
+        """Custom data formül adları (CSV başlığı için)"""
+        return [formula_name for formula_name in self.custom_data if formula_name != 'timestamps']
+    
+    def iter_export_batches(self, batch_rows: int = EXPORT_BATCH_ROWS) -> Iterator[List[Dict[str, Any]]]:
+        """CSV export satırlarını depodan batch_rows'luk partiler halinde üret
+
+        Her parti yalnızca kendi aralığını okur; taşınmış geçmiş dahil uzun oturumlar
+        dışa aktarılırken bellekte aynı anda tek parti bulunur.
+        """
+        calibrated_channels = [
+            sensor_key in self.calibration_functions and
+            self.calibration_functions[sensor_key] is not None
+            for sensor_key in self.store.channels
+        ]
+        custom_columns = [(formula_name, values) for formula_name, values in self.custom_data.items()
+                          if formula_name != 'timestamps']
+        
+        total = len(self.store)
+        for batch_start in range(0, total, max(1, int(batch_rows))):
+            data = self.store.slice(batch_start, min(total, batch_start + batch_rows))
+            timestamps = session_clock.to_datetimes(data['timestamps'])
+            raw_rows = data['raw'].tolist()
+            calibrated_rows = data['calibrated'].tolist()
+            flags = data['flags'].tolist()
+            batch = []
             
-            # Ham veri
-            for sensor_key in ['UV_360nm', 'Blue_450nm', 'IR_850nm', 'IR_940nm']:
-                if i < len(self.raw_data[sensor_key]):
-                    row['raw_data'][sensor_key] = self.raw_data[sensor_key][i]
-                else:
-                    row['raw_data'][sensor_key] = 0.0
+            for i, timestamp in enumerate(timestamps):
+                row = {
+                    'timestamp': timestamp,
+                    'raw_data': {},
+                    'calibrated_data': {},
+                    'custom_data': {}
+                }
                 
-                # Kalibre edilmiş veri (sadece kalibrasyon varsa)
-                if (sensor_key in self.calibration_functions and 
-                    self.calibration_functions[sensor_key] is not None and
-                    i < len(self.calibrated_data[sensor_key])):
-                    row['calibrated_data'][sensor_key] = self.calibrated_data[sensor_key][i]
-                else:
-                    row['calibrated_data'][sensor_key] = None
-            
-            # Custom data ekle - ana measurements ile senkronize et
-            for formula_name, values in self.custom_data.items():
-                if formula_name != 'timestamps':
-                    if i < len(values):
-                        row['custom_data'][formula_name] = values[i]
+                if flags[i] & MARKER_FLAGS:
+                    row['gap' if flags[i] & GAP_FLAG else 'lost'] = True
+                    batch.append(row)
+                    continue
+                
+                for channel, sensor_key in enumerate(self.store.channels):
+                    valid = (flags[i] >> channel) & 1
+                    # Ham veri
+                    row['raw_data'][sensor_key] = float(raw_rows[i][channel]) if valid else 0.0
+                    
+                    # Kalibre edilmiş veri (sadece kalibrasyon varsa)
+                    if calibrated_channels[channel] and valid:
+                        row['calibrated_data'][sensor_key] = calibrated_rows[i][channel]
                     else:
-                        # Eğer custom data bu index'te yoksa None ekle
-                        row['custom_data'][formula_name] = None
+                        row['calibrated_data'][sensor_key] = None
+                
+                # Custom data ekle - ana measurements ile senkronize et (depo satır indeksiyle)
+                index = batch_start + i
+                for formula_name, values in custom_columns:
+                    # Eğer custom data bu index'te yoksa None eklenir
+                    row['custom_data'][formula_name] = values[index] if index < len(values) else None
+                
+                batch.append(row)
             
-            export_data.append(row)
-        
+            yield batch
+    
+    def export_data_for_csv(self) -> List[Dict[str, Any]]:
+        """CSV export için veri hazırla (tüm satırlar tek listede - büyük oturumlarda iter_export_batches)"""
+        export_data = []
+        for batch in self.iter_export_batches():
+            export_data.extend(batch)
         return export_data
     
     def get_calibration_status(self) -> Dict[str, bool]:
@@ -556,11 +943,13 @@ class DataProcessor:
         
         return status
     
-    def add_custom_data(self, custom_values: Dict[str, float], timestamp: datetime = None):
-        """Custom data ekle"""
+    def add_custom_data(self, custom_values: Dict[str, float], timestamp: Optional[int] = None):
+        """Custom data ekle (zaman damgası örneklerle aynı saatte, monotonik int ns)"""
         try:
             if timestamp is None:
-                timestamp = datetime.now()
+                timestamp = session_clock.now_ns()
+            else:
+                timestamp = self._to_monotonic_ns(timestamp)
             
             # Timestamp ekle
             self.custom_data['timestamps'].append(timestamp)
@@ -581,6 +970,27 @@ class DataProcessor:
         except Exception as e:
             app_logger.error(f"Custom data ekleme hatası: {e}")
     
+    def add_custom_batch(self, timestamps: np.ndarray, custom_values: Dict[str, np.ndarray]):
+        """Satır başına formül sonuçlarını ekle (NaN -> None)"""
+        try:
+            previous_rows = len(self.custom_data['timestamps'])
+            self.custom_data['timestamps'].extend(np.asarray(timestamps, dtype=np.int64).tolist())
+            
+            for formula_name, values in custom_values.items():
+                if formula_name not in self.custom_data:
+                    # Sonradan eklenen formül önceki satırlarla hizalı başlar
+                    self.custom_data[formula_name] = [None] * previous_rows
+                self.custom_data[formula_name].extend(
+                    None if value != value else value for value in values.tolist())
+            
+            # Mevcut formüllerde olmayan eski formüller için None ekle
+            for existing_formula in self.custom_data.keys():
+                if existing_formula != 'timestamps' and existing_formula not in custom_values:
+                    self.custom_data[existing_formula].extend([None] * len(timestamps))
+            
+        except Exception as e:
+            app_logger.error(f"Custom data ekleme hatası: {e}")
+    
     def get_custom_data(self) -> Dict[str, List]:
         """Custom data'yı al"""
         return self.custom_data.copy()
@@ -2,11 +2,12 @@ import csv
 import json
 import os
 from datetime import datetime
-from typing import Dict, List, Any, Optional, Tuple
+from typing import Dict, Iterable, List, Any, Optional, Tuple
 from tkinter import messagebox
 
 from utils.logger import app_logger
 from utils.helpers import format_csv_value, generate_filename
+from utils.session_clock import format_timestamps
 from data.formula_engine import FormulaEngine
 
 class DataExporter:
@@ -14,6 +15,7 @@ class DataExporter:
     
     def __init__(self):
         self.last_export_filename = None
+        self.last_export_info = None
         self.led_names = self._load_led_names()
         self.export_folder = "exported_data"
         self._ensure_export_folder_exists()
@@ -117,10 +119,27 @@ class DataExporter:
                      filename: Optional[str] = None,
                      excel_compatible: bool = True) -> Tuple[bool, str]:
         """Verileri CSV formatında dışa aktar"""
+        if not export_data:
+            return False, "Dışa aktarılacak veri yok"
+        
+        # Header row - önce custom data formüllerini belirle
+        custom_formulas = set()
+        for row_data in export_data:
+            if 'custom_data' in row_data:
+                custom_formulas.update(row_data['custom_data'].keys())
+        
+        return self.export_batches_to_csv([export_data], custom_formulas, filename, excel_compatible)
+    
+    def export_batches_to_csv(self, batches: Iterable[List[Dict[str, Any]]],
+                              custom_formulas: Iterable[str] = (),
+                              filename: Optional[str] = None,
+                              excel_compatible: bool = True) -> Tuple[bool, str]:
+        """Satır partilerini sırayla CSV'ye yaz - tüm veri bellekte tutulmaz
+
+        Satır/kesinti sayıları ve zaman aralığı yazarken toplanır (last_export_info),
+        create_export_summary(None, ...) bunları kullanır.
+        """
         try:
-            if not export_data:
-                return False, "Dışa aktarılacak veri yok"
-            
             if filename is None:
                 base_filename = generate_filename("spectroscopy_export", "csv")
                 filename = os.path.join(self.export_folder, base_filename)
@@ -132,16 +151,24 @@ class DataExporter:
             # Excel uyumluluğu için encoding ve delimiter
             encoding = 'utf-8-sig' if excel_compatible else 'utf-8'
             delimiter = ';' if excel_compatible else ','
+            custom_formulas = sorted(custom_formulas)
+            info = {'total_data_points': 0, 'connection_gaps': 0, 'lost_samples': 0,
+                    'start': None, 'end': None}
+            
+            # Format values for Excel compatibility
+            def format_value(value, is_calibrated=False, is_raw=False, is_custom=False):
+                if value is None or (is_calibrated and value is None):
+                    return ""
+                if is_raw or is_custom:
+                    # Raw data ve custom data için virgülden sonra basamak yok (tam sayı)
+                    return format_csv_value(int(value), decimal_places=0) if excel_compatible else f"{int(value)}"
+                else:
+                    # Calibrated data için 3 basamak
+                    return format_csv_value(value, decimal_places=3) if excel_compatible else f"{value:.3f}"
             
             with open(filename, 'w', encoding=encoding, newline='') as f:
                 writer = csv.writer(f, delimiter=delimiter)
                 
-                # Header row - önce custom data formüllerini belirle
-                custom_formulas = set()
-                for row_data in export_data:
-                    if 'custom_data' in row_data:
-                        custom_formulas.update(row_data['custom_data'].keys())
-                
                 # LED isimlerini app_settings.json'dan çek
                 uv_name = self._get_led_name_for_sensor('UV_360nm')
                 blue_name = self._get_led_name_for_sensor('Blue_450nm')
@@ -157,57 +184,67 @@ class DataExporter:
                 ]
                 
                 # Custom data başlıklarını ekle
-                for formula_name in sorted(custom_formulas):
+                for formula_name in custom_formulas:
                     headers.append(f'Custom: {formula_name}')
                 
                 writer.writerow(headers)
                 
-                # Data rows
-                for row_data in export_data:
-                    raw_data = row_data['raw_data']
-                    
-                    # Raw data tümü 0 ise bu satırı atla
-                    if all(raw_data.get(sensor, 0) == 0 for sensor in ['UV_360nm', 'Blue_450nm', 'IR_850nm', 'IR_940nm']):
+                for export_data in batches:
+                    if not export_data:
                         continue
+                    info['total_data_points'] += len(export_data)
+                    if info['start'] is None:
+                        info['start'] = export_data[0]['timestamp']
+                    info['end'] = export_data[-1]['timestamp']
                     
-                    timestamp = row_data['timestamp'].strftime('%Y-%m-%d %H:%M:%S.%f')
-                    cal_data = row_data['calibrated_data']
-                    
-                    custom_data = self._calculate_all_custom_data(row_data)
+                    # Zaman metinleri satır başına strftime yerine parti başına tek vektörel geçişte
+                    timestamp_strings = format_timestamps([row_data['timestamp'] for row_data in export_data], sep=' ')
                     
-                    # Format values for Excel compatibility
-                    def format_value(value, is_calibrated=False, is_raw=False, is_custom=False):
-                        if value is None or (is_calibrated and value is None):
-                            return ""
-                        if is_raw or is_custom:
-                            # Raw data ve custom data için virgülden sonra basamak yok (tam sayı)
-                            return format_csv_value(int(value), decimal_places=0) if excel_compatible else f"{int(value)}"
-                        else:
-                            # Calibrated data için 3 basamak
-                            return format_csv_value(value, decimal_places=3) if excel_compatible else f"{value:.3f}"
-                    
-                    csv_row = [
-                        timestamp,
-                        format_value(raw_data.get('UV_360nm', 0), is_raw=True),
-                        format_value(cal_data.get('UV_360nm'), is_calibrated=True),
-                        format_value(raw_data.get('Blue_450nm', 0), is_raw=True),
-                        format_value(cal_data.get('Blue_450nm'), is_calibrated=True),
-                        format_value(raw_data.get('IR_850nm', 0), is_raw=True),
-                        format_value(cal_data.get('IR_850nm'), is_calibrated=True),
-                        format_value(raw_data.get('IR_940nm', 0), is_raw=True),
-                        format_value(cal_data.get('IR_940nm'), is_calibrated=True)
-                    ]
-                    
-                    # Custom data değerlerini ekle
-                    for formula_name in sorted(custom_formulas):
-                        value = custom_data.get(formula_name)
-                        if value is not None:
-                            csv_row.append(format_value(value, is_custom=True))
-                        else:
-                            csv_row.append("")  
-                    
-                    writer.writerow(csv_row)
+                    # Data rows
+                    for row_data, timestamp in zip(export_data, timestamp_strings):
+                        # Bağlantı kesintisi / kayıp örnek: boş hücreli satır - grafiklerde boşluk olarak görünür
+                        if row_data.get('gap') or row_data.get('lost'):
+                            info['connection_gaps' if row_data.get('gap') else 'lost_samples'] += 1
+                            writer.writerow([timestamp] + [""] * (len(headers) - 1))
+                            continue
+                        
+                        raw_data = row_data['raw_data']
+                        
+                        # Raw data tümü 0 ise bu satırı atla
+                        if all(raw_data.get(sensor, 0) == 0 for sensor in ['UV_360nm', 'Blue_450nm', 'IR_850nm', 'IR_940nm']):
+                            continue
+                        
+                        cal_data = row_data['calibrated_data']
+                        
+                        custom_data = self._calculate_all_custom_data(row_data)
+                        
+                        csv_row = [
+                            timestamp,
+                            format_value(raw_data.get('UV_360nm', 0), is_raw=True),
+                            format_value(cal_data.get('UV_360nm'), is_calibrated=True),
+                            format_value(raw_data.get('Blue_450nm', 0), is_raw=True),
+                            format_value(cal_data.get('Blue_450nm'), is_calibrated=True),
+                            format_value(raw_data.get('IR_850nm', 0), is_raw=True),
+                            format_value(cal_data.get('IR_850nm'), is_calibrated=True),
+                            format_value(raw_data.get('IR_940nm', 0), is_raw=True),
+                            format_value(cal_data.get('IR_940nm'), is_calibrated=True)
+                        ]
+                        
+                        # Custom data değerlerini ekle
+                        for formula_name in custom_formulas:
+                            value = custom_data.get(formula_name)
+                            if value is not None:
+                                csv_row.append(format_value(value, is_custom=True))
+                            else:
+                                csv_row.append("")  
+                        
+                        writer.writerow(csv_row)
             
+            if not info['total_data_points']:
+                os.remove(filename)
+                return False, "Dışa aktarılacak veri yok"
+            
+            self.last_export_info = info
             self.last_export_filename = filename
             app_logger.info(f"Veri CSV formatında dışa aktarıldı: {filename}")
             return True, filename
@@ -241,12 +278,17 @@ class DataExporter:
                 'data': []
             }
             
-            for row_data in export_data:
+            timestamp_strings = format_timestamps([row_data['timestamp'] for row_data in export_data])
+            for row_data, timestamp in zip(export_data, timestamp_strings):
                 json_row = {
-                    'timestamp': row_data['timestamp'].isoformat(),
+                    'timestamp': timestamp,
                     'raw_data': row_data['raw_data'],
                     'calibrated_data': row_data['calibrated_data']
                 }
+                if row_data.get('gap'):
+                    json_row['gap'] = True
+                elif row_data.get('lost'):
+                    json_row['lost'] = True
                 json_data['data'].append(json_row)
             
             with open(filename, 'w', encoding='utf-8') as f:
@@ -305,23 +347,45 @@ class DataExporter:
             app_logger.error(f"Kalibrasyon içe aktarma hatası: {e}")
             return False, str(e), None
     
-    def create_export_summary(self, export_data: List[Dict[str, Any]]) -> Dict[str, Any]:
-        """Export özeti oluştur"""
-        if not export_data:
+    def create_export_summary(self, export_data: Optional[List[Dict[str, Any]]],
+                              statistics: Optional[Dict[str, Dict[str, Any]]] = None) -> Dict[str, Any]:
+        """Export özeti oluştur - statistics verilirse sensör özeti satırlar taranmadan ondan alınır
+
+        export_data None ise son export_batches_to_csv çağrısının sayaçları kullanılır.
+        """
+        if export_data is None:
+            info = self.last_export_info
+            if not info or statistics is None:
+                return {}
+        elif not export_data:
             return {}
+        else:
+            info = {
+                'total_data_points': len(export_data),
+                'connection_gaps': sum(1 for row in export_data if row.get('gap')),
+                'lost_samples': sum(1 for row in export_data if row.get('lost')),
+                'start': export_data[0]['timestamp'],
+                'end': export_data[-1]['timestamp']
+            }
         
         try:
             summary = {
-                'total_data_points': len(export_data),
+                'total_data_points': info['total_data_points'],
+                'connection_gaps': info['connection_gaps'],
+                'lost_samples': info['lost_samples'],
                 'time_range': {
-                    'start': export_data[0]['timestamp'].isoformat(),
-                    'end': export_data[-1]['timestamp'].isoformat(),
-                    'duration_minutes': (export_data[-1]['timestamp'] - 
-                                       export_data[0]['timestamp']).total_seconds() / 60
+                    'start': info['start'].isoformat(),
+                    'end': info['end'].isoformat(),
+                    'duration_minutes': (info['end'] - info['start']).total_seconds() / 60
                 },
                 'sensors': {}
             }
             
+            if statistics is not None:
+                # DataProcessor.get_export_statistics(): depo birikimlerinden O(1)
+                summary['sensors'] = statistics
+                return summary
+            
             # Her sensör için özet
             for sensor_key in ['UV_360nm', 'Blue_450nm', 'IR_850nm', 'IR_940nm']:
                 raw_values = [row['raw_data'].get(sensor_key, 0) for row in export_data]
@@ -2,7 +2,23 @@ import re
 from typing import Dict, List, Optional, Any, Tuple
 from datetime import datetime
 
+import numpy as np
+
+from config.constants import TARGET_SENSORS, SENSOR_KEYS
 from utils.logger import app_logger
+from utils.helpers import device_namespace, map_device_name
+
+# Parti hesaplaması için dizi karşılıkları (safe_eval'daki isimlerle aynı)
+_ARRAY_FUNCTIONS = {
+    "__builtins__": {},
+    "abs": np.abs,
+    "max": lambda *args: np.max(np.broadcast_arrays(*args), axis=0),
+    "min": lambda *args: np.min(np.broadcast_arrays(*args), axis=0),
+    "sqrt": np.sqrt,
+    "pow": np.power,
+    "pi": np.pi,
+    "e": np.e
+}
 
 class FormulaEngine:
     
@@ -28,6 +44,9 @@ class FormulaEngine:
             'ir940': 'IR_940nm'
         }
         
+        # Cihaz önekleri - çoklu cihazda d2_ch1, d3_uv gibi değişkenler
+        self.device_namespaces = {device_namespace(map_device_name(name)) for name in TARGET_SENSORS}
+        
         # Güvenli matematik operatörleri
         self.allowed_operators = ['+', '-', '*', '/', '(', ')', '.', ' ']
         self.allowed_functions = ['abs', 'max', 'min', 'sqrt', 'pow']
@@ -66,9 +85,9 @@ class FormulaEngine:
             # Güvenlik kontrolü - sadece izin verilen karakterler
             clean_formula = formula.lower().replace(' ', '')
             
-            # Sensör isimlerini geçici değişkenlerle değiştir
+            # Sensör isimlerini geçici değişkenlerle değiştir (önekli isimler önce)
             test_formula = clean_formula
-            for sensor_name in self.sensor_mapping.keys():
+            for sensor_name in self._variable_names():
                 test_formula = test_formula.replace(sensor_name, '1.0')
             
             # Sadece izin verilen karakterleri kontrol et
@@ -83,6 +102,8 @@ class FormulaEngine:
             # Test hesaplama
             try:
                 test_data = {sensor: 1.0 for sensor in self.sensor_mapping.values()}
+                for namespace in self.device_namespaces:
+                    test_data.update({f"{namespace}_{sensor}": 1.0 for sensor in SENSOR_KEYS})
                 # Mevcut formülleri de test verisine ekle
                 test_calculated = {name: 1.0 for name in self.formulas.keys()}
                 result = self.calculate_formula(formula, test_data, test_calculated)
@@ -109,10 +130,8 @@ class FormulaEngine:
                     calc_formula = calc_formula.replace(data_name.lower(), str(value))
             
             # Sonra sensör isimlerini değerlerle değiştir
-            for sensor_name, sensor_key in self.sensor_mapping.items():
-                if sensor_key in sensor_data:
-                    value = sensor_data[sensor_key]
-                    calc_formula = calc_formula.replace(sensor_name, str(value))
+            for sensor_name, value in self._variable_values(sensor_data):
+                calc_formula = calc_formula.replace(sensor_name, str(value))
             
             # Güvenli hesaplama
             result = self.safe_eval(calc_formula)
@@ -123,6 +142,39 @@ class FormulaEngine:
             app_logger.error(f"Formül hesaplama hatası: {e}")
             return None
     
+    def register_device(self, device_id: str) -> str:
+        """Cihaz için formül önekini kaydet ve döndür"""
+        namespace = device_namespace(device_id)
+        self.device_namespaces.add(namespace)
+        return namespace
+    
+    def _variable_names(self) -> List[str]:
+        """Tüm formül değişkenleri - uzun isimler önce (d2_ch1, ch1'den önce değişmeli)"""
+        names = list(self.sensor_mapping.keys())
+        for namespace in self.device_namespaces:
+            names.extend(f"{namespace}_{sensor_name}" for sensor_name in self.sensor_mapping)
+        return sorted(names, key=len, reverse=True)
+    
+    def _variable_values(self, sensor_data: Dict[str, float]) -> List[Tuple[str, float]]:
+        """Formül değişkenlerini değerleriyle eşle (d2_UV_360nm -> d2_ch1, d2_uv ...)"""
+        # Önekli anahtarlardan yeni cihaz öneklerini öğren
+        for key in sensor_data:
+            for sensor_key in SENSOR_KEYS:
+                suffix = f"_{sensor_key}"
+                if key.endswith(suffix) and len(key) > len(suffix):
+                    self.device_namespaces.add(key[:-len(suffix)])
+        
+        variables = {}
+        for sensor_name, sensor_key in self.sensor_mapping.items():
+            if sensor_key in sensor_data:
+                variables[sensor_name] = sensor_data[sensor_key]
+            for namespace in self.device_namespaces:
+                namespaced_key = f"{namespace}_{sensor_key}"
+                if namespaced_key in sensor_data:
+                    variables[f"{namespace}_{sensor_name}"] = sensor_data[namespaced_key]
+        
+        return sorted(variables.items(), key=lambda item: len(item[0]), reverse=True)
+    
     def safe_eval(self, expression: str) -> float:
         """Güvenli matematik hesaplama"""
         try:
@@ -153,6 +205,44 @@ class FormulaEngine:
             app_logger.error(f"Güvenli hesaplama hatası: {e}")
             raise
     
+    def calculate_batch(self, sensor_data: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+        """Tüm formülleri kanal dizileri üzerinde tek geçişte hesapla (satır başına sonuç)
+
+        Geçersiz kanal (NaN) veya hesaplanamayan satırların sonucu NaN olur.
+        """
+        results = {}
+        if not self.formulas or not sensor_data:
+            return results
+        
+        row_count = len(next(iter(sensor_data.values())))
+        variables = self._variable_values(sensor_data)
+        
+        for name, formula_info in self.formulas.items():
+            try:
+                # İsimler büyük harfli yer tutucularla değişir - küçük harfli isimler bunlara denk gelmez
+                calc_formula = formula_info['formula'].lower()
+                namespace = dict(_ARRAY_FUNCTIONS)
+                for data_name, values in list(results.items()) + variables:
+                    placeholder = f"__V{len(namespace)}__"
+                    if data_name.lower() in calc_formula:
+                        calc_formula = calc_formula.replace(data_name.lower(), placeholder)
+                        namespace[placeholder] = values
+                
+                with np.errstate(all='ignore'):
+                    values = np.asarray(eval(calc_formula, namespace), dtype=np.float64)
+                values = np.broadcast_to(values, (row_count,)).copy()
+                values[~np.isfinite(values)] = np.nan
+                
+                if row_count and not np.isnan(values[-1]):
+                    self.formulas[name]['last_value'] = float(values[-1])
+                results[name] = values
+                
+            except Exception as e:
+                app_logger.warning(f"Parti formül hesaplama hatası ({name}): {e}")
+                results[name] = np.full(row_count, np.nan)
+        
+        return results
+    
     def calculate_selected_formulas(self, sensor_data: Dict[str, float]) -> Dict[str, float]:
         results = {}
         
@@ -305,7 +395,8 @@ class FormulaEngine:
             "abs(ch1 - ch3)",
             "max(ch1, ch2, ch3, ch4)",
             "sqrt(ch1 * ch1 + ch2 * ch2)",
-            "ch1 * 0.85 + ch2 * 1.15 - 0.05"
+            "ch1 * 0.85 + ch2 * 1.15 - 0.05",
+            "d1_ch1 - d2_ch1"
         ]
     
     def export_formulas(self) -> Dict[str, Any]:
@@ -0,0 +1,92 @@
+"""
+Spektroskopi Sistemi Veri Alım Kuyruğu
+"""
+
+from collections import deque
+from typing import Any, Dict, List, Optional
+
+from config.constants import INGEST_QUEUE_CAPACITY
+from utils.logger import app_logger
+
+DROP_OLDEST = 'drop_oldest'
+DROP_NEWEST = 'drop_newest'
+
+class IngestQueue:
+    """Tek üretici (BLE thread) / tek tüketici (GUI thread) sınırlı kuyruk"""
+
+    def __init__(self, capacity: int = INGEST_QUEUE_CAPACITY,
+                 overflow_policy: str = DROP_OLDEST):
+        if overflow_policy not in (DROP_OLDEST, DROP_NEWEST):
+            raise ValueError(f"Geçersiz taşma politikası: {overflow_policy}")
+
+        self.capacity = int(capacity)
+        self.overflow_policy = overflow_policy
+        # deque.append / popleft GIL altında atomik - ek kilit gerekmez
+        self._items = deque()
+
+        # Sayaçlar (üretici ve tüketici farklı alanları yazar)
+        self.enqueued = 0
+        self.delivered = 0
+        self.dropped = 0
+        self.overflow_events = 0
+        self.high_watermark = 0
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def put(self, item: Any) -> bool:
+        """Öğeyi kuyruğa ekle - kuyruk doluysa False döner (backpressure)"""
+        size = len(self._items)
+        if size >= self.capacity:
+            self.overflow_events += 1
+            if self.overflow_events == 1:
+                app_logger.warning(f"Veri kuyruğu doldu ({self.capacity}) - politika: {self.overflow_policy}")
+            self.dropped += 1
+            if self.overflow_policy == DROP_NEWEST:
+                return False
+            try:
+                self._items.popleft()
+            except IndexError:
+                pass
+            self._items.append(item)
+            self.enqueued += 1
+            return False
+
+        self._items.append(item)
+        self.enqueued += 1
+        if size + 1 > self.high_watermark:
+            self.high_watermark = size + 1
+        return True
+
+    def drain(self, max_items: Optional[int] = None) -> List[Any]:
+        """Kuyruktaki öğeleri al - her öğe tam olarak bir kez teslim edilir"""
+        items = []
+        limit = len(self._items) if max_items is None else min(max_items, len(self._items))
+        popleft = self._items.popleft
+        try:
+            for _ in range(limit):
+                items.append(popleft())
+        except IndexError:
+            pass
+        self.delivered += len(items)
+        return items
+
+    def is_under_pressure(self, threshold: float = 0.8) -> bool:
+        """Kuyruk doluluk oranı eşiği aştı mı?"""
+        return len(self._items) >= self.capacity * threshold
+
+    def clear(self):
+        """Kuyruğu boşalt (sayaçlar korunur)"""
+        self._items.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Kuyruk istatistiklerini al"""
+        return {
+            'size': len(self._items),
+            'capacity': self.capacity,
+            'enqueued': self.enqueued,
+            'delivered': self.delivered,
+            'dropped': self.dropped,
+            'overflow_events': self.overflow_events,
+            'high_watermark': self.high_watermark
+        }
@@ -0,0 +1,191 @@
+"""
+Spektroskopi Sistemi Çok Çözünürlüklü Özet Piramidi
+"""
+
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+from config.constants import OVERVIEW_LEVELS_S
+
+_RAW_MAX = 0xFFFF
+
+_COLUMNS = ('keys', 'mins', 'maxs', 'sums', 'counts', 'marks')
+
+class _Level:
+    """Sabit genişlikli kovalar: kanal başına min / maks / toplam / sayı ve kovadaki işaret satırı sayısı"""
+
+    __slots__ = ('width_ns',) + _COLUMNS + ('size',)
+
+    def __init__(self, width_ns: int, channel_count: int, capacity: int = 64):
+        self.width_ns = int(width_ns)
+        self.keys = np.zeros(capacity, dtype=np.int64)
+        self.mins = np.full((capacity, channel_count), _RAW_MAX, dtype=np.uint16)
+        self.maxs = np.zeros((capacity, channel_count), dtype=np.uint16)
+        self.sums = np.zeros((capacity, channel_count), dtype=np.float64)
+        self.counts = np.zeros((capacity, channel_count), dtype=np.uint32)
+        self.marks = np.zeros(capacity, dtype=np.uint32)
+        self.size = 0
+
+    def _reserve(self, extra: int):
+        needed = self.size + extra
+        capacity = len(self.keys)
+        if needed <= capacity:
+            return
+        capacity = max(needed, capacity * 2)
+        for name, fill in (('keys', 0), ('mins', _RAW_MAX), ('maxs', 0), ('sums', 0), ('counts', 0), ('marks', 0)):
+            old = getattr(self, name)
+            grown = np.full((capacity,) + old.shape[1:], fill, dtype=old.dtype)
+            grown[:self.size] = old[:self.size]
+            setattr(self, name, grown)
+
+    def add(self, timestamps: np.ndarray, raw: np.ndarray, valid: np.ndarray, markers: np.ndarray):
+        """Satırları kovalara katla - sıralı akışta yalnızca son kova güncellenir, gerisi eklenir"""
+        row_keys = timestamps // self.width_ns
+        if len(row_keys) > 1 and (np.diff(row_keys) < 0).any():
+            order = np.argsort(row_keys, kind='stable')
+            row_keys, raw, valid, markers = row_keys[order], raw[order], valid[order], markers[order]
+
+        starts = np.concatenate(([0], np.flatnonzero(np.diff(row_keys)) + 1))
+        group_keys = row_keys[starts]
+        group_mins = np.minimum.reduceat(np.where(valid, raw, _RAW_MAX).astype(np.uint16), starts, axis=0)
+        group_maxs = np.maximum.reduceat(np.where(valid, raw, 0).astype(np.uint16), starts, axis=0)
+        group_sums = np.add.reduceat(np.where(valid, raw, 0).astype(np.float64), starts, axis=0)
+        group_counts = np.add.reduceat(valid.astype(np.uint32), starts, axis=0)
+        group_marks = np.add.reduceat(markers.astype(np.uint32), starts)
+
+        # Mevcut kovalara düşen gruplar (normalde yalnızca açık son kova) yerinde birleştirilir
+        last_key = self.keys[self.size - 1] if self.size else None
+        new_from = 0
+        while new_from < len(group_keys) and last_key is not None and group_keys[new_from] <= last_key:
+            self._merge(group_keys[new_from], group_mins[new_from], group_maxs[new_from],
+                        group_sums[new_from], group_counts[new_from], group_marks[new_from])
+            last_key = self.keys[self.size - 1]
+            new_from += 1
+
+        count = len(group_keys) - new_from
+        if not count:
+            return
+        self._reserve(count)
+        rows = slice(self.size, self.size + count)
+        self.keys[rows] = group_keys[new_from:]
+        self.mins[rows] = group_mins[new_from:]
+        self.maxs[rows] = group_maxs[new_from:]
+        self.sums[rows] = group_sums[new_from:]
+        self.counts[rows] = group_counts[new_from:]
+        self.marks[rows] = group_marks[new_from:]
+        self.size += count
+
+    def _merge(self, key: int, mins: np.ndarray, maxs: np.ndarray, sums: np.ndarray,
+               counts: np.ndarray, marks: int):
+        position = int(np.searchsorted(self.keys[:self.size], key))
+        if position == self.size or self.keys[position] != key:
+            # Geç gelen satır için ara kova (nadir yol)
+            self._reserve(1)
+            for name in _COLUMNS:
+                column = getattr(self, name)
+                column[position + 1:self.size + 1] = column[position:self.size].copy()
+            self.keys[position] = key
+            self.mins[position] = _RAW_MAX
+            self.maxs[position] = 0
+            self.sums[position] = 0
+            self.counts[position] = 0
+            self.marks[position] = 0
+            self.size += 1
+        np.minimum(self.mins[position], mins, out=self.mins[position])
+        np.maximum(self.maxs[position], maxs, out=self.maxs[position])
+        self.sums[position] += sums
+        self.counts[position] += counts
+        self.marks[position] += marks
+
+    def bounds(self, start_ns: Optional[int], stop_ns: Optional[int]):
+        """[start_ns, stop_ns] ile kesişen kovaların dilim sınırları"""
+        keys = self.keys[:self.size]
+        lo = int(np.searchsorted(keys, start_ns // self.width_ns, 'left')) if start_ns is not None else 0
+        hi = int(np.searchsorted(keys, stop_ns // self.width_ns, 'right')) if stop_ns is not None else self.size
+        return lo, max(lo, hi)
+
+    def discard_before(self, timestamp_ns: int):
+        """Tamamen timestamp_ns öncesinde kalan kovaları at"""
+        drop = int(np.searchsorted(self.keys[:self.size], timestamp_ns // self.width_ns, 'left'))
+        if not drop:
+            return
+        for name in _COLUMNS:
+            column = getattr(self, name)
+            column[:self.size - drop] = column[drop:self.size].copy()
+        self.size -= drop
+
+class OverviewPyramid:
+    """Depo ile birlikte artımlı güncellenen min/maks/ortalama özet seviyeleri
+
+    Her seviye sabit genişlikli zaman kovalarıdır (varsayılan 1 sn, 10 sn, 1 dk, 10 dk).
+    Ekleme maliyeti satır sayısıyla doğrusal, sorgu maliyeti oturum uzunluğundan
+    bağımsızdır; min/maks tutulduğu için uzaklaştırmada sivri değerler kaybolmaz.
+    GAP/LOST işaret satırı düşen kovalar NaN döner - çizgi kesintinin üzerinden birleşmez.
+    """
+
+    def __init__(self, channel_count: int, levels_s: Sequence[float] = OVERVIEW_LEVELS_S):
+        self.channel_count = channel_count
+        self.levels: List[_Level] = [_Level(int(width_s * 1_000_000_000), channel_count)
+                                     for width_s in sorted(levels_s)]
+
+    def add(self, timestamps: np.ndarray, raw: np.ndarray, valid: np.ndarray,
+            markers: Optional[np.ndarray] = None):
+        """Depoya eklenen satırları tüm seviyelere katla (geçersiz hücreler sayılmaz, markers işaret satırlarıdır)"""
+        if not len(timestamps):
+            return
+        if markers is None:
+            markers = np.zeros(len(timestamps), dtype=bool)
+        for level in self.levels:
+            level.add(timestamps, raw, valid, markers)
+
+    def query(self, start_ns: Optional[int], stop_ns: Optional[int],
+              max_points: int) -> Optional[Dict[str, np.ndarray]]:
+        """max_points kovaya sığan en ince seviyeyi seç; en kaba seviye de sığmazsa kovaları birleştir"""
+        if not self.levels or not self.levels[-1].size:
+            return None
+        max_points = max(1, int(max_points))
+        for level in self.levels:
+            lo, hi = level.bounds(start_ns, stop_ns)
+            if hi - lo <= max_points:
+                break
+
+        keys = level.keys[lo:hi] * level.width_ns
+        mins = level.mins[lo:hi]
+        maxs = level.maxs[lo:hi]
+        sums = level.sums[lo:hi]
+        counts = level.counts[lo:hi]
+        marks = level.marks[lo:hi]
+        if hi - lo > max_points:
+            # En kaba seviye de fazla - ardışık kovalar birleştirilir (min/maks korunur)
+            starts = np.arange(0, hi - lo, -(-(hi - lo) // max_points))
+            keys = keys[starts]
+            mins = np.minimum.reduceat(mins, starts, axis=0)
+            maxs = np.maximum.reduceat(maxs, starts, axis=0)
+            sums = np.add.reduceat(sums, starts, axis=0)
+            counts = np.add.reduceat(counts, starts, axis=0)
+            marks = np.add.reduceat(marks, starts)
+
+        gap = marks > 0
+        empty = (counts == 0) | gap[:, None]
+        with np.errstate(invalid='ignore', divide='ignore'):
+            mean = sums / counts
+        return {
+            'timestamps': keys,
+            'min': np.where(empty, np.nan, mins),
+            'max': np.where(empty, np.nan, maxs),
+            'mean': np.where(empty, np.nan, mean),
+            'count': counts.copy(),
+            'gap': gap,
+            'level_s': level.width_ns / 1_000_000_000
+        }
+
+    def discard_before(self, timestamp_ns: int):
+        for level in self.levels:
+            level.discard_before(timestamp_ns)
+
+    def clear(self):
+        self.levels = [_Level(level.width_ns, self.channel_count) for level in self.levels]
+
+    def nbytes(self) -> int:
+        return sum(getattr(level, name).nbytes for level in self.levels for name in _COLUMNS)
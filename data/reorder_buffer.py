@@ -0,0 +1,105 @@
+"""
+Spektroskopi Sistemi Yeniden Sıralama (Jitter) Tamponu
+"""
+
+import heapq
+import itertools
+from typing import Any, Dict, List, Optional
+
+from config.constants import REORDER_WATERMARK_MS, REORDER_CAPACITY
+
+class ReorderBuffer:
+    """Paketleri zaman damgasına göre tutar, filigran geçince sırayla bırakır
+
+    Filigran = max(görülen en yeni damga, şimdiki zaman) - watermark. Böylece canlı
+    akışta gecikme watermark ile sınırlı kalır, hızlı oynatmada olay zamanı ilerletir.
+    Kapasite aşılırsa en eski paket beklemeden bırakılır. Zaten sıralı gelen
+    paketler (tampon boşken) bypass() ile hiç beklemeden geçer.
+    """
+
+    def __init__(self, watermark_ms: float = REORDER_WATERMARK_MS,
+                 capacity: int = REORDER_CAPACITY):
+        self.watermark_ns = int(watermark_ms * 1_000_000)
+        self.capacity = int(capacity)
+
+        self._heap: List[tuple] = []
+        # Aynı damgalı paketlerde geliş sırası korunur
+        self._counter = itertools.count()
+        self._max_seen: Optional[int] = None
+        self.last_released: Optional[int] = None
+
+        # İstatistikler
+        self.reordered = 0
+        self.bypassed = 0
+        self.late_dropped = 0
+        self.forced_releases = 0
+        self.max_depth = 0
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def push(self, timestamp_ns: int, item: Any) -> bool:
+        """Paketi ekle - bırakılmış bir damgadan eskiyse (filigrandan geç) False"""
+        if self.last_released is not None and timestamp_ns < self.last_released:
+            self.late_dropped += 1
+            return False
+
+        if self._max_seen is None or timestamp_ns >= self._max_seen:
+            self._max_seen = timestamp_ns
+        else:
+            self.reordered += 1
+
+        heapq.heappush(self._heap, (timestamp_ns, next(self._counter), item))
+        if len(self._heap) > self.max_depth:
+            self.max_depth = len(self._heap)
+        return True
+
+    def bypass(self, timestamp_ns: int) -> bool:
+        """Tampon boş ve damga görülenlerin hepsinden yeniyse paketi bekletmeden bırakılmış say"""
+        if self._heap or (self._max_seen is not None and timestamp_ns < self._max_seen):
+            return False
+        self._max_seen = timestamp_ns
+        self.last_released = timestamp_ns
+        self.bypassed += 1
+        return True
+
+    def pop_ready(self, now_ns: Optional[int] = None) -> List[Any]:
+        """Filigranı geçmiş paketleri zaman sırasıyla bırak"""
+        heap = self._heap
+        if not heap:
+            return []
+
+        high = self._max_seen if now_ns is None else max(self._max_seen, now_ns)
+        limit = high - self.watermark_ns
+        ready = []
+        while heap and (heap[0][0] <= limit or len(heap) > self.capacity):
+            if heap[0][0] > limit:
+                self.forced_releases += 1
+            timestamp_ns, _, item = heapq.heappop(heap)
+            self.last_released = timestamp_ns
+            ready.append(item)
+        return ready
+
+    def flush(self) -> List[Any]:
+        """Bekleyen tüm paketleri sırayla bırak"""
+        ready = []
+        while self._heap:
+            timestamp_ns, _, item = heapq.heappop(self._heap)
+            self.last_released = timestamp_ns
+            ready.append(item)
+        return ready
+
+    def clear(self):
+        self._heap = []
+        self._max_seen = None
+        self.last_released = None
+
+    def get_stats(self) -> Dict[str, int]:
+        return {
+            'pending': len(self._heap),
+            'reordered': self.reordered,
+            'bypassed': self.bypassed,
+            'late_dropped': self.late_dropped,
+            'forced_releases': self.forced_releases,
+            'max_depth': self.max_depth
+        }
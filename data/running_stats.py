@@ -0,0 +1,91 @@
+"""
+Spektroskopi Sistemi Artımlı Kanal İstatistikleri
+"""
+
+from typing import Dict, Sequence
+
+import numpy as np
+
+def stats_summary(channels: Sequence[str], count: np.ndarray, mean: np.ndarray, variance: np.ndarray,
+                  mins: np.ndarray, maxs: np.ndarray) -> Dict[str, Dict[str, float]]:
+    """Kanal dizilerini {kanal: {count, mean, std, min, max}} sözlüğüne çevir (veri yoksa sıfırlar)"""
+    summary = {}
+    for channel, sensor_key in enumerate(channels):
+        if count[channel]:
+            summary[sensor_key] = {
+                'count': int(count[channel]),
+                'mean': float(mean[channel]),
+                'std': float(np.sqrt(max(variance[channel], 0.0))),
+                'min': float(mins[channel]),
+                'max': float(maxs[channel])
+            }
+        else:
+            summary[sensor_key] = {'count': 0, 'mean': 0.0, 'std': 0.0, 'min': 0.0, 'max': 0.0}
+    return summary
+
+class RunningStats:
+    """Kanal başına Welford ortalama/varyans, min, maks ve sayı - ekleme O(satır), okuma O(1)
+
+    Partiler önce kendi içinde özetlenip Chan birleştirmesiyle eklenir; varyans
+    toplam kareler farkından hesaplanmadığı için uzun oturumlarda da kararlıdır.
+    """
+
+    def __init__(self, channel_count: int):
+        self.channel_count = channel_count
+        self.reset()
+
+    def reset(self):
+        self.count = np.zeros(self.channel_count, dtype=np.int64)
+        self.mean = np.zeros(self.channel_count, dtype=np.float64)
+        self.m2 = np.zeros(self.channel_count, dtype=np.float64)
+        self.min = np.full(self.channel_count, np.inf)
+        self.max = np.full(self.channel_count, -np.inf)
+
+    def add_row(self, values: Sequence[float], valid: Sequence[bool]):
+        """Tek satır (klasik Welford adımı)"""
+        for channel in range(self.channel_count):
+            if not valid[channel]:
+                continue
+            value = float(values[channel])
+            self.count[channel] += 1
+            delta = value - self.mean[channel]
+            self.mean[channel] += delta / self.count[channel]
+            self.m2[channel] += delta * (value - self.mean[channel])
+            if value < self.min[channel]:
+                self.min[channel] = value
+            if value > self.max[channel]:
+                self.max[channel] = value
+
+    def add_batch(self, values: np.ndarray, valid: np.ndarray):
+        """(satır, kanal) partisini özetleyip birleştir - geçersiz hücreler sayılmaz"""
+        values = np.asarray(values, dtype=np.float64)
+        count = valid.sum(axis=0)
+        if not count.any():
+            return
+        with np.errstate(invalid='ignore', divide='ignore'):
+            mean = np.where(count > 0, np.where(valid, values, 0.0).sum(axis=0) / count, 0.0)
+        m2 = np.where(valid, (values - mean) ** 2, 0.0).sum(axis=0)
+        self.merge(count, mean, m2,
+                   np.where(valid, values, np.inf).min(axis=0),
+                   np.where(valid, values, -np.inf).max(axis=0))
+
+    def merge(self, count: np.ndarray, mean: np.ndarray, m2: np.ndarray,
+              mins: np.ndarray, maxs: np.ndarray):
+        """Başka bir özetle birleştir (Chan paralel varyans formülü)"""
+        total = self.count + count
+        with np.errstate(invalid='ignore', divide='ignore'):
+            delta = mean - self.mean
+            ratio = np.where(total > 0, count / total, 0.0)
+            self.mean = self.mean + delta * ratio
+            self.m2 = self.m2 + m2 + delta ** 2 * self.count * ratio
+        self.count = total
+        self.min = np.minimum(self.min, mins)
+        self.max = np.maximum(self.max, maxs)
+
+    def variance(self) -> np.ndarray:
+        """Popülasyon varyansı (np.var ile aynı)"""
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return np.where(self.count > 0, self.m2 / np.maximum(self.count, 1), 0.0)
+
+    def summary(self, channels: Sequence[str]) -> Dict[str, Dict[str, float]]:
+        return stats_summary(channels, self.count, self.mean, self.variance(), self.min, self.max)
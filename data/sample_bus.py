@@ -0,0 +1,285 @@
+"""
+Spektroskopi Sistemi Örnek Yayın/Abonelik Veri Yolu
+"""
+
+import time
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from data.sample_store import MARKER_FLAGS
+from utils.logger import app_logger
+
+# Birleştirme politikaları
+POLICY_LATEST = "latest"              # Teslimde cihaz başına yalnızca son satır
+POLICY_BATCH = "batch"                # Son teslimden beri gelen tüm satırlar tek parti
+POLICY_EVERY_SAMPLE = "every_sample"  # Her satır için ayrı çağrı
+
+# device_id filtresi: None -> birincil cihaz, ALL_DEVICES -> tüm cihazlar
+ALL_DEVICES = "*"
+
+class SampleBatch:
+    """Tek cihazın ardışık satırları - SampleStore kolonlarıyla aynı düzen"""
+
+    __slots__ = ('device_id', 'is_primary', 'channels', 'timestamps', 'raw', 'calibrated', 'flags')
+
+    def __init__(self, device_id: Optional[str], is_primary: bool, channels: Sequence[str],
+                 timestamps: np.ndarray, raw: np.ndarray, calibrated: np.ndarray, flags: np.ndarray):
+        self.device_id = device_id
+        self.is_primary = is_primary
+        self.channels = channels
+        self.timestamps = timestamps
+        self.raw = raw
+        self.calibrated = calibrated
+        self.flags = flags
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+    def __getitem__(self, index) -> 'SampleBatch':
+        """Satır dilimi (kopyasız görünüm)"""
+        if isinstance(index, int):
+            index = slice(index, index + 1 if index != -1 else None)
+        return SampleBatch(self.device_id, self.is_primary, self.channels,
+                           self.timestamps[index], self.raw[index],
+                           self.calibrated[index], self.flags[index])
+
+    @classmethod
+    def concat(cls, batches: List['SampleBatch']) -> 'SampleBatch':
+        if len(batches) == 1:
+            return batches[0]
+        first = batches[0]
+        return cls(first.device_id, first.is_primary, first.channels,
+                   np.concatenate([batch.timestamps for batch in batches]),
+                   np.concatenate([batch.raw for batch in batches]),
+                   np.concatenate([batch.calibrated for batch in batches]),
+                   np.concatenate([batch.flags for batch in batches]))
+
+    def valid(self, channel: int) -> np.ndarray:
+        """Kanalın geçerli satır maskesi"""
+        return ((self.flags >> channel) & 1).astype(bool)
+
+    def latest_raw(self) -> Dict[str, float]:
+        """Partideki her kanalın son geçerli ham değeri (geçerli değer yoksa kanal yok)"""
+        return self._latest(self.raw)
+
+    def latest_calibrated(self) -> Dict[str, float]:
+        """Her kanalın son geçerli kalibre değeri (NaN olanlar atlanır)"""
+        return self._latest(self.calibrated, skip_nan=True)
+
+    def _latest(self, column: np.ndarray, skip_nan: bool = False) -> Dict[str, float]:
+        values = {}
+        for channel, sensor_key in enumerate(self.channels):
+            rows = np.flatnonzero(self.valid(channel))
+            if len(rows):
+                value = float(column[rows[-1], channel])
+                if not (skip_nan and np.isnan(value)):
+                    values[sensor_key] = value
+        return values
+
+class Subscription:
+    """Abone: callback(partiler), azami teslim hızı, birleştirme politikası"""
+
+    def __init__(self, callback: Callable[[List[SampleBatch]], None],
+                 max_rate_hz: Optional[float] = None,
+                 policy: str = POLICY_LATEST,
+                 device_id: Optional[str] = None,
+                 active: Optional[Callable[[], bool]] = None,
+                 include_markers: bool = False):
+        if policy not in (POLICY_LATEST, POLICY_BATCH, POLICY_EVERY_SAMPLE):
+            raise ValueError(f"Bilinmeyen birleştirme politikası: {policy}")
+        self.callback = callback
+        self.min_interval = 1.0 / max_rate_hz if max_rate_hz else 0.0
+        self.policy = policy
+        self.device_id = device_id
+        self.active = active
+        self.include_markers = include_markers
+
+        self.deliveries = 0
+        self._last_delivery = float('-inf')
+        # Cihaz başına bekleyen partiler (teslim edilene kadar)
+        self._pending: Dict[Optional[str], List[SampleBatch]] = {}
+
+    def is_active(self) -> bool:
+        if self.active is None:
+            return True
+        try:
+            return bool(self.active())
+        except Exception:
+            return False
+
+    def wants(self, batch: SampleBatch) -> bool:
+        if self.device_id == ALL_DEVICES:
+            return True
+        if self.device_id is None:
+            return batch.is_primary
+        return batch.device_id == self.device_id
+
+    def offer(self, batch: SampleBatch):
+        if not self.include_markers:
+            data_rows = (batch.flags & MARKER_FLAGS) == 0
+            if not data_rows.all():
+                if not data_rows.any():
+                    return
+                batch = SampleBatch(batch.device_id, batch.is_primary, batch.channels,
+                                    batch.timestamps[data_rows], batch.raw[data_rows],
+                                    batch.calibrated[data_rows], batch.flags[data_rows])
+
+        if self.policy == POLICY_LATEST:
+            # Eski satırlar hiç tutulmaz
+            self._pending[batch.device_id] = [batch[-1]]
+        else:
+            self._pending.setdefault(batch.device_id, []).append(batch)
+
+    def drop_pending(self):
+        self._pending.clear()
+
+    def deliver(self, now: float) -> bool:
+        """Hız sınırı izin veriyorsa bekleyenleri teslim et"""
+        if not self._pending or now - self._last_delivery < self.min_interval:
+            return False
+
+        batches = [SampleBatch.concat(pending) for pending in self._pending.values()]
+        self._pending = {}
+        self._last_delivery = now
+        self.deliveries += 1
+
+        if self.policy == POLICY_EVERY_SAMPLE:
+            for batch in batches:
+                for row in range(len(batch)):
+                    self.callback([batch[row]])
+        else:
+            self.callback(batches)
+        return True
+
+class SampleBus:
+    """İşleme çekirdeğinin yayınladığı satırları abonelere toplu dağıtır
+
+    publish() satırı yalnızca aktif abone varken biriktirir; flush() cihaz başına tek
+    NumPy partisi kurup politikaya ve hız sınırına göre teslim eder. Tüm çağrılar
+    GUI thread'inden (alım kuyruğu boşaltılırken) yapılır.
+    """
+
+    def __init__(self, channels: Sequence[str]):
+        self.channels = list(channels)
+        self._subscriptions: List[Subscription] = []
+        self._staging: Dict[Optional[str], Dict[str, Any]] = {}
+        # Son flush'ta aktif abone yoksa satırlar biriktirilmez
+        self.is_staging = False
+
+        self.published_rows = 0
+        self.delivered_batches = 0
+
+    def subscribe(self, callback: Callable[[List[SampleBatch]], None],
+                  max_rate_hz: Optional[float] = None,
+                  policy: str = POLICY_LATEST,
+                  device_id: Optional[str] = None,
+                  active: Optional[Callable[[], bool]] = None,
+                  include_markers: bool = False) -> Subscription:
+        """Abone ekle - active() False dönerken abone hiçbir maliyet oluşturmaz"""
+        subscription = Subscription(callback, max_rate_hz, policy, device_id, active, include_markers)
+        self._subscriptions.append(subscription)
+        self.is_staging = True
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        if subscription in self._subscriptions:
+            self._subscriptions.remove(subscription)
+
+    def publish(self, device_id: Optional[str], is_primary: bool, timestamp: int,
+                raw_row: Sequence[float], calibrated_row: Sequence[float], flags: int):
+        """Depoya yazılan (veya gösterilen) satırı bir sonraki flush'a biriktir"""
+        if not self.is_staging:
+            return
+        staging = self._staging_for(device_id, is_primary)
+        staging['timestamps'].append(timestamp)
+        staging['raw'].append(raw_row)
+        staging['calibrated'].append(calibrated_row)
+        staging['flags'].append(flags)
+        self.published_rows += 1
+
+    def publish_batch(self, device_id: Optional[str], is_primary: bool, timestamps: np.ndarray,
+                      raw: np.ndarray, calibrated: np.ndarray, flags: np.ndarray):
+        """Dizi partisini satırlara bölmeden biriktir (sıra tek satırlık yayınlarla korunur)"""
+        if not self.is_staging or not len(timestamps):
+            return
+        staging = self._staging_for(device_id, is_primary)
+        self._seal_rows(device_id, staging)
+        staging['batches'].append(SampleBatch(
+            device_id, is_primary, self.channels,
+            np.asarray(timestamps, dtype=np.int64),
+            np.asarray(raw, dtype=np.float64),
+            np.asarray(calibrated, dtype=np.float64),
+            np.asarray(flags, dtype=np.uint8)
+        ))
+        self.published_rows += len(timestamps)
+
+    def _staging_for(self, device_id: Optional[str], is_primary: bool) -> Dict[str, Any]:
+        staging = self._staging.get(device_id)
+        if staging is None:
+            staging = {'is_primary': is_primary, 'timestamps': [], 'raw': [],
+                       'calibrated': [], 'flags': [], 'batches': []}
+            self._staging[device_id] = staging
+        return staging
+
+    def _seal_rows(self, device_id: Optional[str], staging: Dict[str, Any]):
+        """Tek tek biriken satırları partiye çevir"""
+        if not staging['timestamps']:
+            return
+        channel_count = len(self.channels)
+        staging['batches'].append(SampleBatch(
+            device_id, staging['is_primary'], self.channels,
+            np.asarray(staging['timestamps'], dtype=np.int64),
+            np.asarray(staging['raw'], dtype=np.float64).reshape(-1, channel_count),
+            np.asarray(staging['calibrated'], dtype=np.float64).reshape(-1, channel_count),
+            np.asarray(staging['flags'], dtype=np.uint8)
+        ))
+        for key in ('timestamps', 'raw', 'calibrated', 'flags'):
+            staging[key] = []
+
+    def flush(self, now: Optional[float] = None) -> int:
+        """Biriken satırları partiye çevir ve aktif abonelere teslim et"""
+        now = time.monotonic() if now is None else now
+        staged, self._staging = self._staging, {}
+
+        active = []
+        for subscription in self._subscriptions:
+            if subscription.is_active():
+                active.append(subscription)
+            else:
+                subscription.drop_pending()
+        self.is_staging = bool(active)
+        if not active:
+            return 0
+
+        batches = [self._build_batch(device_id, staging) for device_id, staging in staged.items()]
+
+        delivered = 0
+        for subscription in active:
+            for batch in batches:
+                if subscription.wants(batch):
+                    subscription.offer(batch)
+            try:
+                if subscription.deliver(now):
+                    delivered += 1
+            except Exception as e:
+                app_logger.error(f"Veri yolu abone callback hatası: {e}")
+        self.delivered_batches += delivered
+        return delivered
+
+    def _build_batch(self, device_id: Optional[str], staging: Dict[str, Any]) -> SampleBatch:
+        self._seal_rows(device_id, staging)
+        return SampleBatch.concat(staging['batches'])
+
+    def clear(self):
+        """Biriken ve bekleyen tüm satırları at (veriler temizlendiğinde)"""
+        self._staging = {}
+        for subscription in self._subscriptions:
+            subscription.drop_pending()
+
+    def get_stats(self) -> Dict[str, int]:
+        return {
+            'subscribers': len(self._subscriptions),
+            'published_rows': self.published_rows,
+            'delivered_batches': self.delivered_batches
+        }
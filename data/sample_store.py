@@ -0,0 +1,778 @@
+"""
+Spektroskopi Sistemi Kolon Tabanlı Örnek Deposu
+"""
+
+import os
+import shutil
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from config.constants import SENSOR_KEYS, STORE_CHUNK_SIZE, STORE_HOT_CHUNKS, OVERVIEW_MAX_POINTS
+from data.overview_pyramid import OverviewPyramid
+from data.running_stats import RunningStats, stats_summary
+from utils.logger import app_logger
+
+# Satır bayrakları: bit i -> i. kanalın bu satırda ölçümü var
+CHANNEL_FLAG_MASK = 0x0F
+# Kaybolan örnek (sıra numarası boşluğu) - kanal verisi yok, maskeli satır
+LOST_FLAG = 0x40
+# Bağlantı kesintisi işareti - grafik ve export boşluğun üzerinden enterpolasyon yapmaz
+GAP_FLAG = 0x80
+MARKER_FLAGS = LOST_FLAG | GAP_FLAG
+
+COLUMNS = ('timestamps', 'raw', 'calibrated', 'flags')
+_TS_MIN = int(np.iinfo(np.int64).min)
+_TS_MAX = int(np.iinfo(np.int64).max)
+# Diske taşınan fiziksel kolonlar - her biri oturum dizininde yalnızca sona eklenen bir dosya
+SPILL_COLUMNS = ('timestamps', 'raw', 'flags')
+
+def valid_matrix(flags: np.ndarray, channel_count: int) -> np.ndarray:
+    """(satır, kanal) geçerlilik maskesi"""
+    return ((flags[:, None] >> np.arange(channel_count)) & 1).astype(bool)
+
+def calibrate_raw(raw: np.ndarray, valid: np.ndarray, calibration: Tuple[np.ndarray, ...]) -> np.ndarray:
+    """Ham mV -> float32 kalibre değer (kalibrasyonsuz kanal ham değerdir, negatifler 0, geçersiz NaN)"""
+    slopes, intercepts, calibrated_mask = calibration
+    values = raw.astype(np.float64)
+    calibrated = np.where(calibrated_mask, np.maximum(values * slopes + intercepts, 0), values)
+    calibrated[~valid] = np.nan
+    return calibrated.astype(np.float32)
+
+class _Chunk:
+    """Önceden ayrılmış sabit boyutlu kolon bloğu - kalibre kolon fiziksel değil, sürüm anahtarlı önbellek
+
+    spill_index None değilse kolonlar oturum dosyalarının salt okunur mmap dilimleridir.
+    """
+
+    __slots__ = ('timestamps', 'raw', 'flags', 'size', 'cal_cache', 'cal_version', 'cal_rows',
+                 'spill_index', 'stat_count', 'stat_sum', 'stat_sumsq', 'stat_min', 'stat_max',
+                 'ts_min', 'ts_max', 'ts_sorted')
+
+    def __init__(self, capacity: int, channel_count: int):
+        self.timestamps = np.zeros(capacity, dtype=np.int64)
+        self.raw = np.zeros((capacity, channel_count), dtype=np.uint16)
+        self.flags = np.zeros(capacity, dtype=np.uint8)
+        self.size = 0
+        self.cal_cache: Optional[np.ndarray] = None
+        self.cal_version = -1
+        self.cal_rows = 0
+        self.spill_index: Optional[int] = None
+        # Chunk toplamları (kanal kaydırmalı) - pencere istatistiklerinde önek toplamı olarak kullanılır
+        self.stat_count = np.zeros(channel_count, dtype=np.int64)
+        self.stat_sum = np.zeros(channel_count, dtype=np.float64)
+        self.stat_sumsq = np.zeros(channel_count, dtype=np.float64)
+        self.stat_min = np.full(channel_count, 0xFFFF, dtype=np.uint16)
+        self.stat_max = np.zeros(channel_count, dtype=np.uint16)
+        # Zaman indeksi: chunk'ın damga aralığı ve chunk içinde sıralı mı
+        self.ts_min = _TS_MAX
+        self.ts_max = _TS_MIN
+        self.ts_sorted = True
+
+    def note_times(self, row: int, timestamps: np.ndarray):
+        """row'dan itibaren yazılan damgalarla aralığı ve sıralılık bayrağını güncelle"""
+        first = int(timestamps[0])
+        if self.ts_sorted and ((row and first < self.timestamps[row - 1]) or
+                               (len(timestamps) > 1 and (np.diff(timestamps) < 0).any())):
+            self.ts_sorted = False
+        self.ts_min = min(self.ts_min, int(timestamps.min()))
+        self.ts_max = max(self.ts_max, int(timestamps.max()))
+
+    def nbytes(self) -> int:
+        """RAM'de ayrılmış byte (diske taşınmış kolonlar sayılmaz)"""
+        cache_bytes = self.cal_cache.nbytes if self.cal_cache is not None else 0
+        if self.spill_index is not None:
+            return cache_bytes
+        return self.timestamps.nbytes + self.raw.nbytes + self.flags.nbytes + cache_bytes
+
+class StoreSnapshot:
+    """Deponun bir nesildeki salt okunur görünümü - kolonlar yazılamaz NumPy dizileridir
+
+    Tek chunk içindeki aralıklar kopyasız görünümdür; chunk satırları yazıldıktan sonra
+    değişmediği için okuyucu yarım güncellenmiş veri görmez. Kalibre kolon ilk erişimde
+    görünüm anındaki katsayılarla hesaplanır.
+    """
+
+    __slots__ = ('generation', 'channels', 'timestamps', 'raw', 'flags',
+                 '_calibration', '_calibrated')
+
+    def __init__(self, generation: int, channels: List[str], timestamps: np.ndarray,
+                 raw: np.ndarray, flags: np.ndarray, calibration: Tuple[np.ndarray, ...]):
+        self.generation = generation
+        self.channels = channels
+        self.timestamps = timestamps
+        self.raw = raw
+        self.flags = flags
+        self._calibration = calibration
+        self._calibrated: Optional[np.ndarray] = None
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+    @property
+    def calibrated(self) -> np.ndarray:
+        if self._calibrated is None:
+            calibrated = calibrate_raw(self.raw, valid_matrix(self.flags, len(self.channels)),
+                                       self._calibration)
+            calibrated.flags.writeable = False
+            self._calibrated = calibrated
+        return self._calibrated
+
+    def valid(self, channel: int) -> np.ndarray:
+        """Kanalın geçerli satır maskesi"""
+        return ((self.flags >> channel) & 1).astype(bool)
+
+class SampleStore:
+    """Chunk'lı kolon deposu: uint16 ham mV, int64 ns zaman damgası, uint8 bayrak
+
+    Kalibre değerler saklanmaz; column('calibrated') ham kolondan güncel katsayılarla
+    tembel hesaplanır ve chunk başına kalibrasyon sürümüyle önbelleğe alınır.
+
+    spill_directory verilirse RAM'de yalnızca son hot_chunks chunk kalır; daha eski dolu
+    chunk'lar kolon başına sona eklenen dosyalara yazılıp mmap görünümüyle okunur.
+    Okuma API'si değişmez, uzun oturumlarda bellek sabit kalır ve veri atılmaz.
+    """
+
+    def __init__(self, channels: Sequence[str] = SENSOR_KEYS,
+                 chunk_size: int = STORE_CHUNK_SIZE,
+                 max_rows: Optional[int] = None,
+                 spill_directory: Optional[str] = None,
+                 hot_chunks: int = STORE_HOT_CHUNKS):
+        self.channels = list(channels)
+        self.channel_index = {name: i for i, name in enumerate(self.channels)}
+        self.chunk_size = int(chunk_size)
+        # None -> sınırsız (tüm veriler export için korunur)
+        self.max_rows = max_rows
+
+        self._chunks: List[_Chunk] = []
+        self._head = 0      # İlk chunk içinde atılmış satır sayısı
+        self._length = 0
+
+        # Diske taşıma: taşınmış chunk'lar listenin başındadır, _first_hot ilk RAM chunk'ıdır
+        self.spill_directory = spill_directory
+        self.spill_enabled = spill_directory is not None
+        self.hot_chunks = max(1, int(hot_chunks))
+        self._first_hot = 0
+        self._spilled_chunks = 0
+        self._spill_files: Optional[Dict[str, object]] = None
+
+        # O(1) son değer erişimi için kanal bazlı son geçerli değerler
+        self._latest_raw = np.zeros(len(self.channels), dtype=np.uint16)
+        self._latest_seen = np.zeros(len(self.channels), dtype=bool)
+        self._latest_timestamp = 0
+
+        # Zaman indeksi: chunk başına ilk damga (tembel) + chunk içi ikili arama.
+        # Sıra dışı damga eklenirse time_sorted düşer; aramalar o zaman chunk damga
+        # aralıklarıyla adaylara iner ve yalnızca sırası bozuk chunk'lar taranır.
+        self.time_sorted = True
+        self._last_appended = None
+        self._chunk_starts: Optional[np.ndarray] = None
+        self._chunk_bounds: Optional[Tuple[np.ndarray, np.ndarray]] = None
+
+        # Eklemeyle birlikte güncellenen özet seviyeleri (RAM'de kalır, ham satırların küçük bir kesri)
+        self.pyramid = OverviewPyramid(len(self.channels))
+
+        # Tüm oturum istatistikleri (Welford, O(1) okuma) ve pencere sorguları için chunk
+        # toplamlarının önekleri. Toplamlar kanalın ilk değeriyle kaydırılır (sayısal kararlılık).
+        self.stats = RunningStats(len(self.channels))
+        self._stat_shift = np.zeros(len(self.channels), dtype=np.float64)
+        self._shift_set = np.zeros(len(self.channels), dtype=bool)
+        self._stat_prefix: Optional[Dict[str, np.ndarray]] = None
+
+        # Kanal bazlı eğim / kesişim / kalibrasyon var mı - değiştikçe sürüm artar
+        channel_count = len(self.channels)
+        self._calibration = (np.ones(channel_count), np.zeros(channel_count),
+                             np.zeros(channel_count, dtype=bool))
+        self.calibration_version = 0
+
+        # Her değişiklikte artar - görüntüleyiciler değişmeyen nesilde işi atlar
+        self.generation = 0
+
+    def __len__(self) -> int:
+        return self._length
+
+    def set_calibration(self, slopes: Sequence[float], intercepts: Sequence[float],
+                        calibrated_mask: Sequence[bool]) -> None:
+        """Kalibrasyon katsayılarını değiştir - kayıtlı veriye dokunulmaz, görünüm yeniden hesaplanır"""
+        self._calibration = (np.asarray(slopes, dtype=np.float64),
+                             np.asarray(intercepts, dtype=np.float64),
+                             np.asarray(calibrated_mask, dtype=bool))
+        self.calibration_version += 1
+        self.generation += 1
+
+    def calibrate(self, raw_values: np.ndarray, flags: np.ndarray) -> np.ndarray:
+        """Ham satırları güncel katsayılarla kalibre et"""
+        return calibrate_raw(np.asarray(raw_values),
+                             valid_matrix(np.asarray(flags, dtype=np.uint8), len(self.channels)),
+                             self._calibration)
+
+    def _new_chunk(self) -> _Chunk:
+        """Yeni chunk aç - sıcak pencere aşıldıysa en eski dolu chunk'lar diske taşınır"""
+        chunk = _Chunk(self.chunk_size, len(self.channels))
+        self._chunks.append(chunk)
+        self._chunk_starts = None
+        self._chunk_bounds = None
+        self._stat_prefix = None
+        while (self.spill_enabled and
+               len(self._chunks) - self._first_hot > self.hot_chunks):
+            if not self._spill_chunk(self._chunks[self._first_hot]):
+                break
+            self._first_hot += 1
+        return chunk
+
+    def _spill_path(self, name: str) -> str:
+        return os.path.join(self.spill_directory, f"{name}.bin")
+
+    def _spill_chunk(self, chunk: _Chunk) -> bool:
+        """Dolu chunk'ı oturum dosyalarının sonuna yaz ve kolonlarını mmap görünümüne çevir"""
+        try:
+            if self._spill_files is None:
+                os.makedirs(self.spill_directory, exist_ok=True)
+                self._spill_files = {name: open(self._spill_path(name), 'wb')
+                                     for name in SPILL_COLUMNS}
+                app_logger.info(f"Depo diske taşıma başladı: {self.spill_directory}")
+            for name in SPILL_COLUMNS:
+                spill_file = self._spill_files[name]
+                spill_file.write(getattr(chunk, name).tobytes())
+                spill_file.flush()
+        except OSError as e:
+            # Disk kullanılamıyorsa veri kaybetmemek için RAM'de devam edilir
+            app_logger.error(f"Depo diske taşıma hatası (RAM'de devam ediliyor): {e}")
+            self.spill_enabled = False
+            return False
+
+        chunk.spill_index = self._spilled_chunks
+        chunk.cal_cache = None
+        chunk.cal_version = -1
+        self._spilled_chunks += 1
+        self._remap_spilled()
+        return True
+
+    def _remap_spilled(self):
+        """Dosyaları güncel boyutlarıyla yeniden eşle - taşınmış chunk'lar yeni eşlemeye bağlanır
+
+        Chunk başına ayrı eşleme dosya tanıtıcısı tükettiği için kolon başına tek eşleme
+        tutulur; eski eşleme ona bağlı son görünüm bırakıldığında kapanır.
+        """
+        cs = self.chunk_size
+        template = _Chunk(0, len(self.channels))
+        mapped = {}
+        for name in SPILL_COLUMNS:
+            column = getattr(template, name)
+            mapped[name] = np.asarray(np.memmap(
+                self._spill_path(name), dtype=column.dtype, mode='r',
+                shape=(self._spilled_chunks * cs,) + column.shape[1:]
+            ))
+        for chunk in self._chunks:
+            if chunk.spill_index is None:
+                break
+            rows = slice(chunk.spill_index * cs, (chunk.spill_index + 1) * cs)
+            for name in SPILL_COLUMNS:
+                setattr(chunk, name, mapped[name][rows])
+
+    def _release_spill(self):
+        """Oturum dosyalarını kapat ve sil - taşıma sayaçları sıfırlanır"""
+        if self._spill_files is not None:
+            for spill_file in self._spill_files.values():
+                try:
+                    spill_file.close()
+                except OSError as e:
+                    app_logger.error(f"Depo dosyası kapatma hatası: {e}")
+            self._spill_files = None
+            shutil.rmtree(self.spill_directory, ignore_errors=True)
+        self._first_hot = 0
+        self._spilled_chunks = 0
+
+    def append(self, timestamp_ns: int, raw_values: Sequence[float], flags: int) -> None:
+        """Tek satır ekle - geçersiz kanallar flags ile işaretlenir"""
+        if not self._chunks or self._chunks[-1].size == self.chunk_size:
+            self._new_chunk()
+
+        chunk = self._chunks[-1]
+        row = chunk.size
+        chunk.timestamps[row] = timestamp_ns
+        chunk.raw[row] = np.clip(np.rint(raw_values), 0, 0xFFFF)
+        chunk.flags[row] = flags
+        chunk.note_times(row, chunk.timestamps[row:row + 1])
+        chunk.size += 1
+        self._length += 1
+        self.generation += 1
+        self._track_order(timestamp_ns, timestamp_ns)
+        row_valid = valid_matrix(chunk.flags[row:row + 1], len(self.channels))
+        self.pyramid.add(chunk.timestamps[row:row + 1], chunk.raw[row:row + 1], row_valid,
+                         (chunk.flags[row:row + 1] & MARKER_FLAGS) != 0)
+        self._accumulate(chunk, chunk.raw[row:row + 1], row_valid)
+        self.stats.add_row(chunk.raw[row], row_valid[0])
+
+        valid = [(flags >> i) & 1 for i in range(len(self.channels))]
+        for i, is_valid in enumerate(valid):
+            if is_valid:
+                self._latest_raw[i] = chunk.raw[row, i]
+                self._latest_seen[i] = True
+        self._latest_timestamp = timestamp_ns
+
+        if self.max_rows is not None and self._length > self.max_rows + self.chunk_size:
+            self.discard_oldest(self.max_rows)
+
+    def append_batch(self, timestamps: np.ndarray, raw_values: np.ndarray,
+                     flags: np.ndarray) -> None:
+        """Çok satırı tek seferde ekle - chunk sınırlarında dilim kopyası, satır döngüsü yok"""
+        timestamps = np.asarray(timestamps, dtype=np.int64)
+        count = len(timestamps)
+        if not count:
+            return
+        raw = np.clip(np.rint(raw_values), 0, 0xFFFF).astype(np.uint16)
+        flags = np.asarray(flags, dtype=np.uint8)
+        valid = valid_matrix(flags, len(self.channels))
+
+        written = 0
+        while written < count:
+            if not self._chunks or self._chunks[-1].size == self.chunk_size:
+                self._new_chunk()
+            chunk = self._chunks[-1]
+            take = min(self.chunk_size - chunk.size, count - written)
+            rows = slice(chunk.size, chunk.size + take)
+            source = slice(written, written + take)
+            chunk.timestamps[rows] = timestamps[source]
+            chunk.raw[rows] = raw[source]
+            chunk.flags[rows] = flags[source]
+            chunk.note_times(chunk.size, timestamps[source])
+            self._accumulate(chunk, raw[source], valid[source])
+            chunk.size += take
+            written += take
+        self._length += count
+        self.generation += 1
+        if count > 1 and (np.diff(timestamps) < 0).any():
+            self.time_sorted = False
+        self._track_order(int(timestamps[0]), int(timestamps[-1]))
+        self.pyramid.add(timestamps, raw, valid, (flags & MARKER_FLAGS) != 0)
+        self.stats.add_batch(raw, valid)
+
+        # Son değerler: her kanalın partideki son geçerli satırı
+        for i in range(len(self.channels)):
+            valid_rows = np.flatnonzero((flags >> i) & 1)
+            if len(valid_rows):
+                self._latest_raw[i] = raw[valid_rows[-1], i]
+                self._latest_seen[i] = True
+        data_rows = np.flatnonzero((flags & MARKER_FLAGS) == 0)
+        if len(data_rows):
+            self._latest_timestamp = int(timestamps[data_rows[-1]])
+
+        if self.max_rows is not None and self._length > self.max_rows + self.chunk_size:
+            self.discard_oldest(self.max_rows)
+
+    def _accumulate(self, chunk: _Chunk, raw: np.ndarray, valid: np.ndarray):
+        """Satırları chunk toplamlarına ekle - kanalın ilk geçerli değeri kaydırma olur"""
+        new_channels = ~self._shift_set & valid.any(axis=0)
+        if new_channels.any():
+            first_rows = valid.argmax(axis=0)
+            self._stat_shift[new_channels] = raw[first_rows, np.arange(len(self.channels))][new_channels]
+            self._shift_set |= new_channels
+        count, total, squares, mins, maxs = self._sums(raw, valid)
+        chunk.stat_count += count
+        chunk.stat_sum += total
+        chunk.stat_sumsq += squares
+        np.minimum(chunk.stat_min, mins, out=chunk.stat_min)
+        np.maximum(chunk.stat_max, maxs, out=chunk.stat_max)
+
+    def _sums(self, raw: np.ndarray, valid: np.ndarray):
+        """Kaydırmalı sayı / toplam / kare toplamı / min / maks (geçersiz hücreler sayılmaz)"""
+        shifted = np.where(valid, raw.astype(np.float64) - self._stat_shift, 0.0)
+        return (valid.sum(axis=0), shifted.sum(axis=0), (shifted * shifted).sum(axis=0),
+                np.where(valid, raw, 0xFFFF).min(axis=0).astype(np.uint16),
+                np.where(valid, raw, 0).max(axis=0).astype(np.uint16))
+
+    def append_gap(self, timestamp_ns: int) -> None:
+        """Kesinti işaret satırı ekle"""
+        self.append_marker(timestamp_ns, GAP_FLAG)
+
+    def append_marker(self, timestamp_ns: int, marker_flag: int) -> None:
+        """İşaret satırı ekle (GAP/LOST - kanal verisi yok, son değerler değişmez)"""
+        if not self._chunks or self._chunks[-1].size == self.chunk_size:
+            self._new_chunk()
+
+        chunk = self._chunks[-1]
+        row = chunk.size
+        chunk.timestamps[row] = timestamp_ns
+        chunk.raw[row] = 0
+        chunk.flags[row] = marker_flag
+        chunk.note_times(row, chunk.timestamps[row:row + 1])
+        chunk.size += 1
+        self._length += 1
+        self.generation += 1
+        self._track_order(timestamp_ns, timestamp_ns)
+        # Özet kovası işaretlenir - uzaklaştırılmış görünümde kesinti NaN olarak kalır
+        self.pyramid.add(chunk.timestamps[row:row + 1], chunk.raw[row:row + 1],
+                         np.zeros((1, len(self.channels)), dtype=bool), np.ones(1, dtype=bool))
+
+    def _track_order(self, first_ns: int, last_ns: int):
+        """Eklenen damgalar öncekilerden geri gidiyorsa zaman indeksi sıralı sayılmaz"""
+        if self._last_appended is not None and first_ns < self._last_appended:
+            self.time_sorted = False
+        self._last_appended = last_ns
+
+    def latest_raw(self) -> np.ndarray:
+        """Kanal bazlı son geçerli ham değerler (O(1))"""
+        return self._latest_raw.copy()
+
+    def latest_calibrated(self) -> np.ndarray:
+        """Kanal bazlı son geçerli kalibre değerler (O(1), güncel katsayılarla)"""
+        return calibrate_raw(self._latest_raw, self._latest_seen, self._calibration)
+
+    def latest_timestamp(self) -> Optional[int]:
+        return self._latest_timestamp if self._length else None
+
+    def _chunk_first_timestamps(self) -> np.ndarray:
+        """Chunk başına ilk (atılmamış) satırın damgası - chunk sayısı değişince yeniden kurulur"""
+        if self._chunk_starts is None:
+            self._chunk_starts = np.array(
+                [chunk.timestamps[self._head if ci == 0 else 0] for ci, chunk in enumerate(self._chunks)],
+                dtype=np.int64
+            )
+        return self._chunk_starts
+
+    def _search_time(self, timestamp_ns: int, side: str) -> int:
+        """Sıralı damgalarda ikili arama: chunk indeksinde, sonra chunk içinde (mantıksal satır)"""
+        starts = self._chunk_first_timestamps()
+        ci = max(int(np.searchsorted(starts, timestamp_ns, side)) - 1, 0)
+        chunk = self._chunks[ci]
+        lo = self._head if ci == 0 else 0
+        row = lo + int(np.searchsorted(chunk.timestamps[lo:chunk.size], timestamp_ns, side))
+        return ci * self.chunk_size + row - self._head
+
+    def _chunk_time_bounds(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Chunk başına en küçük / en büyük damga - kapanmış chunk'lar önbellekte, son chunk canlı okunur"""
+        if self._chunk_bounds is None:
+            closed = self._chunks[:-1]
+            self._chunk_bounds = (np.array([chunk.ts_min for chunk in closed], dtype=np.int64),
+                                  np.array([chunk.ts_max for chunk in closed], dtype=np.int64))
+        mins, maxs = self._chunk_bounds
+        last = self._chunks[-1]
+        return np.append(mins, last.ts_min), np.append(maxs, last.ts_max)
+
+    def _chunk_matches(self, ci: int, start_ns: int, stop_ns: int) -> Tuple[int, int]:
+        """Chunk içinde aralığa düşen ilk ve son satır (mantıksal, son satır dahil) - yoksa (-1, -1)"""
+        chunk = self._chunks[ci]
+        lo = self._head if ci == 0 else 0
+        timestamps = chunk.timestamps[lo:chunk.size]
+        if chunk.ts_sorted:
+            first = int(np.searchsorted(timestamps, start_ns, 'left'))
+            last = int(np.searchsorted(timestamps, stop_ns, 'right')) - 1
+            if first > last:
+                return -1, -1
+        else:
+            rows = np.flatnonzero((timestamps >= start_ns) & (timestamps <= stop_ns))
+            if not len(rows):
+                return -1, -1
+            first, last = int(rows[0]), int(rows[-1])
+        offset = ci * self.chunk_size + lo - self._head
+        return offset + first, offset + last
+
+    def time_range(self, start_ns: Optional[int] = None,
+                   stop_ns: Optional[int] = None) -> Tuple[int, int]:
+        """start_ns <= t <= stop_ns satırlarının [başlangıç, bitiş) sınırları (O(log n))
+
+        Sıra dışı damga eklenmiş depoda sınırlar eşleşen ilk ve son satırı kapsar;
+        çağıran aralık içinde maskeyle süzmelidir. Bu durumda da yalnızca damga aralığı
+        sorguyla kesişen chunk'lara bakılır, içi sıralı olanlarda ikili arama yapılır.
+        """
+        if not self._length:
+            return 0, 0
+        if not self.time_sorted:
+            start_ns = _TS_MIN if start_ns is None else int(start_ns)
+            stop_ns = _TS_MAX if stop_ns is None else int(stop_ns)
+            mins, maxs = self._chunk_time_bounds()
+            candidates = np.flatnonzero((maxs >= start_ns) & (mins <= stop_ns)).tolist()
+            first = last = -1
+            for ci in candidates:
+                first, _ = self._chunk_matches(ci, start_ns, stop_ns)
+                if first >= 0:
+                    break
+            for ci in reversed(candidates):
+                _, last = self._chunk_matches(ci, start_ns, stop_ns)
+                if last >= 0:
+                    break
+            return (first, last + 1) if first >= 0 else (0, 0)
+
+        start = self._search_time(start_ns, 'left') if start_ns is not None else 0
+        stop = self._search_time(stop_ns, 'right') if stop_ns is not None else self._length
+        return start, max(start, stop)
+
+    def get_overview(self, start_ns: Optional[int] = None, stop_ns: Optional[int] = None,
+                     max_points: int = OVERVIEW_MAX_POINTS,
+                     calibrated: bool = False) -> Dict[str, np.ndarray]:
+        """Aralığın en fazla max_points noktalık min/maks/ortalama özeti
+
+        Aralıkta max_points kadar satır varsa satırların kendisi (level_s = 0), yoksa
+        uygun özet seviyesi döner. calibrated=True değerleri güncel katsayılarla çevirir;
+        negatiflerin 0'a kırpıldığı kovalarda ortalama yaklaşıktır.
+        """
+        start, stop = self.time_range(start_ns, stop_ns)
+        overview = None
+        if stop - start > max_points:
+            overview = self.pyramid.query(start_ns, stop_ns, max_points)
+        if overview is None:
+            rows = self.snapshot(start, stop)
+            values = np.where(valid_matrix(rows.flags, len(self.channels)), rows.raw, np.nan)
+            overview = {'timestamps': rows.timestamps.copy(), 'min': values, 'max': values.copy(),
+                        'mean': values.copy(), 'count': (~np.isnan(values)).astype(np.uint32),
+                        'gap': (rows.flags & MARKER_FLAGS) != 0, 'level_s': 0.0}
+        if calibrated:
+            self._calibrate_overview(overview)
+        return overview
+
+    def _calibrate_overview(self, overview: Dict[str, np.ndarray]):
+        """Özet kolonlarını kalibre et - negatif eğimli kanallarda min ve maks yer değiştirir"""
+        for name in ('min', 'max', 'mean'):
+            values = overview[name]
+            overview[name] = calibrate_raw(values, ~np.isnan(values), self._calibration).astype(np.float64)
+        slopes, _, calibrated_mask = self._calibration
+        swapped = calibrated_mask & (slopes < 0)
+        if swapped.any():
+            mins = overview['min'][:, swapped].copy()
+            overview['min'][:, swapped] = overview['max'][:, swapped]
+            overview['max'][:, swapped] = mins
+
+    def statistics(self, start: Optional[int] = None, stop: Optional[int] = None,
+                   calibrated: bool = False) -> Dict[str, Dict[str, float]]:
+        """Kanal başına count / mean / std / min / maks (popülasyon std)
+
+        Tüm depo için Welford birikimleri (O(1)); [start, stop) penceresi için tam
+        chunk'lar önek toplamlarından, yalnızca iki kenar chunk satırlardan hesaplanır.
+        """
+        start, stop = self._normalize_range(start, stop)
+        if start == 0 and stop == self._length:
+            count, mean, variance = self.stats.count, self.stats.mean, self.stats.variance()
+            mins, maxs = self.stats.min, self.stats.max
+        else:
+            count, mean, variance, mins, maxs = self._window_moments(start, stop)
+        if calibrated:
+            mean, variance, mins, maxs = self._calibrate_moments(start, stop, count, mean,
+                                                                variance, mins, maxs)
+        return stats_summary(self.channels, count, mean, variance, mins, maxs)
+
+    def statistics_between(self, start_ns: Optional[int] = None, stop_ns: Optional[int] = None,
+                           calibrated: bool = False) -> Dict[str, Dict[str, float]]:
+        """Zaman penceresinin istatistikleri (sıralı depoda start_ns <= t <= stop_ns)"""
+        start, stop = self.time_range(start_ns, stop_ns)
+        if start == stop:
+            return stats_summary(self.channels, *[np.zeros(len(self.channels))] * 5)
+        return self.statistics(start, stop, calibrated)
+
+    def _chunk_prefix(self) -> Dict[str, np.ndarray]:
+        """Dolu chunk toplamlarının önekleri ve min/maks yığını - chunk sayısı değişince yeniden kurulur"""
+        if self._stat_prefix is None:
+            sealed = self._chunks[:-1]
+            channel_count = len(self.channels)
+            prefix = {}
+            for name in ('stat_count', 'stat_sum', 'stat_sumsq'):
+                stacked = np.array([getattr(chunk, name) for chunk in sealed]).reshape(-1, channel_count)
+                prefix[name] = np.vstack([np.zeros((1, channel_count)), np.cumsum(stacked, axis=0)])
+            for name in ('stat_min', 'stat_max'):
+                prefix[name] = np.array([getattr(chunk, name) for chunk in sealed],
+                                        dtype=np.uint16).reshape(-1, channel_count)
+            self._stat_prefix = prefix
+        return self._stat_prefix
+
+    def _chunk_sums(self, ci: int, lo: int, hi: int):
+        chunk = self._chunks[ci]
+        if lo == 0 and hi == chunk.size:
+            return (chunk.stat_count, chunk.stat_sum, chunk.stat_sumsq, chunk.stat_min, chunk.stat_max)
+        return self._sums(chunk.raw[lo:hi], valid_matrix(chunk.flags[lo:hi], len(self.channels)))
+
+    def _window_moments(self, start: int, stop: int):
+        """[start, stop) penceresinin sayı / ortalama / varyans / min / maks dizileri"""
+        channel_count = len(self.channels)
+        count = np.zeros(channel_count)
+        total = np.zeros(channel_count)
+        squares = np.zeros(channel_count)
+        mins = np.full(channel_count, 0xFFFF, dtype=np.uint16)
+        maxs = np.zeros(channel_count, dtype=np.uint16)
+        if start < stop:
+            cs = self.chunk_size
+            p_start = start + self._head
+            p_stop = stop + self._head
+            first_chunk = p_start // cs
+            last_chunk = (p_stop - 1) // cs
+            parts = [self._chunk_sums(first_chunk, p_start - first_chunk * cs,
+                                      min(p_stop - first_chunk * cs, cs))]
+            if last_chunk > first_chunk:
+                parts.append(self._chunk_sums(last_chunk, 0, p_stop - last_chunk * cs))
+            if last_chunk > first_chunk + 1:
+                # Aradaki dolu chunk'lar: önek farkı + yığın üzerinde vektörel min/maks
+                prefix = self._chunk_prefix()
+                middle = slice(first_chunk + 1, last_chunk)
+                parts.append((prefix['stat_count'][last_chunk] - prefix['stat_count'][first_chunk + 1],
+                              prefix['stat_sum'][last_chunk] - prefix['stat_sum'][first_chunk + 1],
+                              prefix['stat_sumsq'][last_chunk] - prefix['stat_sumsq'][first_chunk + 1],
+                              prefix['stat_min'][middle].min(axis=0),
+                              prefix['stat_max'][middle].max(axis=0)))
+            for part_count, part_total, part_squares, part_mins, part_maxs in parts:
+                count += part_count
+                total += part_total
+                squares += part_squares
+                np.minimum(mins, part_mins, out=mins)
+                np.maximum(maxs, part_maxs, out=maxs)
+
+        with np.errstate(invalid='ignore', divide='ignore'):
+            shifted_mean = np.where(count > 0, total / np.maximum(count, 1), 0.0)
+            variance = np.where(count > 0, squares / np.maximum(count, 1) - shifted_mean ** 2, 0.0)
+        mean = np.where(count > 0, shifted_mean + self._stat_shift, 0.0)
+        return (count.astype(np.int64), mean, np.maximum(variance, 0.0),
+                mins.astype(np.float64), maxs.astype(np.float64))
+
+    def _calibrate_moments(self, start: int, stop: int, count: np.ndarray, mean: np.ndarray,
+                           variance: np.ndarray, mins: np.ndarray, maxs: np.ndarray):
+        """Ham momentleri güncel katsayılarla çevir - doğrusal bölgede kesin, 0'a kırpılan kanalda satırlardan"""
+        slopes, intercepts, calibrated_mask = self._calibration
+        mean, variance, mins, maxs = mean.copy(), variance.copy(), mins.copy(), maxs.copy()
+        for channel in np.flatnonzero(calibrated_mask & (count > 0)):
+            slope, intercept = slopes[channel], intercepts[channel]
+            low, high = sorted((slope * mins[channel] + intercept, slope * maxs[channel] + intercept))
+            if low >= 0:
+                mean[channel] = slope * mean[channel] + intercept
+                variance[channel] *= slope * slope
+                mins[channel], maxs[channel] = low, high
+            else:
+                values = self.column('calibrated', start, stop)[:, channel].astype(np.float64)
+                values = values[~np.isnan(values)]
+                mean[channel], variance[channel] = values.mean(), values.var()
+                mins[channel], maxs[channel] = values.min(), values.max()
+        return mean, variance, mins, maxs
+
+    def _normalize_range(self, start: Optional[int], stop: Optional[int]):
+        start, stop, _ = slice(start, stop).indices(self._length)
+        return start, max(start, stop)
+
+    def _column_range(self, name: str, start: int, stop: int, copy: bool = True) -> np.ndarray:
+        """Mantıksal [start, stop) aralığını chunk'lar üzerinden birleştir (copy=False -> tek chunk'ta görünüm)"""
+        cs = self.chunk_size
+        p_start = start + self._head
+        p_stop = stop + self._head
+        parts = []
+        first_chunk = p_start // cs
+        last_chunk = (p_stop - 1) // cs
+        for ci in range(first_chunk, last_chunk + 1):
+            column = self._chunk_column(self._chunks[ci], name)
+            lo = p_start - ci * cs if ci == first_chunk else 0
+            hi = p_stop - ci * cs if ci == last_chunk else cs
+            parts.append(column[lo:hi])
+        if len(parts) == 1:
+            return parts[0].copy() if copy else parts[0]
+        return np.concatenate(parts)
+
+    def _chunk_column(self, chunk: _Chunk, name: str) -> np.ndarray:
+        if name != 'calibrated':
+            return getattr(chunk, name)
+        if chunk.spill_index is not None:
+            # Diske taşınmış chunk için önbellek tutulmaz (RAM sabit kalır)
+            return self.calibrate(chunk.raw, chunk.flags)
+        # Önbellek kalibrasyon sürümü ve chunk doluluğu değişmedikçe geçerli
+        if chunk.cal_version != self.calibration_version or chunk.cal_rows != chunk.size:
+            chunk.cal_cache = self.calibrate(chunk.raw[:chunk.size], chunk.flags[:chunk.size])
+            chunk.cal_version = self.calibration_version
+            chunk.cal_rows = chunk.size
+        return chunk.cal_cache
+
+    def _empty_column(self, name: str) -> np.ndarray:
+        if name == 'calibrated':
+            return np.zeros((0, len(self.channels)), dtype=np.float32)
+        return getattr(_Chunk(0, len(self.channels)), name)
+
+    def column(self, name: str, start: Optional[int] = None,
+               stop: Optional[int] = None) -> np.ndarray:
+        """Tek kolonu (timestamps/raw/calibrated/flags) dilimle"""
+        start, stop = self._normalize_range(start, stop)
+        if start == stop:
+            return self._empty_column(name)
+        return self._column_range(name, start, stop)
+
+    def slice(self, start: Optional[int] = None,
+              stop: Optional[int] = None) -> Dict[str, np.ndarray]:
+        """Tüm kolonları aynı aralıkta dilimle"""
+        return {name: self.column(name, start, stop) for name in COLUMNS}
+
+    def snapshot(self, start: Optional[int] = None,
+                 stop: Optional[int] = None) -> StoreSnapshot:
+        """Aralığın salt okunur, kopyasız (tek chunk içinde) görünümü ve nesil numarası"""
+        start, stop = self._normalize_range(start, stop)
+        columns = []
+        for name in ('timestamps', 'raw', 'flags'):
+            if start == stop:
+                column = self._empty_column(name)
+            else:
+                column = self._column_range(name, start, stop, copy=False).view()
+            column.flags.writeable = False
+            columns.append(column)
+        return StoreSnapshot(self.generation, self.channels, *columns, self._calibration)
+
+    def discard_oldest(self, keep_rows: int) -> int:
+        """En eski satırları at, son keep_rows satırı koru"""
+        drop = self._length - max(0, int(keep_rows))
+        if drop <= 0:
+            return 0
+
+        p_drop = self._head + drop
+        whole_chunks = p_drop // self.chunk_size
+        if whole_chunks:
+            del self._chunks[:whole_chunks]
+            self._first_hot = max(0, self._first_hot - whole_chunks)
+        self._head = p_drop - whole_chunks * self.chunk_size
+        self._length -= drop
+        self._chunk_starts = None
+        self._chunk_bounds = None
+        self._stat_prefix = None
+        if self._length:
+            self.pyramid.discard_before(int(self._chunks[0].timestamps[self._head]))
+        # Oturum birikimleri kalan satırlardan yeniden kurulur (önek toplamlarıyla)
+        count, mean, variance, mins, maxs = self._window_moments(0, self._length)
+        self.stats.reset()
+        self.stats.merge(count, mean, variance * count,
+                         np.where(count > 0, mins, np.inf), np.where(count > 0, maxs, -np.inf))
+        self.generation += 1
+        return drop
+
+    def clear(self):
+        """Depoyu sıfırla (diske taşınmış oturum dosyaları da silinir)"""
+        self._chunks = []
+        self._release_spill()
+        self._head = 0
+        self._length = 0
+        self._latest_raw[:] = 0
+        self._latest_seen[:] = False
+        self._latest_timestamp = 0
+        self.time_sorted = True
+        self._last_appended = None
+        self._chunk_starts = None
+        self._chunk_bounds = None
+        self.pyramid.clear()
+        self.stats.reset()
+        self._stat_shift[:] = 0
+        self._shift_set[:] = False
+        self._stat_prefix = None
+        self.generation += 1
+
+    def drop_calibrated_cache(self):
+        """Kalibre görünüm önbelleğini bırak (sonraki okumada yeniden hesaplanır)"""
+        for chunk in self._chunks:
+            chunk.cal_cache = None
+            chunk.cal_version = -1
+
+    def close(self):
+        """Oturum dosyalarını kapat ve sil - depo boşalır"""
+        self.clear()
+
+    def memory_usage(self) -> int:
+        """RAM'de ayrılmış toplam bellek (byte, kalibre önbellek ve özet piramidi dahil, diske taşınanlar hariç)"""
+        return sum(chunk.nbytes() for chunk in self._chunks) + self.pyramid.nbytes()
+
+    def spilled_rows(self) -> int:
+        """Diske taşınmış (mmap ile okunan) mantıksal satır sayısı"""
+        if not self._first_hot:
+            return 0
+        return self._first_hot * self.chunk_size - self._head
+
+    def disk_usage(self) -> int:
+        """Oturum dosyalarına yazılmış toplam byte"""
+        template = _Chunk(self.chunk_size, len(self.channels))
+        return self._spilled_chunks * sum(getattr(template, name).nbytes for name in SPILL_COLUMNS)
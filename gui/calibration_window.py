@@ -5,6 +5,7 @@ import threading
 import time
 
 from data.calibration import CalibrationManager
+from data.sample_bus import POLICY_LATEST
 from utils.logger import app_logger
 from config.constants import MIN_CALIBRATION_POINTS, MAX_CALIBRATION_POINTS
 
@@ -30,6 +31,7 @@ class CalibrationWindow:
         self.data_callback = None
         self.led_control_callback = None
         self.calibration_completed_callback = None
+        self.subscription = None
     
     def set_callbacks(self, data_callback: Optional[Callable] = None,
                      led_control_callback: Optional[Callable] = None,
@@ -39,6 +41,18 @@ class CalibrationWindow:
         self.led_control_callback = led_control_callback
         self.calibration_completed_callback = calibration_completed_callback
     
+    def subscribe(self, sample_bus):
+        """Canlı ölçümlere abone ol - pencere kapalıyken abone pasif"""
+        self.subscription = sample_bus.subscribe(self.on_samples, max_rate_hz=1.0,
+                                                 policy=POLICY_LATEST,
+                                                 active=self.is_window_open)
+    
+    def on_samples(self, batches):
+        """Birincil cihazın son ham değerleriyle bekleyen kalibrasyon noktalarını güncelle"""
+        for sensor_key, raw_value in batches[-1].latest_raw().items():
+            if raw_value > 0:  # Sadece geçerli değerler için
+                self.update_live_measurement(sensor_key, raw_value)
+    
     def open_window(self):
         """Kalibrasyon penceresini aç"""
         if self.window and self.window.winfo_exists():
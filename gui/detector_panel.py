@@ -4,6 +4,7 @@ from typing import Dict, List, Optional, Callable, Any
 
 from utils.logger import app_logger
 from config.constants import SENSOR_INFO
+from data.sample_bus import POLICY_LATEST
 from config.settings import settings_manager
 
 class DetectorPanel:
@@ -11,6 +12,8 @@ class DetectorPanel:
     def __init__(self, parent_frame: tk.Frame):
         self.parent_frame = parent_frame
         self.data_callback = None
+        self.calibration_functions_callback = None
+        self.subscription = None
         
         led_names = settings_manager.get_led_names()
         led_key_mapping = {
@@ -41,19 +44,35 @@ class DetectorPanel:
         """Veri callback'ini ayarla"""
         self.data_callback = callback
     
+    def subscribe(self, sample_bus, calibration_functions_callback: Callable):
+        """Veri yoluna abone ol - son değerler en fazla 2 saniyede bir, panel görünmüyorken abone pasif"""
+        self.calibration_functions_callback = calibration_functions_callback
+        self.subscription = sample_bus.subscribe(self.on_samples, max_rate_hz=0.5,
+                                                 policy=POLICY_LATEST, active=self.is_visible)
+    
+    def is_visible(self) -> bool:
+        """Panel ekranda mı (sekmesi seçili ve pencere açık)"""
+        try:
+            return bool(self.parent_frame.winfo_ismapped())
+        except tk.TclError:
+            return False
+    
+    def _get_calibration_functions(self) -> Dict[str, Any]:
+        if self.calibration_functions_callback:
+            return self.calibration_functions_callback()
+        if self.data_callback:
+            return self.data_callback().get('calibration_functions', {})
+        return {}
+    
     def _get_calibration_unit(self, sensor_key: str) -> str:
         """Sensör için kalibrasyon birimini al"""
         try:
-            if self.data_callback:
-                # Ana pencereden verileri al
-                data = self.data_callback()
-                if 'calibration_functions' in data:
-                    calibration_functions = data['calibration_functions']
-                    if (calibration_functions and 
-                        sensor_key in calibration_functions and 
-                        calibration_functions[sensor_key]):
-                        unit = calibration_functions[sensor_key].get('unit', 'N/A')
-                        return unit
+            calibration_functions = self._get_calibration_functions()
+            if (calibration_functions and 
+                sensor_key in calibration_functions and 
+                calibration_functions[sensor_key]):
+                unit = calibration_functions[sensor_key].get('unit', 'N/A')
+                return unit
         except Exception as e:
             app_logger.error(f"Kalibrasyon birimi alma hatası: {e}")
         
@@ -134,9 +153,6 @@ class DetectorPanel:
         # Grid yapısını oluştur
         self.setup_detector_grid(grid_frame)
         
-        # Veri güncelleme için timer başlat
-        self.update_data()
-        
         # Responsive font boyutları için pencere boyut değişikliğini dinle
         self.setup_responsive_fonts(main_frame)
     
@@ -270,20 +286,18 @@ class DetectorPanel:
         
         main_frame.bind('<Configure>', on_configure)
     
-    def update_data(self):
-        """Veri güncelleme"""
+    def on_samples(self, batches):
+        """Veri yolundan gelen birincil cihaz satırıyla göstergeleri güncelle"""
         try:
-            if self.data_callback:
-                data = self.data_callback()
-                if data:
-                    self.update_display_values(data)
-            
-            self.parent_frame.after(2000, self.update_data)
+            batch = batches[-1]
+            self.update_display_values({
+                'raw_data': batch.latest_raw(),
+                'calibrated_data': batch.latest_calibrated(),
+                'calibration_functions': self._get_calibration_functions()
+            })
             
         except Exception as e:
             app_logger.error(f"Detector panel veri güncelleme hatası: {e}")
-            # Hata durumunda da güncellemeye devam et - YAVAŞ GÜNCELLEMe
-            self.parent_frame.after(2000, self.update_data)
     
     def update_display_values(self, data):
         """Görüntülenen değerleri güncelle"""
@@ -8,7 +8,9 @@ from typing import Dict, List, Optional, Callable, Any
 import json
 
 from data.formula_engine import FormulaEngine
+from data.sample_bus import POLICY_LATEST, ALL_DEVICES
 from utils.logger import app_logger
+from utils.helpers import device_namespace
 from config.settings import settings_manager
 from datetime import datetime
 
@@ -37,6 +39,10 @@ class FormulaPanel:
         # Mevcut hesaplanan değerler
         self.calculated_values = {}
         
+        # Veri yolundan güncellenen formül girdileri (birincil + cihaz önekli kanallar)
+        self.sensor_data = {}
+        self.subscription = None
+        
         # Live modu durumu
         self.is_live_active = False
         self.live_button = None
@@ -56,8 +62,45 @@ class FormulaPanel:
         self.data_callback = callback
     
     def set_data_processor(self, data_processor):
-        """Data processor referansını ayarla"""
+        """Data processor referansını ayarla - formüller ingest sırasında depo satırlarıyla hesaplanır"""
         self.data_processor = data_processor
+        if data_processor:
+            data_processor.set_formula_engine(self.formula_engine)
+    
+    def subscribe(self, sample_bus):
+        """Tüm cihazların son değerlerine abone ol - yalnızca Live modu ve sistem çalışırken"""
+        self.subscription = sample_bus.subscribe(
+            self.on_samples,
+            max_rate_hz=1000.0 / self.calculation_interval_ms,
+            policy=POLICY_LATEST,
+            device_id=ALL_DEVICES,
+            active=self._is_receiving
+        )
+    
+    def _is_receiving(self) -> bool:
+        return bool(self.is_live_active and self.data_processor and self.data_processor.system_running)
+    
+    def on_samples(self, batches):
+        """Cihaz partilerinin son değerlerini formül girdilerine işle ve hesapla"""
+        try:
+            if not self.sensor_data and self.data_callback:
+                # Henüz gelmemiş kanallar için başlangıç değerleri
+                self.sensor_data = dict(self.data_callback())
+            
+            for batch in batches:
+                latest_values = batch.latest_raw()
+                if batch.is_primary:
+                    self.sensor_data.update(latest_values)
+                if batch.device_id is not None:
+                    namespace = device_namespace(batch.device_id)
+                    for sensor_key, value in latest_values.items():
+                        self.sensor_data[f"{namespace}_{sensor_key}"] = value
+            
+            if any(value > 0 for value in self.sensor_data.values()):
+                self.update_calculated_values_display(self.sensor_data)
+                
+        except Exception as e:
+            app_logger.error(f"Formül veri yolu güncelleme hatası: {e}")
     
     def setup_panel(self):
         """Ana paneli kur"""
@@ -600,12 +643,9 @@ class FormulaPanel:
             
             if time_since_last_calc >= self.calculation_interval_ms:
                 if self.formula_engine.formulas:
+                    # Custom data ingest sırasında data processor'da kaydedilir - burada yalnızca gösterim
                     self.calculated_values = self.formula_engine.calculate_all_available_formulas(sensor_data)
                     
-                    # Custom data'yı data processor'a kaydet (sistem zaten çalışıyor kontrolü yukarıda yapıldı)
-                    if self.calculated_values:
-                        self.data_processor.add_custom_data(self.calculated_values)
-                    
                     # Formül listesini güncelle (değerler ile)
                     self.update_formula_list()
                     
@@ -1,5 +1,6 @@
 import tkinter as tk
-from tkinter import ttk, messagebox
+from tkinter import ttk, messagebox, filedialog
+import os
 import queue
 from datetime import datetime
 from typing import Dict, List, Optional, Any
@@ -7,10 +8,12 @@ from typing import Dict, List, Optional, Any
 from config.settings import settings_manager
 from config.constants import (
     APP_TITLE, APP_GEOMETRY, SENSOR_INFO, LED_INFO,
-    UPDATE_INTERVAL_MS
+    UPDATE_INTERVAL_MS, CAPTURE_DIRECTORY
 )
 from communication.ble_manager import BLEManager
+from communication.capture import ReplaySource
 from communication.sensor_scanner import SensorScanner
+from communication.serial_transport import SerialTransport
 from data.data_processor import DataProcessor
 from data.calibration import CalibrationManager
 from data.export import DataExporter
@@ -31,9 +34,15 @@ class SpektroskpiGUI:
         
         self.style_manager = StyleManager()
         
-        self.ble_manager = BLEManager(self.on_data_received)
-        self.ble_manager.set_disconnect_callback(self.on_ble_disconnected)
         self.data_processor = DataProcessor()
+        # BLE verisi doğrudan işleme çekirdeğinin alım kuyruğuna gider
+        self.ble_manager = BLEManager(self.data_processor.ingest_queue.put)
+        self.ble_manager.set_disconnect_callback(self.post_disconnected)
+        # Yüksek hızlı alternatif: USB-CDC üzerinden aynı frame akışı
+        self.serial_transport = SerialTransport(self.data_processor.ingest_queue.put)
+        self.serial_transport.set_disconnect_callback(self.post_disconnected)
+        # Ham BLE kaydını aynı alım yolundan oynatan kaynak (Kayıt menüsü)
+        self.replay_source: Optional[ReplaySource] = None
         self.calibration_manager = CalibrationManager()
         self.data_exporter = DataExporter()
         
@@ -42,6 +51,9 @@ class SpektroskpiGUI:
         self.sensor_combo = None
         self.scan_btn = None
         self.status_label = None
+        self.link_label = None
+        self.serial_port_combo = None
+        self.serial_connect_btn = None
         
         self.start_btn = None
         self.stop_btn = None
@@ -117,6 +129,11 @@ class SpektroskpiGUI:
             value="dark",
             command=self.change_theme
         )
+        
+        capture_menu = tk.Menu(menubar, tearoff=0)
+        menubar.add_cascade(label="Kayıt", menu=capture_menu)
+        capture_menu.add_command(label="Kaydı Oynat...", command=self.replay_capture)
+        capture_menu.add_command(label="Oynatmayı Durdur", command=self.stop_replay)
     
     def setup_connection_panel(self, parent_frame):
         connection_frame = ttk.LabelFrame(parent_frame, text="BLE Connection", padding=10)
@@ -146,6 +163,15 @@ class SpektroskpiGUI:
                                      font=("Arial", 11, "bold"), foreground="red")
         self.status_label.pack(side=tk.LEFT, padx=(10, 0))
         
+        # Bağlantı kalitesi - kayan paket kaybı oranı
+        link_row = ttk.Frame(connection_frame)
+        link_row.pack(fill=tk.X, pady=(0, 5))
+        
+        ttk.Label(link_row, text="Link:", font=("Arial", 11, "bold")).pack(side=tk.LEFT)
+        
+        self.link_label = ttk.Label(link_row, text="-", font=("Arial", 10))
+        self.link_label.pack(side=tk.LEFT, padx=(10, 0))
+        
         # Scan butonu - üçüncü satır
         button_row = ttk.Frame(connection_frame)
         button_row.pack(fill=tk.X, pady=(5, 0))
@@ -154,6 +180,28 @@ class SpektroskpiGUI:
                                   command=self.scan_and_connect_sensors,
                                   style="Green.TButton")
         self.scan_btn.pack(fill=tk.X)
+        
+        self.connect_all_btn = ttk.Button(button_row, text="🔗 Connect All Sensors", 
+                                         command=self.sensor_scanner.scan_and_connect_all)
+        self.connect_all_btn.pack(fill=tk.X, pady=(5, 0))
+        
+        # USB seri bağlantı - port seçimi ve bağlan/kes
+        serial_row = ttk.Frame(connection_frame)
+        serial_row.pack(fill=tk.X, pady=(5, 0))
+        
+        ttk.Label(serial_row, text="USB:", font=("Arial", 11, "bold")).pack(side=tk.LEFT)
+        
+        self.serial_port_combo = ttk.Combobox(serial_row, width=18)
+        self.serial_port_combo.pack(side=tk.LEFT, padx=(10, 0), fill=tk.X, expand=True)
+        
+        ttk.Button(serial_row, text="↻", width=3,
+                   command=self.refresh_serial_ports).pack(side=tk.LEFT, padx=(5, 0))
+        
+        self.serial_connect_btn = ttk.Button(serial_row, text="Connect USB",
+                                             command=self.toggle_serial_connection)
+        self.serial_connect_btn.pack(side=tk.LEFT, padx=(5, 0))
+        
+        self.refresh_serial_ports()
 
         self.sensor_scanner.set_ui_components(self.sensor_combo, self.scan_btn, self.status_label)
         self.sensor_scanner.set_callbacks(
@@ -225,6 +273,8 @@ class SpektroskpiGUI:
         self.notebook.add(self.realtime_frame, text="Graph Windows")
         self.realtime_panel = RealTimePanel(self.realtime_frame)
         self.realtime_panel.set_data_callback(self.get_data_for_realtime_panel)
+        self.realtime_panel.set_snapshot_callback(
+            lambda last_rows: self.data_processor.get_snapshot(last_rows=last_rows))
         # Detector panel (4 detector real-time)
         self.detector_frame = ttk.Frame(self.notebook)
         self.notebook.add(self.detector_frame, text="Real Time Panel")
@@ -248,6 +298,8 @@ class SpektroskpiGUI:
         self.notebook.add(self.about_frame, text="About")
         self.setup_about_panel()
         
+        self.subscribe_panels()
+        
     
     def setup_about_panel(self):
         # Ana scrollable frame
@@ -341,33 +393,20 @@ In this project, I undertook the following tasks:
         canvas.pack(side="left", fill="both", expand=True)
         scrollbar.pack(side="right", fill="y")
 
-    def on_data_received(self, data_packet: Dict[str, Any]):
-        try:
-            self.data_processor.process_incoming_data(data_packet)
-            
-        except Exception as e:
-            app_logger.error(f"Veri alma hatası: {e}")
-    
     def update_data(self):
         try:
-            data_list = self.ble_manager.get_data_from_queue()
-            for data in data_list:
-                self.data_processor.process_incoming_data(data)
+            processed_count = self.data_processor.drain_ingest_queue()
             
-            if data_list:
-                app_logger.debug(f"{len(data_list)} veri paketi işlendi")
+            if processed_count:
+                app_logger.debug(f"{processed_count} veri paketi işlendi")
             
         except Exception as e:
             app_logger.error(f"Veri güncelleme hatası: {e}")
         
         self.update_plots()
         
-        self.update_sensor_displays()
-        
-        self.update_custom_panels()
-        
-        # Calibration window'a anlık değerleri gönder
-        self.update_calibration_window_with_live_data()
+        # Paneller veri yolu aboneliğiyle güncellenir (drain_ingest_queue -> sample_bus.flush)
+        self.update_link_status()
         
         self.root.after(UPDATE_INTERVAL_MS, self.update_data)
     
@@ -380,17 +419,38 @@ In this project, I undertook the following tasks:
         
         pass
     
-    def update_sensor_displays(self):   
+    def update_link_status(self):
+        """Bağlı cihazların en kötü kayan paket kaybı oranını göster"""
         try:
-            latest_values = self.data_processor.get_latest_values()
-            latest_calibrated = self.data_processor.get_latest_calibrated_values()
-            calibration_functions = self.calibration_manager.calibration_functions
-            
-            # Sensor labels kaldırıldı - live measurements artık Real Time Panel'de gösteriliyor
+            if not self.link_label:
+                return
+            
+            device_stats = list(self.ble_manager.get_device_stats().values())
+            device_stats.extend(self.serial_transport.get_device_stats().values())
+            if self.replay_source:
+                device_stats.extend(self.replay_source.get_device_stats().values())
+            connected = [stats for stats in device_stats if stats['is_connected']]
+            if not connected:
+                self.link_label.configure(text="-", foreground="gray")
+                return
+            
+            worst = max(connected, key=lambda stats: stats.get('rolling_loss_rate', 0.0))
+            loss_rate = worst.get('rolling_loss_rate', 0.0)
+            if loss_rate < 0.01:
+                color = '#4CAF50'
+            elif loss_rate < 0.05:
+                color = '#FF9800'
+            else:
+                color = '#F44336'
             
+            self.link_label.configure(
+                text=f"Loss {loss_rate * 100:.1f}% ({worst['device_id']}, "
+                     f"{worst['samples_per_second']:.0f} samples/s)",
+                foreground=color
+            )
             
         except Exception as e:
-            app_logger.error(f"Sensör görünüm güncelleme hatası: {e}")
+            app_logger.error(f"Bağlantı kalitesi güncelleme hatası: {e}")
     
     def update_calibration_window_measurements(self, sensor_key: str, raw_value: float):
         try:
@@ -400,40 +460,14 @@ In this project, I undertook the following tasks:
         except Exception as e:
             app_logger.error(f"Kalibrasyon penceresi ölçüm güncelleme hatası: {e}")
     
-    def update_calibration_window_with_live_data(self):
-        """Calibration window'a anlık raw data gönder"""
-        try:
-            if (self.calibration_window and 
-                self.calibration_window.is_window_open()):
-                
-                # En güncel raw değerleri al
-                latest_values = self.data_processor.get_latest_values()
-                
-                # Her sensör için calibration window'u güncelle
-                for sensor_key, raw_value in latest_values.items():
-                    if raw_value > 0:  # Sadece geçerli değerler için
-                        self.calibration_window.update_live_measurement(sensor_key, raw_value)
-                        
-        except Exception as e:
-            app_logger.error(f"Calibration window live data güncelleme hatası: {e}")
-    
-    
-    def update_custom_panels(self):
-        try:
-            # Formül paneli - sadece sistem çalışırken güncelle
-            if self.formula_panel and self.data_processor.system_running:
-                latest_values = self.data_processor.get_latest_values()
-                if any(v > 0 for v in latest_values.values()):  
-                    self.formula_panel.update_calculated_values_display(latest_values)
-            
-            if self.realtime_panel and self.data_processor.system_running:
-                timestamps, raw_data, spectrum_data, calibrated_data = self.get_data_for_realtime_panel()
-                if timestamps and len(timestamps) > 1:  
-                    app_logger.debug(f"RealTimePanel'e veri gönderiliyor: {len(timestamps)} timestamp")
-                    self.realtime_panel.update_graphs(timestamps, raw_data, spectrum_data, calibrated_data)
-            
-        except Exception as e:
-            app_logger.error(f"Özel panel güncelleme hatası: {e}")
+    def subscribe_panels(self):
+        """Panelleri işleme çekirdeğinin veri yoluna abone et (kendi hız ve politikalarıyla)"""
+        sample_bus = self.data_processor.sample_bus
+        self.realtime_panel.subscribe(sample_bus, lambda: self.data_processor.system_running)
+        self.detector_panel.subscribe(sample_bus, lambda: self.data_processor.calibration_functions)
+        # Birincil cihaz kanalları + cihaz önekli kanallar (d2_ch1 ...)
+        self.formula_panel.subscribe(sample_bus)
+        self.recording_panel.subscribe(sample_bus)
     
     def scan_and_connect_sensors(self):
         self.sensor_scanner.scan_and_connect_sensors()
@@ -451,6 +485,13 @@ In this project, I undertook the following tasks:
             if hasattr(self, 'status_label') and self.status_label:
                 self.status_label.configure(foreground='#F44336')  
     
+    def post_disconnected(self, device_name: str = None):
+        """Kopma bildirimi bağlantı thread'lerinden (BLE döngüsü, seri okuma, oynatma) gelir - Tk thread'ine aktar"""
+        try:
+            self.root.after(0, self.on_ble_disconnected, device_name)
+        except RuntimeError:
+            app_logger.warning(f"Disconnect bildirimi aktarılamadı - ana döngü kapalı: {device_name}")
+    
     def on_ble_disconnected(self, device_name: str = None):
         """BLE bağlantısı koptuğunda çağrılır"""
         try:
@@ -465,8 +506,101 @@ In this project, I undertook the following tasks:
         except Exception as e:
             app_logger.error(f"BLE disconnect callback hatası: {e}")
     
+    def refresh_serial_ports(self):
+        """Seri port listesini yenile - son kullanılan port öne seçilir"""
+        try:
+            if not self.serial_port_combo:
+                return
+            
+            ports = self.serial_transport.list_ports()
+            self.serial_port_combo['values'] = ports
+            
+            saved_port = settings_manager.get('connection.serial_port')
+            current = self.serial_port_combo.get()
+            if not current:
+                if saved_port:
+                    self.serial_port_combo.set(saved_port)
+                elif ports:
+                    self.serial_port_combo.set(ports[0])
+            
+            if not self.serial_transport.is_available():
+                self.serial_connect_btn.configure(state=tk.DISABLED)
+            
+        except Exception as e:
+            app_logger.error(f"Seri port yenileme hatası: {e}")
+    
+    def toggle_serial_connection(self):
+        """USB seri bağlantısını aç / kapat"""
+        try:
+            if self.serial_transport.is_connected:
+                self.serial_transport.disconnect()
+                self.serial_connect_btn.configure(text="Connect USB")
+                return
+            
+            port = self.serial_port_combo.get().strip()
+            if not port:
+                messagebox.showwarning("Warning", "Seri port seçin!")
+                return
+            
+            self.serial_transport.baudrate = settings_manager.get('connection.serial_baudrate',
+                                                                  self.serial_transport.baudrate)
+            if not self.serial_transport.connect_to_device(port):
+                messagebox.showerror("Error", f"Seri port açılamadı: {port}")
+                return
+            
+            settings_manager.set('connection.serial_port', port)
+            self.serial_connect_btn.configure(text="Disconnect USB")
+            self.status_label.configure(
+                text=f"Connected: {self.serial_transport.current_device_name}",
+                foreground='#4CAF50'
+            )
+            
+        except Exception as e:
+            app_logger.error(f"Seri bağlantı hatası: {e}")
+    
+    def replay_capture(self):
+        """Ham BLE kayıt dosyasını canlı akış gibi oynat (donanımsız yeniden analiz)"""
+        try:
+            if self.ble_manager.is_connected or self.serial_transport.is_connected:
+                messagebox.showwarning("Warning", "Kayıt oynatmak için önce bağlantıyı kesin!")
+                return
+            
+            path = filedialog.askopenfilename(
+                title="Kayıt Dosyası Seç",
+                initialdir=CAPTURE_DIRECTORY if os.path.isdir(CAPTURE_DIRECTORY) else None,
+                filetypes=[("Capture files", "*.spcap"), ("All files", "*.*")]
+            )
+            if not path:
+                return
+            
+            self.stop_replay()
+            self.replay_source = ReplaySource(
+                path, self.data_processor.ingest_queue.put,
+                pressure_check=self.data_processor.ingest_queue.is_under_pressure
+            )
+            self.replay_source.set_disconnect_callback(self.post_disconnected)
+            if not self.replay_source.start():
+                messagebox.showerror("Error", f"Kayıt oynatılamadı: {path}")
+                return
+            
+            self.status_label.configure(
+                text=f"Replay: {os.path.basename(path)}",
+                foreground='#4CAF50'
+            )
+            log_system_event(app_logger, "REPLAY_STARTED", f"File: {path}")
+            
+        except Exception as e:
+            app_logger.error(f"Kayıt oynatma hatası: {e}")
+            messagebox.showerror("Error", f"Kayıt oynatılamadı: {e}")
+    
+    def stop_replay(self):
+        """Devam eden kayıt oynatmayı durdur"""
+        if self.replay_source:
+            self.replay_source.shutdown()
+    
     def start_system(self):
-        if not self.ble_manager.is_connected:
+        if not (self.ble_manager.is_connected or self.serial_transport.is_connected or
+                (self.replay_source and self.replay_source.is_connected)):
             messagebox.showwarning("Warning", "Önce sisteme bağlanın!")
             return
         
@@ -505,6 +639,7 @@ In this project, I undertook the following tasks:
                 led_control_callback=self.control_calibration_led,
                 calibration_completed_callback=self.on_calibration_completed
             )
+            self.calibration_window.subscribe(self.data_processor.sample_bus)
         
         self.calibration_window.open_window()
     
@@ -539,15 +674,15 @@ In this project, I undertook the following tasks:
             return
         
         try:
-            # Export verilerini hazırla
-            export_data = self.data_processor.export_data_for_csv()
-            
-            # CSV'ye aktar
-            success, result = self.data_exporter.export_to_csv(export_data)
+            # CSV'ye partiler halinde aktar - oturumun tamamı belleğe alınmaz
+            success, result = self.data_exporter.export_batches_to_csv(
+                self.data_processor.iter_export_batches(),
+                self.data_processor.get_custom_formula_names())
             
             if success:
-                # Özet oluştur ve göster
-                summary = self.data_exporter.create_export_summary(export_data)
+                # Özet oluştur ve göster (satır sayaçları export sırasında toplandı)
+                summary = self.data_exporter.create_export_summary(
+                    None, self.data_processor.get_export_statistics())
                 self.data_exporter.show_export_success_message(result, summary)
                 
                 log_system_event(app_logger, "DATA_EXPORTED", f"File: {result}")
@@ -889,6 +1024,9 @@ In this project, I undertook the following tasks:
            
             if self.ble_manager.is_connected:
                 self.ble_manager.disconnect()
+            self.serial_transport.shutdown()
+            self.ble_manager.shutdown()
+            self.stop_replay()
             
 
             
@@ -903,6 +1041,9 @@ In this project, I undertook the following tasks:
            
             settings_manager.save_settings()
             
+            # Diske taşınmış oturum depolarını kapat
+            self.data_processor.close()
+            
             log_system_event(app_logger, "APPLICATION_EXIT")
             
            
@@ -930,6 +1071,14 @@ In this project, I undertook the following tasks:
             if self.formula_panel:
                 self.formula_panel.load_formulas_from_settings()
             
+            self.ble_manager.auto_reconnect = settings_manager.get('connection.auto_reconnect', True)
+            self.serial_transport.auto_reconnect = self.ble_manager.auto_reconnect
+            
+            # Saha oturumlarını tekrar oynatabilmek için ham BLE kaydı
+            if settings_manager.get('connection.capture_raw', False):
+                self.ble_manager.start_capture()
+                self.serial_transport.set_capture_writer(self.ble_manager.capture_writer)
+            
             app_logger.info("Uygulama ayarları yüklendi")
             
         except Exception as e:
@@ -937,6 +1086,8 @@ In this project, I undertook the following tasks:
     
     def start_auto_connection(self):
         if self.ble_manager.is_available():
+            # Önbellek dolmaya başlasın - Scan & Connect anında sonuç verir
+            self.ble_manager.start_background_scan()
             self.sensor_scanner.start_auto_connection()
         else:
             app_logger.warning("BLE mevcut değil, otomatik bağlantı devre dışı")
@@ -983,7 +1134,7 @@ In this project, I undertook the following tasks:
     def get_data_for_formula_panel(self) -> Dict[str, float]:
         """Formül paneli için en son sensör değerlerini al"""
         try:
-            return self.data_processor.get_latest_values()
+            return self.data_processor.get_formula_sensor_data()
         except Exception as e:
             app_logger.error(f"Formül panel veri alma hatası: {e}")
             return {}
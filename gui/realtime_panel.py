@@ -11,10 +11,13 @@ except ImportError:
     pg = None
     print("PyQtGraph not available for realtime panel")
 
+import numpy as np
+
 from utils.logger import app_logger
-from config.constants import PLOT_COLORS, MATPLOTLIB_COLORS
+from config.constants import PLOT_COLORS, MATPLOTLIB_COLORS, REALTIME_DISPLAY_POINTS
 from config.settings import settings_manager
 from plotting.pyqt_subprocess import PyQtSubprocessManager
+from data.sample_bus import POLICY_LATEST
 
 class RealTimePanel:    
     def __init__(self, parent_frame: tk.Frame):
@@ -25,12 +28,76 @@ class RealTimePanel:
         self.raw_data_btn = None
         self.cal_data_btn = None
         self.data_callback = None
+        self.snapshot_callback = None
+        self.subscription = None
+        # Son gönderilen depo nesli - değişmediyse grafikler yeniden yazılmaz
+        self._last_generation = None
         
         self.setup_panel()
 
     def set_data_callback(self, callback: Callable):
         self.data_callback = callback
     
+    def set_snapshot_callback(self, callback: Callable[[int], Any]):
+        """callback(last_rows) -> StoreSnapshot (deponun son satırlarının salt okunur görünümü)"""
+        self.snapshot_callback = callback
+    
+    def subscribe(self, sample_bus, running_callback: Callable[[], bool]):
+        """Yeni satır geldiğinde grafikleri yenile - grafik penceresi yokken abone pasif
+
+        Teslim yalnızca değişiklik bildirimidir (veri depo görünümünden okunur), partiler biriktirilmez.
+        """
+        self.subscription = sample_bus.subscribe(
+            self.on_samples,
+            max_rate_hz=1.0,
+            policy=POLICY_LATEST,
+            active=lambda: running_callback() and self.has_active_windows()
+        )
+    
+    def has_active_windows(self) -> bool:
+        return (self.pyqt_manager.is_window_active("raw_data") or
+                self.pyqt_manager.is_window_active("cal_data"))
+    
+    def on_samples(self, batches):
+        """Depoya yeni satır yazıldı - grafik verisini bir kez hazırlayıp gönder"""
+        try:
+            if self.snapshot_callback:
+                self.update_graphs_from_snapshot(self.snapshot_callback(REALTIME_DISPLAY_POINTS))
+                return
+            if not self.data_callback:
+                return
+            timestamps, raw_data, spectrum_data, calibrated_data = self.data_callback()
+            if timestamps and len(timestamps) > 1:
+                app_logger.debug(f"RealTimePanel'e veri gönderiliyor: {len(timestamps)} timestamp")
+                self.update_graphs(timestamps, raw_data, spectrum_data, calibrated_data)
+        except Exception as e:
+            app_logger.error(f"RealTimePanel veri yolu güncelleme hatası: {e}")
+    
+    def update_graphs_from_snapshot(self, snapshot):
+        """Salt okunur depo görünümünden grafikleri güncelle - nesil değişmediyse hiçbir iş yapılmaz
+        
+        Her kanal zaman damgalarıyla aynı uzunlukta gönderilir; geçersiz satırlar (GAP/LOST
+        işaretleri, eksik döngü kanalları) NaN olur ve çizgi orada kesilir (connect='finite').
+        """
+        if snapshot.generation == self._last_generation or len(snapshot) < 2:
+            return
+        self._last_generation = snapshot.generation
+        
+        raw_data = {}
+        calibrated_data = {}
+        for channel, sensor_key in enumerate(snapshot.channels):
+            valid = snapshot.valid(channel)
+            # Ham değerler mV olarak 4 haneli gösterilir
+            raw_data[sensor_key] = np.where(valid, np.minimum(snapshot.raw[:, channel], 9999),
+                                            np.nan).tolist()
+            # Kalibre kolonda geçersiz satırlar zaten NaN; hiç geçerli değer yoksa kanal N/A (tümü NaN)
+            calibrated_data[sensor_key] = snapshot.calibrated[:, channel].astype(np.float64).tolist()
+        
+        if self.pyqt_manager.is_window_active("raw_data"):
+            self.pyqt_manager.update_graph_data("raw_data", snapshot.timestamps, raw_data)
+        if self.pyqt_manager.is_window_active("cal_data"):
+            self.pyqt_manager.update_graph_data("cal_data", snapshot.timestamps, calibrated_data)
+    
     def setup_panel(self):
         main_frame = ttk.Frame(self.parent_frame)
         main_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
@@ -277,7 +344,7 @@ class RealTimePanel:
                 app_logger.debug(f"RealTimePanel veri alındı: {len(timestamps)} zaman, {len(raw_data)} sensör")
                 
                 # BÜYÜK VERİ SETİ OPTİMİZASYONU - Son 1000 veri noktasını göster
-                max_display_points = 1000
+                max_display_points = REALTIME_DISPLAY_POINTS
                 if len(timestamps) > max_display_points:
                     display_timestamps = timestamps[-max_display_points:]
                     display_raw_data = {}
@@ -8,7 +8,9 @@ import json
 import os
 
 from utils.logger import app_logger
+from utils.session_clock import session_clock
 from config.constants import SENSOR_INFO
+from data.sample_bus import POLICY_BATCH
 
 class RecordingPanel:
     
@@ -33,6 +35,11 @@ class RecordingPanel:
         self.is_recording = False
         self.recording_thread = None
         self.start_time = None
+        self.start_ns = None
+        self.stop_ns = None
+        self.sample_count = 0
+        self.subscription = None
+        self.sample_bus = None
         self.recorded_data = {
             'raw': {'UV_360nm': [], 'Blue_450nm': [], 'IR_850nm': [], 'IR_940nm': []},
             'calibrated': {'UV_360nm': [], 'Blue_450nm': [], 'IR_850nm': [], 'IR_940nm': []},
@@ -267,6 +274,9 @@ class RecordingPanel:
                 self.recorded_data[data_type][sensor_key].clear()
         
         # Recording durumunu ayarla
+        self.sample_count = 0
+        self.start_ns = session_clock.now_ns()
+        self.stop_ns = None
         self.is_recording = True
         self.start_time = datetime.now()
         
@@ -282,7 +292,7 @@ class RecordingPanel:
         if not self.is_recording:
             return
         
-        self.is_recording = False
+        self._finish_recording(session_clock.now_ns())
         
         # UI durumunu güncelle
         self.record_btn.configure(state=tk.NORMAL)
@@ -294,11 +304,73 @@ class RecordingPanel:
         
         app_logger.info("Recording stopped by user")
     
+    def _finish_recording(self, stop_ns: int):
+        """Veri yolunda bekleyen son satırları teslim aldıktan sonra kaydı kapat (GUI thread'i)
+        
+        Veri yolu UPDATE_INTERVAL_MS aralığıyla boşaltıldığı için abone pasif olmadan önce
+        son aralığın satırları alınmazsa kaydın sonu kaybolur.
+        """
+        self.stop_ns = stop_ns
+        try:
+            if self.data_processor:
+                self.data_processor.drain_ingest_queue()
+            elif self.sample_bus:
+                self.sample_bus.flush()
+        except Exception as e:
+            app_logger.error(f"Recording tail flush error: {e}")
+        self.is_recording = False
+    
+    def subscribe(self, sample_bus):
+        """Kayıt süresince birincil cihazın tüm satırlarını al - kayıt yokken abone pasif"""
+        self.sample_bus = sample_bus
+        self.subscription = sample_bus.subscribe(self.on_samples, policy=POLICY_BATCH,
+                                                 active=lambda: self.is_recording)
+    
+    def on_samples(self, batches):
+        """Kayıt başladıktan sonraki satırları kaydet (GUI thread'i)"""
+        try:
+            batch = batches[-1]
+            in_window = batch.timestamps >= self.start_ns
+            if self.stop_ns is not None:
+                in_window &= batch.timestamps <= self.stop_ns
+            if not in_window.any():
+                return
+            
+            calibration_functions = self.data_processor.calibration_functions if self.data_processor else {}
+            
+            rows = 0
+            for channel, sensor_key in enumerate(batch.channels):
+                if sensor_key not in self.recorded_data['raw']:
+                    continue
+                valid = in_window & batch.valid(channel)
+                self.recorded_data['raw'][sensor_key].extend(batch.raw[valid, channel].tolist())
+                # Kalibre değerler sadece kalibrasyonu olan sensörler için
+                if calibration_functions.get(sensor_key) is not None:
+                    self.recorded_data['calibrated'][sensor_key].extend(
+                        batch.calibrated[valid, channel].tolist())
+                rows = max(rows, int(valid.sum()))
+            
+            # Custom data kaydet (data_processor'dan son formül değerleri)
+            if self.data_processor and rows:
+                custom_data = self.data_processor.custom_data
+                if len(custom_data.get('timestamps', [])) > 0:
+                    self.recorded_data['custom']['timestamps'].append(datetime.now())
+                    for formula_name, values in custom_data.items():
+                        if formula_name != 'timestamps' and len(values) > 0:
+                            if formula_name not in self.recorded_data['custom']:
+                                self.recorded_data['custom'][formula_name] = []
+                            self.recorded_data['custom'][formula_name].append(values[-1])
+            
+            self.sample_count += rows
+            app_logger.debug(f"Recorded {self.sample_count} samples")
+            
+        except Exception as e:
+            app_logger.error(f"Recording sample error: {e}")
+    
     def recording_worker(self):
-        """Recording worker thread"""
+        """Recording worker thread - süre ve ilerleme (veri veri yolundan gelir)"""
         try:
             app_logger.debug("Recording worker started")
-            sample_count = 0
             
             while self.is_recording:
                 current_time = datetime.now()
@@ -306,61 +378,10 @@ class RecordingPanel:
                 
                 # Süre doldu mu kontrol et
                 if elapsed >= self.recording_duration:
-                    self.is_recording = False
+                    # Kayıt GUI thread'inde kapatılır (recording_completed) - son satırlar alınır
                     app_logger.debug(f"Recording duration reached: {elapsed:.1f}s")
                     break
                 
-                # Veri al
-                if self.data_callback:
-                    try:
-                        latest_data = self.data_callback()
-                        app_logger.debug(f"Got data from callback: raw keys={list(latest_data.get('raw', {}).keys()) if latest_data else 'None'}")
-                        
-                        if latest_data and 'raw' in latest_data and 'calibrated' in latest_data:
-                            data_added = False
-                            
-                            # Raw verileri kaydet
-                            for sensor_key in self.recorded_data['raw']:
-                                if sensor_key in latest_data['raw']:
-                                    value = latest_data['raw'][sensor_key]
-                                    # Değer kontrolünü gevşet - 0 değeri de kabul et
-                                    if value is not None:  
-                                        self.recorded_data['raw'][sensor_key].append(value)
-                                        data_added = True
-                            
-                            # Calibrated verileri kaydet
-                            for sensor_key in self.recorded_data['calibrated']:
-                                if sensor_key in latest_data['calibrated']:
-                                    value = latest_data['calibrated'][sensor_key]
-                                    if value is not None:  
-                                        self.recorded_data['calibrated'][sensor_key].append(value)
-                            
-                            # Custom data kaydet (data_processor'dan al)
-                            if self.data_processor and data_added:
-                                try:
-                                    custom_data = self.data_processor.get_custom_data()
-                                    if custom_data and 'timestamps' in custom_data and len(custom_data['timestamps']) > 0:
-                                        # Timestamp ekle
-                                        self.recorded_data['custom']['timestamps'].append(current_time)
-                                        
-                                        # Her custom formula için son değeri al
-                                        for formula_name, values in custom_data.items():
-                                            if formula_name != 'timestamps' and len(values) > 0:
-                                                if formula_name not in self.recorded_data['custom']:
-                                                    self.recorded_data['custom'][formula_name] = []
-                                                self.recorded_data['custom'][formula_name].append(values[-1])
-                                except Exception as custom_error:
-                                    app_logger.error(f"Custom data recording error: {custom_error}")
-                            
-                            if data_added:
-                                sample_count += 1
-                                if sample_count % 10 == 0:  # Her 10 örnekte bir log
-                                    app_logger.debug(f"Recorded {sample_count} samples")
-                        else:
-                            app_logger.warning(f"Data callback returned incomplete data: {latest_data}")
-                    except Exception as cb_error:
-                        app_logger.error(f"Data callback error: {cb_error}")
-                
                 # Progress bar ve zaman güncelle (UI thread'de)
                 progress = min((elapsed / self.recording_duration) * 100, 100)
                 remaining = max(0, self.recording_duration - elapsed)
@@ -371,7 +392,7 @@ class RecordingPanel:
                 time.sleep(0.1)
             
             # Recording tamamlandı
-            app_logger.info(f"Recording completed with {sample_count} total samples")
+            app_logger.info(f"Recording completed with {self.sample_count} total samples")
             self.parent_frame.after(0, self.recording_completed)
                 
         except Exception as e:
@@ -390,7 +411,10 @@ class RecordingPanel:
     
     def recording_completed(self):
         """Kayıt tamamlandı"""
-        self.is_recording = False
+        if not self.is_recording:
+            # Kullanıcı durdurdu - sonuçlar stop_recording'de hesaplandı
+            return
+        self._finish_recording(self.start_ns + int(self.recording_duration * 1_000_000_000))
         
         # UI durumunu güncelle
         self.record_btn.configure(state=tk.NORMAL)
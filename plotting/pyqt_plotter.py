@@ -7,7 +7,6 @@ import os
 import json
 import platform
 from typing import Dict, List, Optional, Tuple
-from datetime import datetime
 
 # Windows için PyQt ayarları
 if platform.system() == "Windows":
@@ -40,6 +39,7 @@ except ImportError as e:
 from config.constants import PLOT_COLORS, MATPLOTLIB_COLORS
 from utils.logger import app_logger
 from utils.helpers import filter_data_by_time_range
+from utils.session_clock import to_seconds
 
 class PyQtPlotter:
     
@@ -187,21 +187,15 @@ class PyQtPlotter:
             app_logger.error(f"PyQtGraph pencere açma hatası: {e}")
             return False
     
-    def update_data(self, timestamps: List[datetime], 
+    def update_data(self, timestamps, 
                    data_dict: Dict[str, List[float]]):
-        """Grafik verilerini güncelle"""
-        if not self.is_initialized or not timestamps:
+        """Grafik verilerini güncelle (timestamps: datetime listesi veya int ns dizisi)"""
+        if not self.is_initialized or timestamps is None or len(timestamps) == 0:
             return
         
         try:
-            # Veri doğrulama - boş veya geçersiz veriler için kontrol
-            if not isinstance(timestamps, list) or len(timestamps) == 0:
-                app_logger.warning("PyQtGraph: Geçersiz timestamp verisi")
-                return
-            
-            # Zaman verilerini saniye cinsine çevir
-            start_time = timestamps[0]
-            time_seconds = [(t - start_time).total_seconds() for t in timestamps]
+            # Zaman verilerini saniye cinsine çevir (vektörel)
+            time_seconds = to_seconds(timestamps)
             
             # Veri senkronizasyonu için güvenli uzunluk hesaplama
             valid_data_found = False
@@ -225,7 +219,8 @@ class PyQtPlotter:
                             clean_time_data = time_seconds[:min_len]
                             clean_sensor_data = [float(x) for x in sensor_data[:min_len]]
                             
-                            self.plot_curves[sensor_key].setData(clean_time_data, clean_sensor_data)
+                            self.plot_curves[sensor_key].setData(clean_time_data, clean_sensor_data,
+                                                                 connect='finite')
                             valid_data_found = True
                             
                         except (ValueError, TypeError) as ve:
@@ -448,21 +443,15 @@ class CustomGraphWindow:
             app_logger.error(f"Özel PyQt pencere gösterme hatası: {e}")
             return False
     
-    def update_data(self, timestamps: List[datetime], 
+    def update_data(self, timestamps, 
                    data_dict: Dict[str, List[float]]):
-        """Veriyi güncelle"""
-        if not self.is_open or not timestamps:
+        """Veriyi güncelle (timestamps: datetime listesi veya int ns dizisi)"""
+        if not self.is_open or timestamps is None or len(timestamps) == 0:
             return
         
         try:
-            # Veri doğrulama
-            if not isinstance(timestamps, list) or len(timestamps) == 0:
-                app_logger.warning("CustomGraphWindow: Geçersiz timestamp verisi")
-                return
-            
-            # Zaman verilerini saniye cinsine çevir
-            start_time = timestamps[0]
-            time_seconds = [(t - start_time).total_seconds() for t in timestamps]
+            # Zaman verilerini saniye cinsine çevir (vektörel)
+            time_seconds = to_seconds(timestamps)
             
             valid_updates = 0
             
@@ -483,7 +472,8 @@ class CustomGraphWindow:
                             clean_time_data = time_seconds[:min_len]
                             clean_sensor_data = [float(x) for x in sensor_data[:min_len]]
                             
-                            self.plot_curves[sensor_key].setData(clean_time_data, clean_sensor_data)
+                            self.plot_curves[sensor_key].setData(clean_time_data, clean_sensor_data,
+                                                                 connect='finite')
                             valid_updates += 1
                             
                         except (ValueError, TypeError) as ve:
@@ -7,7 +7,7 @@ import sys
 import json
 import time
 import os
-from datetime import datetime, timedelta
+from datetime import datetime
 from typing import Dict, List
 
 try:
@@ -73,6 +73,8 @@ class StandalonePlotWindow:
             
             # Mevcut verileri yükle
             self.initial_timestamps = data.get('timestamps', [])
+            # Ana süreçte vektörel hesaplanmış saniyeler (varsa ISO ayrıştırma atlanır)
+            self.initial_time_seconds = data.get('time_seconds')
             self.initial_data = data.get('data', {})
             
             print(f"Başlangıç verileri yüklendi: {self.title}")
@@ -83,6 +85,7 @@ class StandalonePlotWindow:
             print(f"Veri yükleme hatası: {e}")
             self.selected_sensors = []
             self.title = "PyQt Graph"
+            self.initial_time_seconds = None
     
     def setup_plot_window(self):
         """Grafik penceresini kur"""
@@ -159,20 +162,21 @@ class StandalonePlotWindow:
                 print("Başlangıç verisi yok, boş grafik gösteriliyor")
                 return
             
-            # Timestamp'leri datetime'a çevir
-            timestamps = []
-            for ts in self.initial_timestamps:
-                if isinstance(ts, str):
-                    timestamps.append(datetime.fromisoformat(ts))
-                else:
-                    timestamps.append(ts)
-            
-            if not timestamps:
-                return
-            
-            # Zaman verilerini saniye cinsine çevir
-            start_time = timestamps[0]
-            time_seconds = [(t - start_time).total_seconds() for t in timestamps]
+            # Zaman verilerini saniye cinsine çevir (ana süreç hesapladıysa doğrudan kullan)
+            time_seconds = self.initial_time_seconds
+            if not time_seconds or len(time_seconds) != len(self.initial_timestamps):
+                timestamps = []
+                for ts in self.initial_timestamps:
+                    if isinstance(ts, str):
+                        timestamps.append(datetime.fromisoformat(ts))
+                    else:
+                        timestamps.append(ts)
+                
+                if not timestamps:
+                    return
+                
+                start_time = timestamps[0]
+                time_seconds = [(t - start_time).total_seconds() for t in timestamps]
             
             # Her sensör için veriyi çiz
             for sensor_key in self.selected_sensors:
@@ -192,7 +196,8 @@ class StandalonePlotWindow:
                             else:
                                 # Raw data için mV formatı
                                 if isinstance(value, (int, float)):
-                                    processed_values.append(max(0, min(9999, int(value))))
+                                    # NaN -> bağlantı kesintisi, çizgi bu noktada kesilir
+                                    processed_values.append(float('nan') if value != value else max(0, min(9999, int(value))))
                                 else:
                                     processed_values.append(0)
                         
@@ -201,7 +206,8 @@ class StandalonePlotWindow:
                         if min_len > 0:
                             self.plot_curves[sensor_key].setData(
                                 time_seconds[:min_len], 
-                                processed_values[:min_len]
+                                processed_values[:min_len],
+                                connect='finite'
                             )
                             print(f"Başlangıç verisi çizildi: {sensor_key} - {min_len} nokta")
             
@@ -352,70 +358,63 @@ class StandalonePlotWindow:
                 print(f"Gelen sensör anahtarları: {list(sensor_data.keys())}")
                 print(f"Beklenen sensörler: {self.selected_sensors}")
                 
+                # Ana süreç saniyeleri vektörel hesapladıysa ISO ayrıştırma atlanır
+                precomputed_seconds = data.get('time_seconds')
+                if (timestamps_iso and sensor_data and precomputed_seconds
+                        and len(precomputed_seconds) == len(timestamps_iso)):
+                    self.apply_update(precomputed_seconds, sensor_data)
+                
                 # Zaman verilerini datetime'a çevir
-                if timestamps_iso and sensor_data:
+                elif timestamps_iso and sensor_data:
+                    # Veri ana süreçte sıralı gelir (yeniden sıralama tamponu) - damgalar olduğu gibi kullanılır
                     timestamps = [datetime.fromisoformat(t) for t in timestamps_iso]
                     
-                    # Zaman sıralaması kontrolü - geriye giden zamanları düzelt
-                    sorted_timestamps = []
-                    last_time = None
-                    
-                    for t in timestamps:
-                        if last_time is None:
-                            sorted_timestamps.append(t)
-                            last_time = t
-                        elif t >= last_time:
-                            sorted_timestamps.append(t)
-                            last_time = t
-                        else:
-                            # Geriye giden zaman - son zamandan 1ms sonra ayarla
-                            corrected_time = last_time + timedelta(milliseconds=1)
-                            sorted_timestamps.append(corrected_time)
-                            last_time = corrected_time
-                            print(f"Zaman sıralama düzeltildi: {t} -> {corrected_time}")
-                    
                     # Zaman verilerini saniye cinsine çevir
-                    if len(sorted_timestamps) > 0:
-                        start_time = sorted_timestamps[0]
-                        time_seconds = [(t - start_time).total_seconds() for t in sorted_timestamps]
-                        
-                        # Her sensör için veriyi güncelle
-                        for sensor_key in self.selected_sensors:
-                            if sensor_key in sensor_data:
-                                if sensor_key in self.plot_curves:
-                                    sensor_values = sensor_data[sensor_key]
-                                    
-                                    # Veri formatını kontrol et ve işle
-                                    processed_values = []
-                                    for value in sensor_values:
-                                        if "Calibrated" in self.title:
-                                            # Calibrated data için N/A kontrolü
-                                            if value is None or (isinstance(value, (int, float)) and value == 0):
-                                                processed_values.append(float('nan'))  # N/A için NaN kullan
-                                            else:
-                                                processed_values.append(float(value))
-                                        else:
-                                            # Raw data için mV formatı (4 haneli)
-                                            if isinstance(value, (int, float)):
-                                                processed_values.append(max(0, min(9999, int(value))))
-                                            else:
-                                                processed_values.append(0)
-                                    
-                                    # Veri uzunluklarını eşitle
-                                    min_len = min(len(time_seconds), len(processed_values))
-                                    if min_len > 0:
-                                        self.plot_curves[sensor_key].setData(
-                                            time_seconds[:min_len], 
-                                            processed_values[:min_len]
-                                        )
-                                        print(f"Sensör güncellendi: {sensor_key}, {min_len} nokta")
-                                else:
-                                    print(f"Plot curve bulunamadı: {sensor_key}")
-                            else:
-                                print(f"Sensör verisi bulunamadı: {sensor_key}")
+                    start_time = timestamps[0]
+                    time_seconds = [(t - start_time).total_seconds() for t in timestamps]
+                    
+                    self.apply_update(time_seconds, sensor_data)
             
         except Exception as e:
             print(f"Veri güncelleme hatası: {e}")
+    
+    def apply_update(self, time_seconds, sensor_data):
+        """Eğrileri yeni zaman (saniye) ve sensör verisiyle güncelle"""
+        for sensor_key in self.selected_sensors:
+            if sensor_key in sensor_data:
+                if sensor_key in self.plot_curves:
+                    sensor_values = sensor_data[sensor_key]
+
+                    # Veri formatını kontrol et ve işle
+                    processed_values = []
+                    for value in sensor_values:
+                        if "Calibrated" in self.title:
+                            # Calibrated data için N/A kontrolü
+                            if value is None or (isinstance(value, (int, float)) and value == 0):
+                                processed_values.append(float('nan'))  # N/A için NaN kullan
+                            else:
+                                processed_values.append(float(value))
+                        else:
+                            # Raw data için mV formatı (4 haneli)
+                            if isinstance(value, (int, float)):
+                                # NaN -> bağlantı kesintisi, çizgi bu noktada kesilir
+                                processed_values.append(float('nan') if value != value else max(0, min(9999, int(value))))
+                            else:
+                                processed_values.append(0)
+
+                    # Veri uzunluklarını eşitle
+                    min_len = min(len(time_seconds), len(processed_values))
+                    if min_len > 0:
+                        self.plot_curves[sensor_key].setData(
+                            time_seconds[:min_len], 
+                            processed_values[:min_len],
+                            connect='finite'
+                        )
+                        print(f"Sensör güncellendi: {sensor_key}, {min_len} nokta")
+                else:
+                    print(f"Plot curve bulunamadı: {sensor_key}")
+            else:
+                print(f"Sensör verisi bulunamadı: {sensor_key}")
 
 def main():
     """Ana fonksiyon"""
@@ -12,6 +12,7 @@ from typing import List, Dict, Any, Optional
 from datetime import datetime
 
 from utils.logger import app_logger
+from utils.session_clock import format_timestamps, to_seconds
 
 class PyQtSubprocessManager:
     """PyQt'yi ayrı process'te çalıştıran yönetici"""
@@ -39,18 +40,10 @@ class PyQtSubprocessManager:
             data_file_path = temp_file.name
             temp_file.close()
             
-            # Timestamps'leri string'e çevir (datetime JSON serializable değil)
-            timestamps_str = []
-            if initial_timestamps:
-                for t in initial_timestamps:
-                    try:
-                        if hasattr(t, 'isoformat'):
-                            timestamps_str.append(t.isoformat())
-                        else:
-                            timestamps_str.append(str(t))
-                    except Exception as ts_e:
-                        app_logger.warning(f"Timestamp çevirme hatası: {ts_e}")
-                        timestamps_str.append("invalid")
+            # Timestamps'leri string'e ve saniyeye çevir (vektörel - datetime JSON serializable değil)
+            initial_timestamps = initial_timestamps if initial_timestamps is not None else []
+            timestamps_str = format_timestamps(initial_timestamps)
+            time_seconds = to_seconds(initial_timestamps).tolist()
             
             # Başlangıç verileri - mevcut veriler varsa kullan
             graph_data = {
@@ -59,6 +52,7 @@ class PyQtSubprocessManager:
                 'title': title,
                 'graph_type': graph_type,
                 'timestamps': timestamps_str,
+                'time_seconds': time_seconds,
                 'data': {}
             }
             
@@ -134,18 +128,10 @@ class PyQtSubprocessManager:
             except:
                 existing_data = {}
             
-            # Timestamps'i güvenli şekilde string'e çevir
-            timestamps_str = []
-            if timestamps:
-                for t in timestamps:
-                    try:
-                        if hasattr(t, 'isoformat'):
-                            timestamps_str.append(t.isoformat())
-                        else:
-                            timestamps_str.append(str(t))
-                    except Exception as ts_e:
-                        app_logger.warning(f"Timestamp çevirme hatası: {ts_e}")
-                        timestamps_str.append("invalid")
+            # Timestamps'i string'e ve saniyeye çevir (vektörel, tek geçiş)
+            timestamps = timestamps if timestamps is not None else []
+            timestamps_str = format_timestamps(timestamps)
+            time_seconds = to_seconds(timestamps).tolist()
             
             # Tüm veriyi temizle (datetime nesnelerini string'e çevir)
             clean_data_dict = self._clean_data_for_json(data_dict)
@@ -153,6 +139,7 @@ class PyQtSubprocessManager:
             update_data = existing_data.copy()
             update_data.update({
                 'timestamps': timestamps_str,
+                'time_seconds': time_seconds,
                 'data': clean_data_dict if clean_data_dict else {}
             })
             
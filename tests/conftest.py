@@ -0,0 +1,5 @@
+import os
+import sys
+
+# Testler depo kökünden çalıştırılmadığında da paketler (data, utils, ...) bulunabilsin
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,56 @@
+import asyncio
+from types import SimpleNamespace
+
+from communication.advertisement_scanner import AdvertisementCache, AdvertisementScanner
+
+
+def test_cache_orders_by_mean_rssi_and_expires_after_ttl():
+    cache = AdvertisementCache(ttl_s=10.0, rssi_window=3)
+    assert cache.update("phone", "AA:00", -30, now=0.0) is None
+    assert cache.update("pico-sensors-1", "AA:01", -80, now=0.0) == "sensor-1"
+    cache.update("pico-sensors-2", "AA:02", -60, now=1.0)
+    cache.update("pico-sensors-3", "AA:03", None, now=2.0)
+    # Kayan pencere: son üç değer (-50, -50, -50) - eski -90 düşer
+    for rssi in (-90, -50, -50, -50):
+        cache.update("pico-sensors-1", "AA:01", rssi, now=5.0)
+
+    devices = cache.devices(now=6.0)
+    assert list(devices) == ["sensor-1", "sensor-2", "sensor-3"]
+    assert devices["sensor-1"]['rssi'] == -50.0
+    assert devices["sensor-3"]['rssi'] == 'N/A'
+    assert devices["sensor-2"]['age_s'] == 5.0
+    assert cache.best(now=6.0)[0] == "sensor-1"
+
+    # sensor-2 ve sensor-3 TTL'i aşar
+    assert list(cache.devices(now=14.0)) == ["sensor-1"]
+    assert cache.expire(now=15.1) == 1
+    assert cache.best(now=15.1) is None
+
+
+def test_new_address_resets_rssi_history():
+    cache = AdvertisementCache(ttl_s=10.0)
+    device = object()
+    cache.update("pico-sensors-4", "AA:04", -40, device_obj=device, now=0.0)
+    cache.update("pico-sensors-4", "BB:04", -70, now=1.0)
+
+    info = cache.devices(now=1.0)["sensor-4"]
+    assert info['address'] == "BB:04"
+    assert info['rssi'] == -70.0
+    assert info['device_obj'] is None
+    assert cache.device_for_address("AA:04") is None
+
+
+def test_wait_for_match_wakes_on_advertisement():
+    scanner = AdvertisementScanner(scanner_factory=None)
+
+    async def scenario():
+        waiter = asyncio.ensure_future(scanner.wait_for_match(1.0, "sensor-5"))
+        await asyncio.sleep(0)
+        scanner.on_advertisement(SimpleNamespace(name="pico-sensors-2", address="AA:02", rssi=-50))
+        assert not waiter.done()
+        scanner.on_advertisement(SimpleNamespace(name="pico-sensors-5", address="AA:05", rssi=-55))
+        return await waiter, await scanner.wait_for_match(0.01, "sensor-9")
+
+    assert asyncio.run(scenario()) == ("sensor-5", None)
+    assert scanner.advertisements == 2
+    assert scanner._waiters == []
@@ -0,0 +1,74 @@
+import threading
+
+from communication.ble_manager import BLEManager
+from communication.device_connection import DeviceConnection
+from config.constants import (
+    BLE_RECONNECT_INITIAL_DELAY_MS, BLE_RECONNECT_MAX_DELAY_MS, BLE_RECONNECT_MAX_ATTEMPTS
+)
+from gui.main_window import SpektroskpiGUI
+from utils.sensor_sample import CHANNEL_GAP, SensorSample
+
+
+def test_reconnect_delay_backs_off_with_jitter_up_to_the_ceiling():
+    for attempt in range(1, 12):
+        ceiling = min(BLE_RECONNECT_MAX_DELAY_MS, BLE_RECONNECT_INITIAL_DELAY_MS * 2 ** (attempt - 1))
+        delays = [BLEManager._reconnect_delay(attempt) * 1000 for _ in range(50)]
+        assert all(ceiling / 2 <= delay <= ceiling for delay in delays)
+    assert BLEManager._reconnect_delay(40) * 1000 <= BLE_RECONNECT_MAX_DELAY_MS
+
+
+def test_link_loss_marks_a_gap_then_gives_up_and_reports_the_disconnect():
+    emitted = []
+    manager = BLEManager(emitted.append)
+    disconnects = []
+    manager.set_disconnect_callback(lambda name: disconnects.append((name, threading.get_ident())))
+    attempts = []
+
+    async def run_connection(connection, reconnect=False):
+        attempts.append(reconnect)
+        if not reconnect:
+            connection.mark_connected(None)
+            return True
+        return False
+
+    manager._run_connection = run_connection
+    manager._reconnect_delay = lambda attempt: 0.0
+    connection = DeviceConnection("Sensor 1", "Sensor 1", "AA:BB", manager._emit_packet)
+    manager.connections[connection.device_id] = connection
+    try:
+        manager.submit(manager._connect_to_device_async(connection)).result(timeout=5)
+    finally:
+        manager.shutdown()
+
+    gaps = [item for item in emitted if isinstance(item, SensorSample) and item.channel == CHANNEL_GAP]
+    assert len(gaps) == 1
+    assert connection.gaps == 1
+    assert attempts == [False] + [True] * BLE_RECONNECT_MAX_ATTEMPTS
+    assert connection.disconnect_requested
+    # Callback BLE döngüsü thread'inden gelir - GUI bunu Tk thread'ine aktarır
+    assert [name for name, _ in disconnects] == ["Sensor 1"]
+    assert disconnects[0][1] != threading.get_ident()
+
+
+class Root:
+    def __init__(self):
+        self.queued = []
+
+    def after(self, delay_ms, callback, *args):
+        self.queued.append((callback, args))
+
+
+def test_gui_defers_disconnect_notification_to_the_tk_thread():
+    gui = SpektroskpiGUI.__new__(SpektroskpiGUI)
+    gui.root = Root()
+    handled = []
+    gui.on_ble_disconnected = lambda device_name=None: handled.append((device_name, threading.get_ident()))
+
+    thread = threading.Thread(target=gui.post_disconnected, args=("Sensor 1",))
+    thread.start()
+    thread.join()
+    assert handled == []
+
+    for callback, args in gui.root.queued:
+        callback(*args)
+    assert handled == [("Sensor 1", threading.get_ident())]
@@ -0,0 +1,53 @@
+import numpy as np
+
+from communication.capture import CaptureWriter, ReplaySource, read_capture
+from communication.device_connection import DeviceConnection
+from communication.frame_protocol import encode_frame
+from data.data_processor import DataProcessor
+from utils.session_clock import session_clock
+
+CYCLES = 4
+PERIOD_MS = 10
+
+
+def make_processor():
+    processor = DataProcessor()
+    processor.system_running = True
+    processor.system_stopped = False
+    return processor
+
+
+def test_capture_then_replay_reproduces_the_store(tmp_path):
+    live = make_processor()
+    capture_path = str(tmp_path / "session.spcap")
+    connection = DeviceConnection("pico-1", "Pico", "AA:BB", live.process_incoming_data)
+    connection.capture_writer = CaptureWriter(capture_path)
+    connection.mark_connected(None)
+
+    rng = np.random.default_rng(3)
+    base_ns = session_clock.now_ns() - 10_000_000_000
+    for sequence in [0, 1, 2, 3, 5, 6, 7]:
+        cycles = rng.integers(100, 4000, size=(CYCLES, 4)).astype(np.uint16)
+        data = encode_frame(sequence, sequence * CYCLES * PERIOD_MS, PERIOD_MS, cycles)
+        receive_ns = base_ns + (sequence + 1) * CYCLES * PERIOD_MS * 1_000_000 + int(rng.integers(0, 2_000_000))
+        connection.handle_frame_notification("FRAME", None, data, receive_ns)
+    connection.capture_writer.close()
+    live.flush_reorder_buffers()
+
+    assert len(list(read_capture(capture_path))) == 7
+
+    replayed = make_processor()
+    replay = ReplaySource(capture_path, replayed.process_incoming_data)
+    assert replay.replay_all() == 7
+    assert replay.finished
+    replayed.flush_reorder_buffers()
+
+    assert len(replayed.store) == len(live.store) == 8 * CYCLES
+    assert np.array_equal(replayed.store.column('raw'), live.store.column('raw'))
+    assert np.array_equal(replayed.store.column('flags'), live.store.column('flags'))
+    # Oynatma kayıttaki aralıkları korur, yalnızca bu oturumun saatine kaydırır
+    live_ts = live.store.column('timestamps')
+    replay_ts = replayed.store.column('timestamps')
+    assert np.allclose(replay_ts - replay_ts[0], live_ts - live_ts[0], atol=1000)
+    live.close()
+    replayed.close()
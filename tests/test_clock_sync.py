@@ -0,0 +1,84 @@
+import numpy as np
+
+from communication.clock_sync import DeviceClockModel
+
+PERIOD_MS = 10
+BASE_LATENCY_NS = 2_000_000
+
+
+def arrivals(rng, count, drift_ppm=50.0, offset_ns=5_000_000_000, start_tick=1000, jitter_ms=3.0,
+             step_ms=PERIOD_MS):
+    """Cihaz tick'leri ve host varışları: sürüklenme + sabit gecikme + yalnızca ekleyen jitter"""
+    ticks = start_tick + np.arange(count, dtype=np.int64) * step_ms
+    emitted_ns = offset_ns + (ticks - start_tick) * 1_000_000 * (1 + drift_ppm * 1e-6)
+    jitter_ns = rng.exponential(jitter_ms * 1_000_000, size=count)
+    return ticks, emitted_ns, (emitted_ns + BASE_LATENCY_NS + jitter_ns).astype(np.int64)
+
+
+def test_recovers_drift_and_offset_under_jitter():
+    rng = np.random.default_rng(4)
+    model = DeviceClockModel()
+    # 100 ms'de bir frame: pencere ~25 s - ppm düzeyinde eğim için yeterli taban
+    ticks, emitted_ns, host_ns = arrivals(rng, 400, jitter_ms=1.0, step_ms=100)
+    for tick, host in zip(ticks.tolist(), host_ns.tolist()):
+        model.observe(tick, host)
+
+    assert abs(model.drift_ppm - 50.0) < 20.0
+    # Alt zarf en az gecikmeli varışları izler - jitter damgalara geçmez
+    errors = np.array([model.to_host_ns(tick) for tick in ticks[-50:].tolist()]) - emitted_ns[-50:]
+    assert np.all(np.abs(errors - BASE_LATENCY_NS) < 1_000_000)
+    assert model.get_stats()['latency_ms'] > 0
+
+
+def test_tick_wrap_is_unwrapped():
+    period = 1 << 12
+    model = DeviceClockModel(tick_period_ms=period)
+    rng = np.random.default_rng(6)
+    ticks, _, host_ns = arrivals(rng, 1000, start_tick=period - 500, jitter_ms=0.5)
+    outputs = []
+    for tick, host in zip(ticks.tolist(), host_ns.tolist()):
+        model.observe(tick % period, host)
+        outputs.append(model.to_host_ns(tick % period))
+    assert model.resets == 0
+    assert np.all(np.diff(outputs) > 0)
+    # Sarmal açılmasaydı tick adımı -4 s görünür ve model sıfırlanırdı
+    assert np.all(np.abs(np.diff(outputs) - PERIOD_MS * 1_000_000) < 1_000_000)
+
+
+def test_counter_reset_restarts_the_model_without_going_back():
+    model = DeviceClockModel()
+    rng = np.random.default_rng(7)
+    ticks, _, host_ns = arrivals(rng, 200, start_tick=50_000, jitter_ms=0.5)
+    for tick, host in zip(ticks.tolist(), host_ns.tolist()):
+        model.observe(tick, host)
+    last_output = model.to_host_ns(int(ticks[-1]))
+
+    # Cihaz yeniden başladı: tick sayacı sıfırdan
+    model.observe(20, int(host_ns[-1]) + PERIOD_MS * 1_000_000)
+    assert model.resets == 1
+    assert model.get_stats()['points'] == 1
+    assert model.to_host_ns(20) > last_output
+
+
+def test_output_stays_monotonic_when_a_refit_pulls_the_offset_back():
+    model = DeviceClockModel()
+    rng = np.random.default_rng(8)
+    ticks, _, host_ns = arrivals(rng, 300, jitter_ms=0.2)
+    # Gecikme aniden 30 ms düşer - sonraki yeniden uydurma ofseti geri çeker
+    host_ns[150:] -= 30_000_000
+
+    outputs = []
+    backward_fits = 0
+    for tick, host in zip(ticks.tolist(), host_ns.tolist()):
+        before = model._map(model.unwrap(tick))
+        model.observe(tick, host)
+        if model._map(model.unwrap(tick)) < before:
+            backward_fits += 1
+        # DeviceConnection gibi: frame'in ilk ve son döngüsü
+        outputs.append(model.to_host_ns(tick - 4 * PERIOD_MS))
+        outputs.append(model.to_host_ns(tick))
+
+    assert backward_fits > 0
+    assert np.all(np.diff(outputs[1::2]) > 0)
+    # Sıkışma geçicidir: sonunda çıktı yeni modele yetişir
+    assert model.to_host_ns(int(ticks[-1])) == round(model._map(int(ticks[-1])))
@@ -0,0 +1,69 @@
+from communication.cycle_assembler import CycleAssembler
+from utils.sensor_sample import SensorSample
+
+MS = 1_000_000
+
+
+def sample(channel, timestamp_ms, value=500.0):
+    return SensorSample("d1", channel, None, timestamp_ms * MS, value)
+
+
+def channels(cycle):
+    return [item.channel for item in cycle]
+
+
+def test_complete_cycles_are_emitted_in_arrival_order():
+    cycles = []
+    assembler = CycleAssembler(cycles.append, timeout_ms=100)
+    for start, order in ((0, [0, 1, 2, 3]), (10, [2, 0, 3, 1])):
+        for offset, channel in enumerate(order):
+            assembler.add(sample(channel, start + offset))
+
+    assert [channels(cycle) for cycle in cycles] == [[0, 1, 2, 3], [2, 0, 3, 1]]
+    assert assembler.get_stats() == {'complete_cycles': 2, 'partial_cycles': 0,
+                                     'dropped_partials': 0, 'pending_channels': 0}
+
+
+def test_repeated_channel_and_timeout_close_partial_cycles():
+    cycles = []
+    assembler = CycleAssembler(cycles.append, timeout_ms=100)
+    assembler.add(sample(0, 0))
+    assembler.add(sample(1, 1))
+    # Kanal 0 tekrar geldi -> önceki döngü eksik kapanır
+    assembler.add(sample(0, 10))
+    assembler.add(sample(2, 11))
+    # Süre aşımı -> [0, 2] yarım kapanır, 3 yeni döngü başlatır
+    assembler.add(sample(3, 200))
+    assembler.flush_expired(now=250 * MS)
+    assert len(cycles) == 2
+    assembler.flush_expired(now=301 * MS)
+
+    assert [channels(cycle) for cycle in cycles] == [[0, 1], [0, 2], [3]]
+    stats = assembler.get_stats()
+    assert stats['partial_cycles'] == 3
+    assert stats['complete_cycles'] == 0
+    assert stats['pending_channels'] == 0
+
+
+def test_partials_are_dropped_when_disabled():
+    cycles = []
+    assembler = CycleAssembler(cycles.append, timeout_ms=100, emit_partial=False)
+    assembler.add(sample(0, 0))
+    assembler.add(sample(0, 5))
+    for channel in (1, 2, 3):
+        assembler.add(sample(channel, 5 + channel))
+    assembler.add(sample(2, 20))
+    assembler.flush()
+
+    assert [channels(cycle) for cycle in cycles] == [[0, 1, 2, 3]]
+    assert assembler.get_stats()['dropped_partials'] == 2
+
+
+def test_channel_order_limits_the_expected_cycle():
+    cycles = []
+    assembler = CycleAssembler(cycles.append, channel_order=["SENSOR_2", "SENSOR_5"])
+    assembler.add(sample(1, 0))
+    assembler.add(sample(0, 1))
+    assembler.add(sample(2, 2))
+
+    assert [channels(cycle) for cycle in cycles] == [[0, 2]]
@@ -0,0 +1,165 @@
+import csv
+
+import numpy as np
+
+from config.constants import REALTIME_DISPLAY_POINTS
+from data.data_processor import DataProcessor
+from data.export import DataExporter
+from data.formula_engine import FormulaEngine
+from data.sample_store import GAP_FLAG
+from utils.session_clock import session_clock
+
+
+def make_processor(rows):
+    processor = DataProcessor()
+    processor.system_running = True
+    processor.system_stopped = False
+    start_ns = session_clock.now_ns() - 60_000_000_000
+    timestamps = start_ns + np.arange(rows, dtype=np.int64) * 1_000_000
+    raw = np.column_stack([np.arange(rows) % 3000 + 100] * 4).astype(np.float64)
+    processor.process_batch(timestamps, raw)
+    processor.drain_ingest_queue()
+    return processor
+
+
+def test_list_getters_are_bounded_to_display_window():
+    processor = make_processor(REALTIME_DISPLAY_POINTS * 3)
+
+    measurements = processor.get_measurements()
+    assert len(measurements['timestamps']) == REALTIME_DISPLAY_POINTS
+    assert len(measurements['UV_360nm']) == REALTIME_DISPLAY_POINTS
+    # Pencere deponun sonudur
+    assert measurements['UV_360nm'][-1] == float(processor.store.column('raw')[-1, 0])
+
+    assert len(processor.get_raw_data(last_rows=10)['IR_940nm']) == 10
+    assert len(processor.get_calibrated_data(last_rows=None)['timestamps']) == REALTIME_DISPLAY_POINTS * 3
+    processor.close()
+
+
+def test_batched_csv_export_matches_single_list_export(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    processor = make_processor(2500)
+    exporter = DataExporter()
+
+    ok, single_path = exporter.export_to_csv(processor.export_data_for_csv(), 'single.csv')
+    assert ok
+    ok, batched_path = exporter.export_batches_to_csv(
+        processor.iter_export_batches(batch_rows=700), processor.get_custom_formula_names(), 'batched.csv')
+    assert ok
+
+    with open(single_path, encoding='utf-8-sig') as f:
+        single_rows = list(csv.reader(f, delimiter=';'))
+    with open(batched_path, encoding='utf-8-sig') as f:
+        batched_rows = list(csv.reader(f, delimiter=';'))
+    assert batched_rows == single_rows
+    assert len(batched_rows) == 2501
+
+    summary = exporter.create_export_summary(None, processor.get_export_statistics())
+    assert summary['total_data_points'] == 2500
+    assert summary['sensors']['UV_360nm']['raw_data']['count'] == 2500
+    processor.close()
+
+
+def test_packet_without_any_channel_value_is_not_stored():
+    processor = make_processor(0)
+    now_ns = session_clock.now_ns() - 10_000_000_000
+
+    processor.process_incoming_data({'timestamp': now_ns, 'sensor_key': "CYCLE",
+                                     'sensor_2': 0, 'sensor_5': 0, 'sensor_7': 0, 'sensor_extra': 0})
+    processor.process_incoming_data({'timestamp': now_ns + 1_000_000, 'sensor_key': "CYCLE",
+                                     'sensor_2': 850.0, 'sensor_5': 0, 'sensor_7': 0, 'sensor_extra': 0})
+    processor.flush_reorder_buffers()
+
+    assert len(processor.store) == 1
+    assert int(processor.store.column('flags')[0]) != 0
+    processor.close()
+
+
+def test_in_order_batches_skip_the_reorder_watermark():
+    processor = make_processor(0)
+    now_ns = session_clock.now_ns()
+    values = np.full((10, 4), 900.0)
+
+    # Damgalar filigranın içinde (şimdi) - yine de beklemeden depoya yazılır
+    processor.process_batch(now_ns + np.arange(10, dtype=np.int64) * 1_000_000, values, device_id="d1")
+    processor.process_batch(now_ns + np.arange(10, 20, dtype=np.int64) * 1_000_000, values, device_id="d2")
+    processor.process_batch(now_ns + np.arange(10, 20, dtype=np.int64) * 1_000_000, values, device_id="d1")
+    assert len(processor._get_store("d1")) == 20
+    assert len(processor._get_store("d2")) == 10
+
+    # Bırakılmış damgadan eski parti atılır; tek kanallı döngüler filigranı bekler
+    processor.process_batch(now_ns + np.arange(3, dtype=np.int64) * 1_000_000, values[:3], device_id="d2")
+    processor.process_incoming_data({'timestamp': now_ns + 30_000_000, 'sensor_key': "CYCLE",
+                                     'device_id': "d2", 'sensor_2': 850.0})
+    assert len(processor._get_store("d2")) == 10
+
+    stats = processor.get_ingest_stats()['reorder']
+    assert set(stats) == {"d1", "d2"}
+    assert stats["d1"]['bypassed'] == 2
+    assert stats["d2"]['bypassed'] == 1
+    assert stats["d2"]['late_dropped'] == 1
+    assert stats["d2"]['pending'] == 1
+    processor.close()
+
+
+def test_batch_ingest_evaluates_formulas_on_calibrated_rows():
+    processor = make_processor(0)
+    engine = FormulaEngine()
+    assert engine.create_formula("sum", "ch1 + ch2")[0]
+    assert engine.create_formula("peak", "sqrt(uv * ir850) / 2")[0]
+    processor.set_formula_engine(engine)
+    processor.set_calibration_functions({'UV_360nm': {'slope': 2.0, 'intercept': 10.0}})
+
+    start_ns = session_clock.now_ns() - 10_000_000_000
+    rng = np.random.default_rng(2)
+    values = rng.integers(100, 3000, size=(50, 4)).astype(np.float64)
+    values[5, 1] = 0.0
+    processor.process_batch(start_ns + np.arange(50, dtype=np.int64) * 1_000_000, values)
+    processor.drain_ingest_queue()
+
+    calibrated = processor.store.column('calibrated').astype(np.float64)
+    custom = processor.get_custom_data()
+    assert len(custom['timestamps']) == len(processor.store) == 50
+    assert custom['timestamps'] == processor.store.column('timestamps').tolist()
+    for row in range(50):
+        uv, blue, ir850 = calibrated[row, 0], calibrated[row, 1], calibrated[row, 2]
+        if np.isnan(uv + blue):
+            assert custom['sum'][row] is None
+        else:
+            assert np.isclose(custom['sum'][row], uv + blue)
+        sensor_data = dict(zip(processor.store.channels, calibrated[row].tolist()))
+        if not np.isnan(calibrated[row, :3]).any():
+            assert np.isclose(custom['peak'][row], engine.calculate_formula("sqrt(uv * ir850) / 2", sensor_data))
+    assert processor.get_custom_formula_names() == ["sum", "peak"]
+    processor.close()
+
+
+def test_custom_data_uses_the_session_clock():
+    processor = make_processor(0)
+    before_ns = session_clock.now_ns()
+    processor.add_custom_data({'ratio': 1.5})
+    processor.add_custom_data({'ratio': 2.5}, session_clock.to_datetimes(np.array([before_ns]))[0])
+
+    timestamps = processor.get_custom_data()['timestamps']
+    assert all(isinstance(timestamp, int) for timestamp in timestamps)
+    assert timestamps[0] >= before_ns
+    assert abs(timestamps[1] - before_ns) < 1_000_000
+    processor.close()
+
+
+def test_list_getters_keep_partial_and_gap_rows_aligned():
+    processor = make_processor(0)
+    start_ns = session_clock.now_ns() - 10_000_000_000
+    processor.store.append(start_ns, [100, 200, 300, 400], 0b1111)
+    processor.store.append(start_ns + 1_000_000, [110, 0, 310, 410], 0b1101)   # eksik döngü: kanal 1 yok
+    processor.store.append_marker(start_ns + 2_000_000, GAP_FLAG)
+    processor.store.append(start_ns + 3_000_000, [120, 220, 320, 420], 0b1111)
+
+    for data in (processor.get_measurements(), processor.get_calibrated_data()):
+        assert len(data['timestamps']) == 4
+        assert all(len(data[sensor_key]) == 4 for sensor_key in processor.store.channels)
+        blue = data['Blue_450nm']
+        assert blue[0] == 200 and np.isnan(blue[1]) and np.isnan(blue[2]) and blue[3] == 220
+        uv = data['UV_360nm']
+        assert uv[1] == 110 and np.isnan(uv[2]) and uv[3] == 120
+    processor.close()
@@ -0,0 +1,73 @@
+import numpy as np
+
+from communication.device_connection import DeviceConnection
+from communication.frame_protocol import encode_frame
+from data.data_processor import DataProcessor
+from data.sample_store import LOST_FLAG
+from utils.helpers import convert_raw_to_voltage
+from utils.session_clock import session_clock
+
+CYCLES = 5
+PERIOD_MS = 10
+
+
+def frame(sequence):
+    cycles = np.full((CYCLES, 4), 1000 + sequence, dtype=np.uint16)
+    return encode_frame(sequence, sequence * CYCLES * PERIOD_MS, PERIOD_MS, cycles)
+
+
+def make_processor():
+    processor = DataProcessor()
+    processor.system_running = True
+    processor.system_stopped = False
+    return processor
+
+
+def test_lost_frames_become_one_marker_and_late_frame_is_not_stored():
+    processor = make_processor()
+    emitted = []
+
+    def emit(item):
+        emitted.append(item)
+        processor.process_incoming_data(item)
+
+    connection = DeviceConnection("d1", "Pico", "AA:BB", emit)
+    base_ns = session_clock.now_ns() - 10_000_000_000
+    for sequence in (0, 1, 4, 2, 5):
+        # Seq 2 ve 3 kayıp; seq 2 kayıp işaretlendikten sonra geç gelir
+        receive_ns = base_ns + (sequence + 1) * CYCLES * PERIOD_MS * 1_000_000
+        connection.handle_frame_notification("FRAME", None, frame(sequence), receive_ns)
+    processor.drain_ingest_queue()
+
+    lost_items = [item for item in emitted if isinstance(item, dict) and item['sensor_key'] == "LOST"]
+    assert len(lost_items) == 1
+    assert len(lost_items[0]['timestamps']) == 2 * CYCLES
+
+    flags = processor.store.column('flags')
+    raw = processor.store.column('raw')
+    assert len(processor.store) == 6 * CYCLES
+    assert int((flags == LOST_FLAG).sum()) == 2 * CYCLES
+    stored = set(raw[flags != LOST_FLAG, 0].tolist())
+    assert stored == {int(round(convert_raw_to_voltage(1000 + sequence))) for sequence in (0, 1, 4, 5)}
+    assert connection.get_stats()['late_frames'] == 1
+    assert connection.get_stats()['masked_samples'] == 2 * CYCLES
+    processor.close()
+
+
+def test_late_frame_stays_counted_as_lost():
+    processor = make_processor()
+    connection = DeviceConnection("d1", "Pico", "AA:BB", processor.process_incoming_data)
+    base_ns = session_clock.now_ns() - 10_000_000_000
+    for sequence in (0, 1, 3, 2):
+        receive_ns = base_ns + (sequence + 1) * CYCLES * PERIOD_MS * 1_000_000
+        connection.handle_frame_notification("FRAME", None, frame(sequence), receive_ns)
+    processor.drain_ingest_queue()
+    processor.flush_reorder_buffers()
+
+    stats = connection.get_stats()
+    lost_rows = int((processor.store.column('flags') == LOST_FLAG).sum())
+    assert stats['lost_frames'] == 1
+    assert stats['out_of_order'] == 1
+    assert stats['lost_frames'] * CYCLES == lost_rows == stats['masked_samples']
+    assert stats['frame_loss_rate'] == 1 / 4
+    processor.close()
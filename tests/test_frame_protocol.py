@@ -0,0 +1,86 @@
+import numpy as np
+
+from communication.frame_protocol import (FRAME_HEADER, SerialFrameParser, decode_frame, encode_frame,
+                                          encode_serial_packet, is_legacy_packet)
+from config.constants import FRAME_VERSION, SERIAL_SYNC
+
+
+def test_encode_decode_round_trip():
+    cycles = np.arange(12, dtype=np.uint16).reshape(3, 4) * 1000
+    frame = decode_frame(encode_frame(70000, 2 ** 33 + 5, 25, cycles))
+
+    assert frame.version == FRAME_VERSION
+    # Sıra numarası 16, tick 32 bit sarar
+    assert frame.sequence == 70000 & 0xFFFF
+    assert frame.tick_ms == 5
+    assert frame.period_ms == 25
+    assert frame.cycle_count == 3
+    assert np.array_equal(frame.values, cycles)
+
+
+def test_truncated_empty_and_wrong_version_frames_are_rejected():
+    data = encode_frame(1, 100, 10, np.full((2, 4), 500))
+
+    assert decode_frame(data[:FRAME_HEADER.size - 1]) is None
+    assert decode_frame(data[:-1]) is None
+    assert decode_frame(data + b"\x00\x00") is None
+    assert decode_frame(FRAME_HEADER.pack(FRAME_VERSION, 0, 1, 100, 10)) is None
+    assert decode_frame(bytes([FRAME_VERSION + 1]) + data[1:]) is None
+
+
+def test_legacy_packet_is_two_bytes():
+    assert is_legacy_packet(b"\x01\x02")
+    assert not is_legacy_packet(encode_frame(1, 0, 10, [[1, 2, 3, 4]]))
+
+
+def sync_frame(sequence):
+    # Değerler SYNC baytlarını (0xAA 0x55 -> 0x55AA) gövdeye taşır
+    return encode_frame(sequence, sequence * 10, 10, np.full((2, 4), 0x55AA))
+
+
+def test_parser_handles_sync_pattern_inside_payload():
+    frames = [sync_frame(n) for n in range(3)]
+    assert SERIAL_SYNC in frames[0][FRAME_HEADER.size:]
+    parser = SerialFrameParser()
+
+    assert parser.feed(b"".join(encode_serial_packet(frame) for frame in frames)) == frames
+    stats = parser.get_stats()
+    assert stats['packets'] == 3
+    assert stats['resyncs'] == stats['crc_errors'] == stats['discarded_bytes'] == 0
+    assert stats['buffered_bytes'] == 0
+
+
+def test_parser_rejects_crc_mismatch_and_resyncs():
+    good, bad = sync_frame(1), bytearray(encode_serial_packet(sync_frame(2)))
+    bad[-1] ^= 0xFF
+    parser = SerialFrameParser()
+
+    assert parser.feed(bytes(bad) + encode_serial_packet(good)) == [good]
+    stats = parser.get_stats()
+    assert stats['crc_errors'] == 1
+    assert stats['packets'] == 1
+    assert stats['resyncs'] >= 1
+    assert stats['buffered_bytes'] == 0
+
+
+def test_parser_resyncs_after_garbage_bytes():
+    frame = sync_frame(4)
+    parser = SerialFrameParser()
+
+    garbage = b"\x00\x13\xAA\xFF" + SERIAL_SYNC + b"\xFF\xFF" + b"noise"
+    assert parser.feed(garbage + encode_serial_packet(frame)) == [frame]
+    assert parser.get_stats()['discarded_bytes'] == len(garbage)
+    assert parser.get_stats()['resyncs'] >= 1
+
+
+def test_parser_joins_packet_split_across_reads():
+    frames = [sync_frame(5), sync_frame(6)]
+    stream = b"garbage" + b"".join(encode_serial_packet(frame) for frame in frames)
+
+    # Her bölme noktası - SYNC'in ortası dahil
+    for split in range(1, len(stream)):
+        parser = SerialFrameParser()
+        assert parser.feed(stream[:split]) + parser.feed(stream[split:]) == frames
+    byte_by_byte = SerialFrameParser()
+    assert [payload for byte in stream for payload in byte_by_byte.feed(bytes([byte]))] == frames
+    assert byte_by_byte.get_stats()['discarded_bytes'] == len(b"garbage")
@@ -0,0 +1,54 @@
+import threading
+
+import pytest
+
+from data.ingest_queue import DROP_NEWEST, DROP_OLDEST, IngestQueue
+
+
+def test_drop_oldest_keeps_the_newest_items():
+    queue = IngestQueue(capacity=3, overflow_policy=DROP_OLDEST)
+    results = [queue.put(n) for n in range(5)]
+
+    assert results == [True, True, True, False, False]
+    assert queue.drain() == [2, 3, 4]
+    stats = queue.get_stats()
+    assert stats['enqueued'] == 5
+    assert stats['dropped'] == stats['overflow_events'] == 2
+    assert stats['delivered'] == 3
+    assert stats['high_watermark'] == 3
+    assert stats['size'] == 0
+
+
+def test_drop_newest_rejects_items_while_full():
+    queue = IngestQueue(capacity=3, overflow_policy=DROP_NEWEST)
+    results = [queue.put(n) for n in range(5)]
+
+    assert results == [True, True, True, False, False]
+    assert queue.is_under_pressure()
+    assert queue.drain(max_items=2) == [0, 1]
+    assert queue.put(5)
+    assert queue.drain() == [2, 5]
+    stats = queue.get_stats()
+    assert stats['enqueued'] == 4
+    assert stats['dropped'] == 2
+    assert stats['delivered'] == 4
+
+
+def test_invalid_policy_is_rejected():
+    with pytest.raises(ValueError):
+        IngestQueue(capacity=3, overflow_policy='block')
+
+
+def test_every_item_is_delivered_once_across_threads():
+    queue = IngestQueue(capacity=100_000)
+    count = 50_000
+    producer = threading.Thread(target=lambda: [queue.put(n) for n in range(count)])
+    received = []
+    producer.start()
+    while producer.is_alive() or len(queue):
+        received.extend(queue.drain(max_items=500))
+    producer.join()
+    received.extend(queue.drain())
+
+    assert received == list(range(count))
+    assert queue.get_stats()['delivered'] == count
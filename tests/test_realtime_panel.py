@@ -0,0 +1,98 @@
+import math
+
+import numpy as np
+
+from config.constants import SENSOR_KEYS
+from data.sample_bus import POLICY_LATEST, SampleBus
+from data.sample_store import SampleStore, LOST_FLAG
+from gui.detector_panel import DetectorPanel
+from gui.realtime_panel import RealTimePanel
+
+
+class RecordingManager:
+    """PyQt alt süreç yöneticisi yerine gönderilen grafik verisini kaydeder"""
+
+    def __init__(self):
+        self.updates = {}
+
+    def is_window_active(self, window_id):
+        return True
+
+    def update_graph_data(self, window_id, timestamps, data_dict):
+        self.updates[window_id] = (list(timestamps), data_dict)
+
+
+def make_panel():
+    panel = RealTimePanel.__new__(RealTimePanel)
+    panel.pyqt_manager = RecordingManager()
+    panel._last_generation = None
+    return panel
+
+
+def test_snapshot_channels_keep_full_length_with_marker_and_partial_rows():
+    store = SampleStore()
+    store.set_calibration([2.0, 1.0, 1.0, 1.0], [0.0, 0.0, 0.0, 0.0], [True, False, False, False])
+    store.append(1_000, [100, 200, 300, 400], 0b1111)
+    store.append_marker(2_000, LOST_FLAG)
+    store.append(3_000, [110, 0, 310, 410], 0b1101)   # eksik döngü: kanal 1 yok
+    store.append(4_000, [120, 220, 320, 420], 0b1111)
+
+    panel = make_panel()
+    panel.update_graphs_from_snapshot(store.snapshot())
+
+    timestamps, raw = panel.pyqt_manager.updates['raw_data']
+    _, calibrated = panel.pyqt_manager.updates['cal_data']
+    assert timestamps == [1_000, 2_000, 3_000, 4_000]
+    for data in (raw, calibrated):
+        assert all(len(values) == len(timestamps) for values in data.values())
+
+    uv = raw['UV_360nm']
+    assert uv[0] == 100 and math.isnan(uv[1]) and uv[2] == 110 and uv[3] == 120
+    blue = raw['Blue_450nm']
+    assert math.isnan(blue[1]) and math.isnan(blue[2]) and blue[3] == 220
+    assert math.isnan(calibrated['UV_360nm'][1])
+    assert calibrated['UV_360nm'][3] == 240
+
+
+def test_snapshot_skipped_when_generation_unchanged():
+    store = SampleStore()
+    store.append_batch(np.array([1, 2, 3]), np.full((3, 4), 50.0), np.full(3, 0b1111))
+    panel = make_panel()
+    panel.update_graphs_from_snapshot(store.snapshot())
+    panel.pyqt_manager.updates.clear()
+    panel.update_graphs_from_snapshot(store.snapshot())
+    assert panel.pyqt_manager.updates == {}
+
+
+class Frame:
+    def __init__(self, mapped):
+        self.mapped = mapped
+
+    def winfo_ismapped(self):
+        return self.mapped
+
+
+def test_hidden_detector_panel_and_closed_plots_leave_the_bus_idle():
+    bus = SampleBus(SENSOR_KEYS)
+    detector = DetectorPanel.__new__(DetectorPanel)
+    detector.parent_frame = Frame(False)
+    detector.subscribe(bus, lambda: {})
+    panel = make_panel()
+    panel.pyqt_manager.is_window_active = lambda window_id: False
+    panel.subscribe(bus, lambda: True)
+
+    bus.flush()
+    assert not bus.is_staging
+    bus.publish_batch(None, True, np.arange(5), np.full((5, 4), 50.0), np.full((5, 4), 50.0), np.full(5, 0b1111))
+    assert bus.get_stats()['published_rows'] == 0
+
+    # Görünür olunca yalnızca son satır teslim edilir
+    delivered = []
+    detector.parent_frame.mapped = True
+    detector.subscription.callback = delivered.append
+    bus.flush()
+    assert bus.is_staging
+    bus.publish_batch(None, True, np.arange(5), np.full((5, 4), 50.0), np.full((5, 4), 50.0), np.full(5, 0b1111))
+    bus.flush(now=1e9)
+    assert len(delivered) == 1 and len(delivered[0][0]) == 1
+    assert panel.subscription.policy == POLICY_LATEST
@@ -0,0 +1,63 @@
+import numpy as np
+
+from data.data_processor import DataProcessor
+from gui.recording_panel import RecordingPanel
+from utils.session_clock import session_clock
+
+
+def make_recorder(data_processor):
+    panel = RecordingPanel.__new__(RecordingPanel)
+    panel.is_recording = False
+    panel.start_ns = None
+    panel.stop_ns = None
+    panel.sample_count = 0
+    panel.sample_bus = None
+    panel.data_processor = data_processor
+    panel.recorded_data = {
+        'raw': {'UV_360nm': [], 'Blue_450nm': [], 'IR_850nm': [], 'IR_940nm': []},
+        'calibrated': {'UV_360nm': [], 'Blue_450nm': [], 'IR_850nm': [], 'IR_940nm': []},
+        'custom': {'timestamps': []}
+    }
+    panel.subscribe(data_processor.sample_bus)
+    return panel
+
+
+def test_stop_keeps_rows_staged_since_last_flush():
+    processor = DataProcessor()
+    processor.system_running = True
+    processor.system_stopped = False
+    recorder = make_recorder(processor)
+
+    start_ns = session_clock.now_ns() - 10_000_000_000
+    recorder.start_ns = start_ns
+    recorder.is_recording = True
+
+    # Satırlar depoya yazıldı, veri yolu henüz boşaltılmadı (UPDATE_INTERVAL_MS beklemede)
+    timestamps = start_ns + np.arange(1, 51, dtype=np.int64) * 1_000_000
+    processor.process_batch(timestamps, np.full((50, 4), 1200.0))
+    assert recorder.sample_count == 0
+
+    recorder._finish_recording(timestamps[-1])
+
+    assert not recorder.is_recording
+    assert recorder.sample_count == 50
+    assert len(recorder.recorded_data['raw']['UV_360nm']) == 50
+    processor.close()
+
+
+def test_rows_after_stop_time_are_not_recorded():
+    processor = DataProcessor()
+    processor.system_running = True
+    processor.system_stopped = False
+    recorder = make_recorder(processor)
+
+    start_ns = session_clock.now_ns() - 10_000_000_000
+    recorder.start_ns = start_ns
+    recorder.is_recording = True
+
+    timestamps = start_ns + np.arange(1, 21, dtype=np.int64) * 1_000_000
+    processor.process_batch(timestamps, np.full((20, 4), 900.0))
+    recorder._finish_recording(timestamps[9])
+
+    assert recorder.sample_count == 10
+    processor.close()
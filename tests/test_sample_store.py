@@ -0,0 +1,189 @@
+import numpy as np
+
+from data.sample_store import LOST_FLAG, SampleStore
+
+ALL_VALID = 0x0F
+
+
+def append_rows(store, timestamps):
+    timestamps = np.asarray(timestamps, dtype=np.int64)
+    store.append_batch(timestamps, np.full((len(timestamps), 4), 500.0), np.full(len(timestamps), ALL_VALID))
+
+
+def expected_bounds(store, start_ns, stop_ns):
+    timestamps = store.column('timestamps')
+    rows = np.flatnonzero((timestamps >= start_ns) & (timestamps <= stop_ns))
+    return (int(rows[0]), int(rows[-1]) + 1) if len(rows) else (0, 0)
+
+
+def test_time_range_sorted_store_uses_insertion_points():
+    store = SampleStore(chunk_size=8)
+    append_rows(store, np.arange(100) * 10)
+
+    assert store.time_sorted
+    assert store.time_range(95, 305) == (10, 31)
+    assert store.time_range(None, 5) == (0, 1)
+    assert store.time_range(2000, None) == (100, 100)
+
+
+def test_time_range_after_out_of_order_append():
+    store = SampleStore(chunk_size=8)
+    append_rows(store, np.arange(50) * 10)
+    # Geç gelen tek satır (önceki chunk'ların aralığına düşer), ardından sıralı akış sürer
+    append_rows(store, [125])
+    append_rows(store, 500 + np.arange(50) * 10)
+
+    assert not store.time_sorted
+    # Bozukluk tek chunk'ta kalır - diğer chunk'lar ikili aramayla çözülür
+    assert sum(not chunk.ts_sorted for chunk in store._chunks) == 1
+    for start_ns, stop_ns in [(120, 130), (0, 40), (600, 700), (125, 125), (991, 2000), (5000, 6000)]:
+        assert store.time_range(start_ns, stop_ns) == expected_bounds(store, start_ns, stop_ns)
+
+
+def test_time_range_with_unsorted_batch_and_discard():
+    store = SampleStore(chunk_size=8, max_rows=40)
+    append_rows(store, np.arange(60) * 10)
+    append_rows(store, [700, 650, 680, 610])
+    append_rows(store, 710 + np.arange(30) * 10)
+
+    assert not store.time_sorted
+    for start_ns, stop_ns in [(600, 690), (640, 660), (0, 10_000), (900, 950)]:
+        assert store.time_range(start_ns, stop_ns) == expected_bounds(store, start_ns, stop_ns)
+
+
+def test_overview_keeps_gap_markers_as_nan_buckets():
+    store = SampleStore(chunk_size=64)
+    second = 1_000_000_000
+    append_rows(store, np.arange(0, 30 * second, second // 10))
+    store.append_gap(30 * second)
+    append_rows(store, np.arange(60 * second, 90 * second, second // 10))
+
+    overview = store.get_overview(max_points=100)
+    assert overview['level_s'] == 1.0
+    gap_rows = np.flatnonzero(overview['gap'])
+    assert overview['timestamps'][gap_rows].tolist() == [30 * second]
+    assert np.isnan(overview['mean'][gap_rows]).all()
+    assert not np.isnan(overview['mean'][~overview['gap']]).any()
+
+    # Kaba seviyeler ve birleştirilen kovalar da kesintiyi taşır
+    coarse = store.get_overview(max_points=3)
+    assert coarse['gap'].any()
+    assert np.isnan(coarse['mean'][coarse['gap']]).all()
+
+
+def test_append_reads_back_across_chunks_and_discard():
+    store = SampleStore(chunk_size=8)
+    for row in range(30):
+        flags = ALL_VALID if row % 5 else 0b0001
+        store.append(row * 1000, [row, row + 1, row + 2, row + 3], flags)
+
+    assert len(store) == 30
+    assert store.column('timestamps').tolist() == [row * 1000 for row in range(30)]
+    assert store.column('raw', 6, 10)[:, 1].tolist() == [7, 8, 9, 10]
+    assert store.column('flags', 9, 11).tolist() == [ALL_VALID, 0b0001]
+    # Son geçerli değer kanal bazında tutulur
+    assert store.latest_raw().tolist() == [29, 30, 31, 32]
+    assert store.latest_timestamp() == 29_000
+
+    assert store.discard_oldest(12) == 18
+    assert len(store) == 12
+    assert store.column('timestamps')[0] == 18_000
+    assert np.array_equal(store.slice(0, 3)['raw'][:, 0], [18, 19, 20])
+    assert len(store.column('raw', 20, 30)) == 0
+
+
+def random_rows(rng, count):
+    raw = rng.integers(0, 4000, size=(count, 4)).astype(np.float64)
+    flags = rng.integers(0, 16, size=count).astype(np.uint8)
+    flags[rng.random(count) < 0.05] = LOST_FLAG
+    return raw, flags
+
+
+def test_append_and_append_batch_store_the_same_rows():
+    rng = np.random.default_rng(5)
+    raw, flags = random_rows(rng, 100)
+    timestamps = np.arange(100, dtype=np.int64) * 1000
+
+    single = SampleStore(chunk_size=16)
+    for row in range(100):
+        single.append(int(timestamps[row]), raw[row], int(flags[row]))
+    batched = SampleStore(chunk_size=16)
+    batched.append_batch(timestamps[:30], raw[:30], flags[:30])
+    batched.append_batch(timestamps[30:], raw[30:], flags[30:])
+
+    assert len(single) == len(batched) == 100
+    for name in ('timestamps', 'raw', 'flags'):
+        assert np.array_equal(single.column(name), batched.column(name))
+    assert np.array_equal(single.column('calibrated'), batched.column('calibrated'), equal_nan=True)
+    assert np.array_equal(single.latest_raw(), batched.latest_raw())
+    single_stats, batched_stats = single.statistics(), batched.statistics()
+    for sensor_key in single.channels:
+        assert single_stats[sensor_key]['count'] == batched_stats[sensor_key]['count']
+        for field in ('mean', 'std', 'min', 'max'):
+            assert np.isclose(single_stats[sensor_key][field], batched_stats[sensor_key][field])
+
+
+def test_spilled_store_reads_like_an_in_memory_store(tmp_path):
+    rng = np.random.default_rng(9)
+    raw, flags = random_rows(rng, 500)
+    timestamps = np.arange(500, dtype=np.int64) * 1000
+    spill_directory = tmp_path / "primary"
+
+    memory = SampleStore(chunk_size=32)
+    spilled = SampleStore(chunk_size=32, spill_directory=str(spill_directory), hot_chunks=2)
+    for start in range(0, 500, 70):
+        memory.append_batch(timestamps[start:start + 70], raw[start:start + 70], flags[start:start + 70])
+        spilled.append_batch(timestamps[start:start + 70], raw[start:start + 70], flags[start:start + 70])
+
+    assert spilled.spilled_rows() > 0
+    assert spilled.disk_usage() > 0
+    assert spilled.memory_usage() < memory.memory_usage()
+    for name in ('timestamps', 'raw', 'flags'):
+        assert np.array_equal(spilled.column(name), memory.column(name))
+        assert np.array_equal(spilled.column(name, 10, 300), memory.column(name, 10, 300))
+    assert spilled.time_range(50_000, 250_000) == memory.time_range(50_000, 250_000)
+
+    spilled.close()
+    assert len(spilled) == 0
+    assert not spill_directory.exists()
+
+
+def test_statistics_match_numpy_for_store_and_windows():
+    rng = np.random.default_rng(11)
+    raw, flags = random_rows(rng, 400)
+    store = SampleStore(chunk_size=32)
+    store.append_batch(np.arange(400, dtype=np.int64), raw, flags)
+    store.set_calibration([2.0, 1.0, 0.5, 1.0], [10.0, 0.0, -5.0, 0.0], [True, False, True, False])
+
+    stored_raw = store.column('raw').astype(np.float64)
+    valid = ((flags[:, None] >> np.arange(4)) & 1).astype(bool)
+    for start, stop in [(None, None), (0, 400), (17, 250), (100, 101)]:
+        window = slice(start, stop)
+        for calibrated in (False, True):
+            stats = store.statistics(start, stop, calibrated=calibrated)
+            values = store.column('calibrated').astype(np.float64) if calibrated else stored_raw
+            for channel, sensor_key in enumerate(store.channels):
+                column = values[window, channel][valid[window, channel]]
+                assert stats[sensor_key]['count'] == len(column)
+                if len(column):
+                    assert np.isclose(stats[sensor_key]['mean'], column.mean(), rtol=1e-5)
+                    assert np.isclose(stats[sensor_key]['std'], column.std(), rtol=1e-4, atol=1e-3)
+                    assert np.isclose(stats[sensor_key]['min'], column.min(), rtol=1e-5)
+                    assert np.isclose(stats[sensor_key]['max'], column.max(), rtol=1e-5)
+
+
+def test_discard_oldest_rebuilds_statistics():
+    rng = np.random.default_rng(13)
+    raw, flags = random_rows(rng, 300)
+    store = SampleStore(chunk_size=32, max_rows=100)
+    store.append_batch(np.arange(300, dtype=np.int64), raw, flags)
+
+    kept = len(store)
+    assert kept < 300
+    stats = store.statistics()
+    kept_raw = store.column('raw').astype(np.float64)
+    kept_flags = store.column('flags')
+    for channel, sensor_key in enumerate(store.channels):
+        column = kept_raw[((kept_flags >> channel) & 1).astype(bool), channel]
+        assert stats[sensor_key]['count'] == len(column)
+        assert np.isclose(stats[sensor_key]['mean'], column.mean())
@@ -0,0 +1,60 @@
+import threading
+
+from communication.sensor_scanner import SensorScanner
+
+
+class Manager:
+    def __init__(self):
+        self.scan_callback = None
+        self.is_scanning = False
+
+    def is_available(self):
+        return True
+
+    def start_scan(self, callback):
+        self.scan_callback = callback
+
+    def connect_to_device(self, address, name):
+        return True
+
+
+class Widget:
+    """Tk after() yerine kuyruğa alır - kuyruk test (ana) thread'inde çalıştırılır"""
+
+    def __init__(self):
+        self.queued = []
+
+    def after(self, delay_ms, callback):
+        self.queued.append(callback)
+
+    def configure(self, **kwargs):
+        self.configured = (threading.get_ident(), kwargs)
+
+    def run_queued(self):
+        queued, self.queued = self.queued, []
+        for callback in queued:
+            callback()
+
+
+def test_scan_results_reach_callbacks_on_the_ui_thread():
+    manager = Manager()
+    scanner = SensorScanner(manager)
+    label = Widget()
+    scanner.status_label = label
+    calls = []
+    scanner.set_callbacks(
+        scan_callback=lambda devices: calls.append(('scan', threading.get_ident())),
+        connection_callback=lambda name, info, ok: calls.append((name, threading.get_ident())))
+
+    scanner.scan_and_connect_all()
+    devices = {'Sensor 1': {'address': 'AA'}, 'Sensor 2': {'address': 'BB'}}
+    # Tarama sonucu BLE döngüsü thread'inde gelir
+    thread = threading.Thread(target=manager.scan_callback, args=(devices,))
+    thread.start()
+    thread.join()
+    assert calls == []
+
+    label.run_queued()
+    ui_thread = threading.get_ident()
+    assert calls == [('Sensor 1', ui_thread), ('Sensor 2', ui_thread), ('scan', ui_thread)]
+    assert label.configured[0] == ui_thread
@@ -0,0 +1,53 @@
+from datetime import datetime
+
+import numpy as np
+
+from utils.session_clock import SessionClock, format_timestamps, to_seconds
+
+
+def anchored_clock():
+    clock = SessionClock()
+    clock.mono_anchor_ns = 5_000_000_000
+    clock.wall_anchor_ns = 1_700_000_000_000_000_000    # 2023-11-14 22:13:20
+    return clock
+
+
+def test_anchor_maps_monotonic_and_wall_time_both_ways():
+    clock = anchored_clock()
+    timestamps = np.array([5_000_000_000, 5_250_000_000, 65_000_001_000], dtype=np.int64)
+
+    wall = clock.to_wall_ns(timestamps)
+    assert wall.tolist() == [1_700_000_000_000_000_000, 1_700_000_000_250_000_000, 1_700_000_060_000_001_000]
+    assert clock.to_wall_ns(5_000_000_000) == 1_700_000_000_000_000_000
+    assert np.array_equal(clock.from_wall_ns(wall), timestamps)
+    assert clock.from_datetime(datetime(2023, 11, 14, 22, 13, 20, 250000)) == 5_250_000_000
+    assert clock.to_datetimes(timestamps)[1] == datetime(2023, 11, 14, 22, 13, 20, 250000)
+
+
+def test_iso_formatting_is_microsecond_precision():
+    clock = anchored_clock()
+    timestamps = np.array([5_000_000_000, 5_000_001_999], dtype=np.int64)
+
+    assert clock.to_iso(timestamps) == ["2023-11-14T22:13:20.000000", "2023-11-14T22:13:20.000001"]
+    assert clock.to_iso(timestamps, sep=' ')[0] == "2023-11-14 22:13:20.000000"
+    assert format_timestamps([datetime(2024, 1, 2, 3, 4, 5, 6)], sep=' ') == ["2024-01-02 03:04:05.000006"]
+    assert format_timestamps([]) == []
+
+
+def test_reset_anchor_tracks_the_current_wall_time():
+    clock = SessionClock()
+    before = datetime.now()
+    clock.reset_anchor()
+    now = clock.to_datetimes([clock.now_ns()])[0]
+
+    assert abs((now - before).total_seconds()) < 1.0
+    assert clock.now_ns() >= clock.mono_anchor_ns
+
+
+def test_to_seconds_accepts_ns_datetimes_and_iso_strings():
+    assert to_seconds(np.array([10, 1_500_000_010], dtype=np.int64)).tolist() == [0.0, 1.5]
+    assert to_seconds([2_000_000_000], origin=1_000_000_000).tolist() == [1.0]
+    dates = [datetime(2024, 1, 1, 0, 0, 0), datetime(2024, 1, 1, 0, 0, 2, 500000)]
+    assert to_seconds(dates).tolist() == [0.0, 2.5]
+    assert to_seconds(["2024-01-01T00:00:00", "2024-01-01T00:01:00"]).tolist() == [0.0, 60.0]
+    assert len(to_seconds([])) == 0
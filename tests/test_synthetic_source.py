@@ -0,0 +1,63 @@
+import time
+
+import numpy as np
+
+from communication.synthetic_source import SyntheticSensorSource
+from config.constants import FRAME_CHANNEL_ORDER, SENSOR_KEYS, SENSOR_MAPPING
+from data.data_processor import DataProcessor
+from utils.session_clock import session_clock
+
+# Kaynak değerleri FRAME_CHANNEL_ORDER, depo kolonları SENSOR_KEYS sırasındadır
+STORE_COLUMNS = [[SENSOR_MAPPING[key.lower()] for key in FRAME_CHANNEL_ORDER].index(sensor_key)
+                 for sensor_key in SENSOR_KEYS]
+
+
+def make_processor():
+    processor = DataProcessor()
+    processor.system_running = True
+    processor.system_stopped = False
+    return processor
+
+
+def test_generated_batches_are_stored_without_drops():
+    processor = make_processor()
+    source = SyntheticSensorSource(device_count=2, rate_hz=1000.0, seed=7)
+    start_ns = session_clock.now_ns() - 60_000_000_000
+
+    expected = {device_id: [] for device_id in source.device_ids}
+    for batch_index in range(20):
+        for device_index, device_id in enumerate(source.device_ids):
+            batch_packet = source.generate_batch(250, device_index, start_time=start_ns)
+            expected[device_id].append(batch_packet['values'])
+            assert processor.ingest_queue.put(batch_packet)
+        processor.drain_ingest_queue()
+
+    stats = processor.get_ingest_stats()
+    assert stats['dropped'] == 0
+    for device_id in source.device_ids:
+        store = processor._get_store(device_id)
+        assert len(store) == 5000
+        assert np.array_equal(store.column('raw'), np.vstack(expected[device_id])[:, STORE_COLUMNS])
+        assert np.all(np.diff(store.column('timestamps')) > 0)
+        assert processor.devices[device_id]['reorder'].get_stats()['late_dropped'] == 0
+    processor.close()
+
+
+def test_threaded_source_rows_all_reach_the_store():
+    processor = make_processor()
+    source = SyntheticSensorSource(processor.ingest_queue.put, device_count=1, rate_hz=2000.0, seed=1)
+
+    assert source.start()
+    deadline = time.monotonic() + 0.3
+    while time.monotonic() < deadline:
+        processor.drain_ingest_queue()
+        time.sleep(0.02)
+    source.disconnect()
+    processor.drain_ingest_queue()
+    processor.flush_reorder_buffers()
+
+    emitted = source.get_device_stats()[source.device_ids[0]]['samples']
+    assert emitted > 0
+    assert len(processor.store) == emitted
+    assert processor.get_ingest_stats()['dropped'] == 0
+    processor.close()
@@ -2,7 +2,9 @@
 Spektroskopi Sistemi Yardımcı Fonksiyonlar
 """
 
+import re
 import struct
+from bisect import bisect_left, bisect_right
 from datetime import datetime, timedelta
 from typing import List, Dict, Any, Optional, Tuple
 try:
@@ -19,7 +21,7 @@ def convert_raw_to_voltage(raw_value: int) -> float:
     return voltage_mv 
 
 def parse_ble_data(data: bytes) -> Optional[int]:
-    """BLE verisini parse et"""
+    """Eski tek kanallı BLE verisini parse et (çok kanallı frame'ler için communication.frame_protocol)"""
     try:
         if len(data) == 2:
             # 16-bit unsigned integer (little-endian)
@@ -42,63 +44,70 @@ def format_timestamp(timestamp: datetime, format_type: str = "display") -> str:
     else:
         return timestamp.isoformat()
 
+_EPOCH = datetime(1970, 1, 1)
+
+def datetime_to_ns(timestamp: datetime) -> int:
+    """Naive datetime'ı int64 nanosaniyeye çevir (yerel saat korunur)"""
+    return ((timestamp - _EPOCH) // timedelta(microseconds=1)) * 1000
+
+def ns_to_datetimes(timestamps_ns) -> List[datetime]:
+    """int64 nanosaniye dizisini datetime listesine çevir (vektörel)"""
+    if NUMPY_AVAILABLE:
+        return np.asarray(timestamps_ns, dtype=np.int64).astype('datetime64[ns]').astype('datetime64[us]').tolist()
+    return [_EPOCH + timedelta(microseconds=int(t) // 1000) for t in timestamps_ns]
+
 def calculate_time_difference(start_time: datetime, end_time: datetime) -> float:
     """İki zaman arasındaki farkı milisaniye cinsinden hesapla"""
     return (end_time - start_time).total_seconds() * 1000
 
+def time_range_bounds(timestamps, start=None, stop=None) -> Tuple[int, int]:
+    """Sıralı zaman damgalarında start <= t <= stop aralığının dilim sınırları (ikili arama)
+
+    NumPy dizilerinde np.searchsorted, listelerde bisect kullanılır - tarama yapılmaz.
+    """
+    count = len(timestamps)
+    if NUMPY_AVAILABLE and isinstance(timestamps, np.ndarray):
+        lo = int(np.searchsorted(timestamps, start, 'left')) if start is not None else 0
+        hi = int(np.searchsorted(timestamps, stop, 'right')) if stop is not None else count
+    else:
+        lo = bisect_left(timestamps, start) if start is not None else 0
+        hi = bisect_right(timestamps, stop) if stop is not None else count
+    return lo, max(lo, hi)
+
 def filter_data_by_time_range(timestamps: List[datetime], 
                              data_arrays: Dict[str, List[float]], 
                              range_seconds: int) -> Tuple[List[datetime], Dict[str, List[float]]]:
-    """Belirtilen zaman aralığındaki verileri filtrele - sabit referans zamanla"""
-    if not timestamps:
+    """Belirtilen zaman aralığındaki verileri filtrele - sabit referans zamanla
+
+    timestamps sıralı datetime listesi, datetime64 veya int64 ns dizisi olabilir.
+    """
+    if not len(timestamps):
         return [], {}
     
     # En son timestamp'i referans al (sabit nokta)
-    latest_time = timestamps[-1] if timestamps else datetime.now()
-    start_time = latest_time - timedelta(seconds=range_seconds)
+    latest_time = timestamps[-1]
+    if NUMPY_AVAILABLE and isinstance(timestamps, np.ndarray) and timestamps.dtype.kind in 'iu':
+        start_time = latest_time - range_seconds * 1_000_000_000
+    else:
+        start_time = latest_time - timedelta(seconds=range_seconds)
     
-    # Zaman aralığındaki indeksleri bul
-    filtered_indices = []
-    for i, timestamp in enumerate(timestamps):
-        if timestamp >= start_time:
-            filtered_indices.append(i)
+    # Aralığın başlangıç indeksi (ikili arama)
+    start_idx, _ = time_range_bounds(timestamps, start_time)
     
-    if not filtered_indices:
+    if start_idx >= len(timestamps):
         # Eğer hiç veri yoksa son N veri noktasını al
         max_points = min(len(timestamps), range_seconds * 2)  # Yaklaşık tahmin
-        if max_points > 0:
-            start_idx = len(timestamps) - max_points
-            filtered_timestamps = timestamps[start_idx:]
-            filtered_data = {}
-            for key, data_list in data_arrays.items():
-                if len(data_list) > start_idx:
-                    filtered_data[key] = data_list[start_idx:]
-                else:
-                    filtered_data[key] = []
-            return filtered_timestamps, filtered_data
-        return [], {}
-    
-    start_idx = filtered_indices[0]
+        if max_points <= 0:
+            return [], {}
+        start_idx = len(timestamps) - max_points
     
     # Filtrelenmiş verileri oluştur - uzunluk kontrolü
     filtered_timestamps = timestamps[start_idx:]
     filtered_data = {}
     
     for key, data_list in data_arrays.items():
-        if len(data_list) > start_idx:
-            # Veri uzunluğunu timestamp uzunluğuyla eşitle
-            data_slice = data_list[start_idx:]
-            min_len = min(len(filtered_timestamps), len(data_slice))
-            filtered_data[key] = data_slice[:min_len]
-        else:
-            filtered_data[key] = []
-    
-    # Son kontrol: tüm veriler aynı uzunlukta olmalı
-    if filtered_timestamps:
-        min_length = len(filtered_timestamps)
-        for key in filtered_data:
-            if len(filtered_data[key]) > min_length:
-                filtered_data[key] = filtered_data[key][:min_length]
+        # Veri uzunluğunu timestamp uzunluğuyla eşitle
+        filtered_data[key] = data_list[start_idx:start_idx + len(filtered_timestamps)]
     
     return filtered_timestamps, filtered_data
 
@@ -270,3 +279,10 @@ def map_device_name(original_name: str) -> str:
         return f"sensor-{sensor_number}"
     else:
         return original_name
+
+def device_namespace(device_id: str) -> str:
+    """Cihaz kimliğini formül değişken önekine çevir (sensor-2 -> d2)"""
+    match = re.search(r'(\d+)$', device_id)
+    if match:
+        return f"d{match.group(1)}"
+    return re.sub(r'[^a-z0-9]+', '_', device_id.lower()).strip('_')
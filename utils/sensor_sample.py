@@ -0,0 +1,90 @@
+"""
+Spektroskopi Sistemi Sabit Düzenli Örnek Kaydı
+"""
+
+from typing import Any, Dict, List, Optional, Sequence, Union
+
+from config.constants import FRAME_CHANNEL_ORDER
+
+# Kanal indeksi FRAME_CHANNEL_ORDER sırasıdır; negatif kanallar veri taşımayan işaretlerdir
+CHANNEL_GAP = -1    # Bağlantı kesintisi
+CHANNEL_LOST = -2   # Kaybolan örnek (sıra numarası boşluğu)
+
+_MARKER_KEYS = {CHANNEL_GAP: "GAP", CHANNEL_LOST: "LOST"}
+_PACKET_KEYS = [sensor_key.lower() for sensor_key in FRAME_CHANNEL_ORDER]
+
+class SensorSample:
+    """Tek kanal ölçümü: cihaz, kanal indeksi, sıra numarası, monotonik ns damga, mV değer"""
+
+    __slots__ = ('device_id', 'channel', 'sequence', 'timestamp', 'value')
+
+    def __init__(self, device_id: Optional[str], channel: int, sequence: Optional[int],
+                 timestamp: int, value: float = 0.0):
+        self.device_id = device_id
+        self.channel = channel
+        self.sequence = sequence
+        self.timestamp = timestamp
+        self.value = value
+
+    @property
+    def is_marker(self) -> bool:
+        return self.channel < 0
+
+    def __repr__(self) -> str:
+        return (f"SensorSample({self.device_id!r}, channel={self.channel}, seq={self.sequence}, "
+                f"t={self.timestamp}, value={self.value})")
+
+# Alım yolundaki öğe: tek örnek/işaret, döngü (aynı döngünün kanal örnekleri) veya dict paket
+IngestItem = Union[SensorSample, tuple, Dict[str, Any]]
+
+def item_timestamp(item: IngestItem) -> Optional[int]:
+    """Öğenin zaman damgası (döngüde ilk gelen kanalın damgası)"""
+    if isinstance(item, SensorSample):
+        return item.timestamp
+    if isinstance(item, tuple):
+        return item[0].timestamp
+    return item.get('timestamp')
+
+def item_device_id(item: IngestItem) -> Optional[str]:
+    if isinstance(item, SensorSample):
+        return item.device_id
+    if isinstance(item, tuple):
+        return item[0].device_id
+    return item.get('device_id')
+
+def item_kind(item: IngestItem) -> Optional[str]:
+    """Öğe türü - dict paketlerde sensor_key, örneklerde GAP/LOST/CYCLE"""
+    if isinstance(item, dict):
+        return item.get('sensor_key')
+    first = item if isinstance(item, SensorSample) else item[0]
+    return _MARKER_KEYS.get(first.channel, "CYCLE")
+
+def to_packet(item: IngestItem) -> Dict[str, Any]:
+    """Dict paket bekleyen kod için ince adaptör (eski 'sensor_2': mV düzeni)"""
+    if isinstance(item, dict):
+        return item
+    samples: Sequence[SensorSample] = (item,) if isinstance(item, SensorSample) else item
+    first = samples[0]
+    if first.is_marker:
+        return {'timestamp': first.timestamp, 'sensor_key': _MARKER_KEYS[first.channel],
+                'device_id': first.device_id}
+
+    data_packet = {'timestamp': first.timestamp, 'sensor_key': "CYCLE",
+                   'sequence': first.sequence, 'device_id': first.device_id}
+    for packet_key in _PACKET_KEYS:
+        data_packet[packet_key] = 0
+    for sample in samples:
+        data_packet[_PACKET_KEYS[sample.channel]] = sample.value
+    return data_packet
+
+def from_packet(data_packet: Dict[str, Any]) -> List[SensorSample]:
+    """Eski dict paketini kanal örneklerine çevir (değeri olmayan kanallar atlanır)"""
+    device_id = data_packet.get('device_id')
+    timestamp = data_packet.get('timestamp')
+    sequence = data_packet.get('sequence')
+    for channel, marker_key in _MARKER_KEYS.items():
+        if data_packet.get('sensor_key') == marker_key:
+            return [SensorSample(device_id, channel, sequence, timestamp)]
+    return [SensorSample(device_id, channel, sequence, timestamp, data_packet[packet_key])
+            for channel, packet_key in enumerate(_PACKET_KEYS)
+            if data_packet.get(packet_key, 0) > 0]
@@ -0,0 +1,88 @@
+"""
+Spektroskopi Sistemi Oturum Saati
+"""
+
+import time
+from datetime import datetime
+from typing import List, Optional, Sequence, Union
+
+import numpy as np
+
+from utils.helpers import datetime_to_ns, ns_to_datetimes
+
+TimestampArray = Union[Sequence[int], np.ndarray]
+
+class SessionClock:
+    """Örnekleri time.monotonic_ns() ile damgalar; oturum başına tek duvar saati çapası tutar"""
+
+    def __init__(self):
+        self.reset_anchor()
+
+    def reset_anchor(self):
+        """Monotonik ve duvar saatini aynı anda okuyup çapayı yenile"""
+        self.mono_anchor_ns = time.monotonic_ns()
+        # Yerel saat (naive) - export ve grafiklerdeki eski datetime değerleriyle aynı taban
+        self.wall_anchor_ns = datetime_to_ns(datetime.now())
+
+    def now_ns(self) -> int:
+        """Şu anki monotonik zaman (int ns) - geriye gitmez, saat ayarından etkilenmez"""
+        return time.monotonic_ns()
+
+    def to_wall_ns(self, timestamps_ns):
+        """Monotonik ns -> yerel duvar saati ns (skaler veya dizi)"""
+        if isinstance(timestamps_ns, (int, np.integer)):
+            return self.wall_anchor_ns + (int(timestamps_ns) - self.mono_anchor_ns)
+        return np.asarray(timestamps_ns, dtype=np.int64) + (self.wall_anchor_ns - self.mono_anchor_ns)
+
+    def from_wall_ns(self, wall_ns):
+        """Yerel duvar saati ns -> monotonik ns (skaler veya dizi)"""
+        if isinstance(wall_ns, (int, np.integer)):
+            return self.mono_anchor_ns + (int(wall_ns) - self.wall_anchor_ns)
+        return np.asarray(wall_ns, dtype=np.int64) + (self.mono_anchor_ns - self.wall_anchor_ns)
+
+    def from_datetime(self, timestamp: datetime) -> int:
+        """Yerel datetime -> monotonik ns (zaman aralığı sorguları için)"""
+        return self.from_wall_ns(datetime_to_ns(timestamp))
+
+    def to_datetimes(self, timestamps_ns: TimestampArray) -> List[datetime]:
+        """Monotonik ns dizisi -> datetime listesi (vektörel, sadece uç noktalarda)"""
+        return ns_to_datetimes(self.to_wall_ns(np.asarray(timestamps_ns, dtype=np.int64)))
+
+    def to_iso(self, timestamps_ns: TimestampArray, sep: str = 'T') -> List[str]:
+        """Monotonik ns dizisi -> ISO 8601 metin listesi (vektörel)"""
+        wall = self.to_wall_ns(np.asarray(timestamps_ns, dtype=np.int64))
+        return _datetime64_to_strings(wall.astype('datetime64[ns]').astype('datetime64[us]'), sep)
+
+def _datetime64_to_strings(values: np.ndarray, sep: str) -> List[str]:
+    strings = np.datetime_as_string(values, unit='us')
+    if sep != 'T':
+        strings = np.char.replace(strings, 'T', sep)
+    return strings.tolist()
+
+def format_timestamps(timestamps, sep: str = 'T') -> List[str]:
+    """datetime listesi veya monotonik int ns dizisi -> ISO metin listesi (vektörel)"""
+    if len(timestamps) == 0:
+        return []
+    if isinstance(timestamps[0], (int, np.integer)):
+        return session_clock.to_iso(timestamps, sep)
+    return _datetime64_to_strings(np.asarray(timestamps, dtype='datetime64[us]'), sep)
+
+def to_seconds(timestamps, origin: Optional[int] = None) -> np.ndarray:
+    """Zaman damgalarını ilk örneğe (veya origin'e) göre saniyeye çevir (vektörel)
+
+    int ns dizisi, datetime listesi veya ISO metin listesi kabul edilir.
+    """
+    if len(timestamps) == 0:
+        return np.zeros(0, dtype=np.float64)
+
+    first = timestamps[0]
+    if isinstance(first, (int, np.integer)):
+        values = np.asarray(timestamps, dtype=np.int64)
+    else:
+        # datetime / ISO metin -> datetime64 dönüşümü C seviyesinde yapılır
+        values = np.asarray(timestamps, dtype='datetime64[us]').astype(np.int64) * 1000
+
+    base = values[0] if origin is None else origin
+    return (values - base) / 1e9
+
+session_clock = SessionClock()